@@ -0,0 +1,62 @@
+"""
+Benchmark del costo de la medición de acciones de BasePage (--action-timing): tiempo por llamada
+a get_element_text con la medición apagada y encendida, contra un driver falso que responde al
+instante (así lo único que se mide es el framework). Apagada, los métodos de BasePage son los
+originales y la diferencia debe ser ~0; encendida, cada acción suma dos mediciones (acción + espera).
+
+Uso (desde la carpeta del proyecto):
+    python benchmarks/bench_action_timing.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from selenium.webdriver.common.by import By  # noqa: E402
+from pages.base_page import BasePage  # noqa: E402
+from utils.action_timing import ActionTimer  # noqa: E402
+
+LOCATOR = (By.ID, "user-name")
+
+
+class _FakeElement:
+    text = "Epic sadface"
+
+    def is_displayed(self):
+        return True
+
+
+class _FakeDriver:
+    def find_element(self, by, value):
+        return _FakeElement()
+
+
+def per_call(page, number: int) -> float:
+    return timeit.timeit(lambda: page.get_element_text(LOCATOR), number=number) / number
+
+
+def main():
+    number = 20000
+    page = BasePage(_FakeDriver())
+    page.wait_engine = "polling"
+    per_call(page, number)  # Calentamiento (imports perezosos de Selenium, caches)
+    baseline = per_call(page, number)
+
+    timer = ActionTimer()
+    timer.install(BasePage)
+    try:
+        enabled = per_call(page, number)
+    finally:
+        timer.uninstall()
+    disabled = per_call(page, number)
+
+    print(f"{'medición':<12} {'por llamada':>12} {'costo extra':>12}")
+    print(f"{'sin instalar':<12} {baseline * 1e6:>10.2f}us {'-':>12}")
+    print(f"{'encendida':<12} {enabled * 1e6:>10.2f}us {(enabled - baseline) * 1e6:>10.2f}us")
+    print(f"{'apagada':<12} {disabled * 1e6:>10.2f}us {(disabled - baseline) * 1e6:>10.2f}us")
+    print(f"Eventos registrados encendida: {len(timer.events)}")
+
+
+if __name__ == "__main__":
+    main()
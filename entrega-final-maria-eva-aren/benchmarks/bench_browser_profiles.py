@@ -0,0 +1,90 @@
+"""
+Benchmark de arranque de los perfiles de navegador de DriverFactory: tiempo hasta tener
+el driver listo, tiempo de la primera navegación (contra la réplica local de SauceDemo,
+sin depender de la red) y memoria residente de todo el árbol de procesos
+(driver + navegador + renderers) con la página cargada.
+
+Uso (desde la carpeta del proyecto):
+    python benchmarks/bench_browser_profiles.py [--browser chrome|firefox] [--runs 3] [perfil ...]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.driver_factory import BROWSER_PROFILES, DriverFactory  # noqa: E402
+from utils.local_site import LocalSiteServer  # noqa: E402
+
+
+def process_tree_rss(pid: int):
+    """RSS total (MB) de un proceso y sus descendientes. Lee /proc (Linux); None si no está disponible."""
+    if not os.path.isdir("/proc"):
+        return None
+    children = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # El nombre del proceso va entre paréntesis y puede tener espacios: el ppid sigue al último ')'
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+
+    total_kb, pending = 0, [pid]
+    while pending:
+        current = pending.pop()
+        pending.extend(children.get(current, []))
+        try:
+            with open(f"/proc/{current}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total_kb += int(line.split()[1])
+                        break
+        except OSError:
+            continue
+    return total_kb / 1024
+
+
+def measure(browser: str, profile: str, url: str) -> dict:
+    start = time.perf_counter()
+    driver = DriverFactory.get_driver(browser=browser, implicit_wait=0, profile=profile)
+    launch = time.perf_counter() - start
+    try:
+        start = time.perf_counter()
+        driver.get(url)
+        first_page = time.perf_counter() - start
+        memory = process_tree_rss(driver.service.process.pid)
+    finally:
+        driver.quit()
+    return {"launch": launch, "first_page": first_page, "memory": memory}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("profiles", nargs="*", default=list(BROWSER_PROFILES), help="Perfiles a medir (todos por defecto).")
+    parser.add_argument("--browser", default="chrome", choices=("chrome", "firefox"))
+    parser.add_argument("--runs", type=int, default=3, help="Arranques por perfil (se reporta la mediana).")
+    args = parser.parse_args()
+
+    site = LocalSiteServer().start()
+    try:
+        print(f"{'perfil':<15} {'arranque':>10} {'1ra página':>11} {'memoria':>10}")
+        for profile in args.profiles:
+            runs = [measure(args.browser, profile, site.url) for _ in range(args.runs)]
+            memories = [run["memory"] for run in runs if run["memory"] is not None]
+            memory = f"{statistics.median(memories):>8.0f}MB" if memories else f"{'n/d':>10}"
+            print(
+                f"{profile:<15} {statistics.median(r['launch'] for r in runs):>9.2f}s "
+                f"{statistics.median(r['first_page'] for r in runs):>10.2f}s {memory}"
+            )
+    finally:
+        site.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+Benchmark de get_logger: costo por llamada comparado con el nombrado anterior
+basado en inspect.stack(), a distintas profundidades de pila (pytest llama a
+get_logger con pilas de 40-60 frames durante la recolección).
+
+Uso (desde la carpeta del proyecto):
+    python benchmarks/bench_logger.py
+"""
+import inspect
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.logger import get_logger  # noqa: E402
+
+
+def legacy_name():
+    """Cómo se obtenía antes el nombre del logger."""
+    return inspect.stack()[1][3]
+
+
+def at_depth(depth, fn):
+    """Ejecuta fn con 'depth' frames extra en la pila."""
+    if depth == 0:
+        return fn()
+    return at_depth(depth - 1, fn)
+
+
+def main():
+    number = 200
+    print(f"{'profundidad':>12} {'inspect.stack':>15} {'get_logger':>12} {'mejora':>8}")
+    for depth in (0, 20, 50):
+        legacy = timeit.timeit(lambda: at_depth(depth, legacy_name), number=number) / number
+        current = timeit.timeit(lambda: at_depth(depth, get_logger), number=number) / number
+        print(f"{depth:>12} {legacy * 1e6:>13.1f}us {current * 1e6:>10.2f}us {legacy / current:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
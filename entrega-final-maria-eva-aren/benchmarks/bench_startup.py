@@ -0,0 +1,128 @@
+"""
+Benchmark de arranque en frío de pytest: tiempo desde que arranca el proceso hasta que empieza
+el primer test, para una corrida de API (-m api) y una de UI (-m ui), y desglose de imports al estilo
+de `python -X importtime` (paquetes que más tardan en importarse). Cada corrida termina apenas empieza
+su primer test y la de UI se lanza con --prewarm=0: no se abre ningún navegador ni se llama a la API.
+Detecta regresiones: falla (código 1) si la corrida de API importa Selenium o los Page Objects,
+o si alguna corrida supera su presupuesto (--max-api-ms / --max-ui-ms).
+
+Uso (desde la carpeta del proyecto):
+    python benchmarks/bench_startup.py [--runs 5] [--top 8] [--max-api-ms 1500] [--max-ui-ms 3000]
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.dirname(BENCHMARKS_DIR)
+
+# Línea que el proceso medido escribe en stderr al empezar el primer test (con time.time())
+FIRST_TEST_MARK = "BENCH-STARTUP-FIRST-TEST "
+# Módulos que una corrida de solo API no debe importar (ver _ui_plugin en conftest)
+UI_MODULES = ("selenium", "pages", "utils.ui_plugin", "utils.driver_factory", "utils.checkpoints",
+              "utils.screenshots")
+# import time:       self [us] | cumulative | imported package
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+
+# ----------------------------------------------------
+# PLUGIN DEL PROCESO MEDIDO (-p bench_startup)
+# ----------------------------------------------------
+
+def pytest_runtest_logstart(nodeid, location):
+    """Marca el inicio del primer test y corta la corrida (los hooks de cierre se ejecutan igual)."""
+    import pytest
+    sys.stderr.write(f"{FIRST_TEST_MARK}{time.time()}\n")
+    sys.stderr.flush()
+    pytest.exit("Primer test alcanzado (bench_startup)", returncode=0)
+
+
+# ----------------------------------------------------
+# MEDICIÓN
+# ----------------------------------------------------
+
+def run_pytest(marker: str, importtime: bool = False):
+    """
+    Ejecuta pytest -m 'marker' en un proceso nuevo con este módulo como plugin.
+    :return: (segundos hasta el primer test o None si no se seleccionó ninguno, stderr del proceso)
+    """
+    report = os.path.join(tempfile.gettempdir(), "bench_startup.html")
+    args = [sys.executable, *(["-X", "importtime"] if importtime else []), "-m", "pytest", "-m", marker,
+            "-p", "bench_startup", "-p", "no:cacheprovider", "--prewarm=0", f"--html={report}"]
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [BENCHMARKS_DIR, os.environ.get("PYTHONPATH")])))
+    start = time.time()
+    result = subprocess.run(args, cwd=PROJECT_DIR, env=env, capture_output=True, text=True)
+    for line in result.stderr.splitlines():
+        if line.startswith(FIRST_TEST_MARK):
+            return float(line[len(FIRST_TEST_MARK):]) - start, result.stderr
+    return None, result.stderr
+
+
+def parse_importtime(stderr: str) -> dict:
+    """Tiempo propio de import (ms) por paquete raíz (selenium, requests, _pytest, utils, ...)."""
+    packages = {}
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            package = match.group(4).split(".")[0]
+            packages[package] = packages.get(package, 0.0) + int(match.group(1)) / 1000
+    return packages
+
+
+def imported_modules(stderr: str) -> set:
+    return {match.group(4) for match in map(IMPORTTIME_LINE.match, stderr.splitlines()) if match}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="Arranques por corrida (se reporta la mediana).")
+    parser.add_argument("--top", type=int, default=8, help="Paquetes más lentos de importar que se muestran.")
+    parser.add_argument("--max-api-ms", type=float, default=0, help="Presupuesto de la corrida -m api (0 = sin presupuesto).")
+    parser.add_argument("--max-ui-ms", type=float, default=0, help="Presupuesto de la corrida -m ui (0 = sin presupuesto).")
+    args = parser.parse_args()
+
+    budgets = {"api": args.max_api_ms, "ui": args.max_ui_ms}
+    problems = []
+    print(f"{'corrida':<8} {'1er test':>10} {'mín':>9} {'máx':>9} {'imports':>9}")
+    breakdowns = {}
+    for marker in ("api", "ui"):
+        run_pytest(marker)  # Calentamiento (bytecode en __pycache__, cache de disco del sistema)
+        times = [run_pytest(marker)[0] for _ in range(args.runs)]
+        _, stderr = run_pytest(marker, importtime=True)
+        if None in times:
+            problems.append(f"-m {marker}: no se seleccionó ningún test (o pytest falló antes del primero)")
+            continue
+        packages = parse_importtime(stderr)
+        breakdowns[marker] = packages
+        median = statistics.median(times) * 1000
+        print(
+            f"{'-m ' + marker:<8} {median:>8.0f}ms {min(times) * 1000:>7.0f}ms {max(times) * 1000:>7.0f}ms "
+            f"{sum(packages.values()):>7.0f}ms"
+        )
+        if budgets[marker] and median > budgets[marker]:
+            problems.append(f"-m {marker}: {median:.0f}ms hasta el primer test > presupuesto {budgets[marker]:.0f}ms")
+        if marker == "api":
+            leaked = sorted(
+                module for module in imported_modules(stderr)
+                if any(module == ui or module.startswith(ui + ".") for ui in UI_MODULES)
+            )
+            if leaked:
+                problems.append(f"-m api importó módulos de UI: {', '.join(leaked[:5])}{' ...' if len(leaked) > 5 else ''}")
+
+    for marker, packages in breakdowns.items():
+        print(f"\nImports más lentos con -m {marker} (tiempo propio, ms):")
+        for package, elapsed in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+            print(f"  {elapsed:>8.1f}  {package}")
+
+    for problem in problems:
+        print(f"\nREGRESIÓN: {problem}")
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
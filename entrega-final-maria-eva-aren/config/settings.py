@@ -1,20 +1,126 @@
 import os
+import tempfile
 
 # URLs Base
 UI_BASE_URL = "https://www.saucedemo.com"
 API_BASE_URL = "https://jsonplaceholder.typicode.com"
 
+# Perfil de UI: "remote" (UI_BASE_URL) o "local" (réplica de SauceDemo en local_site/ servida en un puerto efímero)
+# Latencia fija y jitter (ms) que el servidor local agrega a cada petición para simular un sitio lento
+UI_PROFILE = os.getenv("UI_PROFILE", "remote")
+UI_LATENCY_MS = float(os.getenv("UI_LATENCY_MS", "0"))
+UI_JITTER_MS = float(os.getenv("UI_JITTER_MS", "0"))
+
+# Perfil de la API: "remote" (API_BASE_URL), "local" (servidor local con el dataset y los cassettes grabados)
+# o "record" (servidor local que reenvía a la API real y graba las respuestas en el cassette)
+API_PROFILE = os.getenv("API_PROFILE", "remote")
+
+# Cliente de API: conexiones por host, keep-alive, timeouts (segundos) y reintentos con backoff exponencial
+API_POOL_SIZE = int(os.getenv("API_POOL_SIZE", "10"))
+API_KEEP_ALIVE = os.getenv("API_KEEP_ALIVE", "true").lower() in ("1", "true", "yes")
+API_CONNECT_TIMEOUT = float(os.getenv("API_CONNECT_TIMEOUT", "5"))
+API_READ_TIMEOUT = float(os.getenv("API_READ_TIMEOUT", "30"))
+API_RETRIES = int(os.getenv("API_RETRIES", "3"))
+API_BACKOFF_FACTOR = float(os.getenv("API_BACKOFF_FACTOR", "0.5"))
+API_BATCH_WORKERS = int(os.getenv("API_BATCH_WORKERS", "10"))    # Hilos de get_many / post_many
+
+# Cache de GET del cliente de API: activado, máximo de entradas y de MB, y segundos sin revalidar (0 = revalidar siempre con ETag)
+API_CACHE = os.getenv("API_CACHE", "false").lower() in ("1", "true", "yes")
+API_CACHE_MAX_ENTRIES = int(os.getenv("API_CACHE_MAX_ENTRIES", "256"))
+API_CACHE_MAX_MB = float(os.getenv("API_CACHE_MAX_MB", "16"))
+API_CACHE_TTL = float(os.getenv("API_CACHE_TTL", "0"))
+
+# Presupuestos de latencia (p95 en ms) del cliente de API para toda la sesión; la corrida falla si se exceden.
+# Formato: "GET /posts/{id}=300; POST /posts=800; *=1000" (ids como {id}; sin método = todos los métodos)
+API_SLA = os.getenv("API_SLA", "")
+# JSON con las latencias por endpoint y los presupuestos excedidos (vacío = no se exporta; ej: reports/api_latency.json)
+API_LATENCY_FILE = os.getenv("API_LATENCY_FILE", "")
+
+# Modo de carga de los tests de API: usuarios virtuales (0 = desactivado), duración (s) y/o iteraciones por
+# usuario (lo que ocurra primero), rampa de arranque (s), tope de iteraciones por segundo (0 = sin tope)
+# y tasa de error tolerada antes de marcar el test como fallido
+LOAD_USERS = int(os.getenv("LOAD_USERS", "0"))
+LOAD_DURATION = float(os.getenv("LOAD_DURATION", "30"))
+LOAD_ITERATIONS = int(os.getenv("LOAD_ITERATIONS", "0"))
+LOAD_RAMP_UP = float(os.getenv("LOAD_RAMP_UP", "0"))
+LOAD_RATE = float(os.getenv("LOAD_RATE", "0"))
+LOAD_MAX_ERROR_RATE = float(os.getenv("LOAD_MAX_ERROR_RATE", "0.01"))
+
 # Credenciales de SauceDemo
 VALID_USER = "standard_user"
 LOCKED_OUT_USER = "locked_out_user"
 PASSWORD = "secret_sauce"
 
+# Sesión de SauceDemo: cookie que guarda el usuario logueado y página de inicio post-login
+SESSION_COOKIE_NAME = "session-username"
+INVENTORY_PATH = "/inventory.html"
+
 # Tiempos de espera (en segundos)
-IMPLICIT_WAIT = 5    # Espera implícita general
+IMPLICIT_WAIT = float(os.getenv("IMPLICIT_WAIT", "5"))    # Espera implícita general (0 = desactivada)
 EXPLICIT_WAIT = 10   # Espera explícita para elementos específicos
 PAGE_LOAD_TIMEOUT = 30
 
+# Motor de esperas de BasePage: "polling" (WebDriverWait) u "observer" (MutationObserver en la página)
+WAIT_ENGINE = os.getenv("WAIT_ENGINE", "polling")
+
+# Formularios de los Page Objects (fill_form): "script" completa todos los campos en un solo execute_script;
+# "keystrokes" tipea campo por campo con teclas reales (más lento, pero con eventos de teclado)
+FORM_FILL = os.getenv("FORM_FILL", "script")
+
+# Medición de cada acción y espera de BasePage (tabla de acciones más lentas y waterfall por test).
+# Apagada no agrega ningún costo: los métodos de BasePage solo se reemplazan si está activa.
+ACTION_TIMING = os.getenv("ACTION_TIMING", "false").lower() in ("1", "true", "yes")
+ACTION_TIMING_TOP = int(os.getenv("ACTION_TIMING_TOP", "15"))    # Filas de la tabla de acciones más lentas
+
+# Logging: "console" escribe todo al instante; "buffered" guarda el detalle por test y solo lo escribe si falla
+LOG_MODE = os.getenv("LOG_MODE", "console")
+LOG_BUFFER_SIZE = int(os.getenv("LOG_BUFFER_SIZE", "500"))
+
+# Modo del driver: "pool" reutiliza navegadores entre tests, "fresh" abre uno nuevo por test
+DRIVER_MODE = os.getenv("DRIVER_MODE", "pool")
+
+# Navegador ("chrome" o "firefox") y perfil de arranque: "default" (con ventana, maximizado), "fast-headless",
+# "debug-headed" o "ci" (ver BROWSER_PROFILES en utils/driver_factory.py)
+BROWSER = os.getenv("BROWSER", "chrome")
+BROWSER_PROFILE = os.getenv("BROWSER_PROFILE", "default")
+BROWSER_PROFILE_NAMES = ("default", "fast-headless", "debug-headed", "ci")   # Claves de BROWSER_PROFILES
+# Cache de disco de los perfiles con shared_cache (persiste entre corridas; una subcarpeta por navegador abierto a la vez)
+BROWSER_CACHE_DIR = os.getenv("BROWSER_CACHE_DIR", os.path.join(tempfile.gettempdir(), "saucedemo-browser-cache"))
+
+# Política de red de los navegadores (Chrome): "off", "observe" (cache compartido + bytes por test) o "block"
+# (además bloquea los recursos que ningún test verifica). Patrones de Network.setBlockedURLs separados por coma.
+NETWORK_POLICY = os.getenv("NETWORK_POLICY", "off")
+NETWORK_POLICY_MODES = ("off", "observe", "block")
+NETWORK_BLOCKED_URLS = os.getenv(
+    "NETWORK_BLOCKED_URLS",
+    "*.png,*.jpg,*.jpeg,*.gif,*.svg,*.webp,*.woff,*.woff2,*.ttf,*.otf,"
+    "*google-analytics.com*,*googletagmanager.com*,*backtrace.io*",
+).split(",")
+
+# Cantidad de navegadores que se levantan por adelantado en segundo plano (0 = desactivado)
+PREWARM_DEPTH = int(os.getenv("PREWARM_DEPTH", "1"))
+
+# Ejecución en paralelo: cantidad de procesos (0 o 1 = en serie) e id del worker actual
+PARALLEL_WORKERS = int(os.getenv("PARALLEL_WORKERS", "0"))
+WORKER_ID = os.getenv("PYTEST_WORKER_ID", "")
+
 # Directorios (rutas absolutas para evitar problemas)
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 SCREENSHOTS_DIR = os.path.join(BASE_DIR, "screenshots")
 REPORTS_DIR = os.path.join(BASE_DIR, "reports")
+UI_TESTS_DIR = os.path.join(BASE_DIR, "tests", "ui")  # Tests de UI: con -m api ni se importan (ver conftest)
+API_CASSETTE_FILE = os.path.join(BASE_DIR, "tests", "api", "cassettes", "jsonplaceholder.json")
+
+# Reporte: "html" (pytest-html autocontenido) o "stream" (JSONL por resultado + visor paginado en reports/stream/)
+REPORT_MODE = os.getenv("REPORT_MODE", "html")
+
+# Capturas en fallo: "viewport" o "fullpage", y nivel de compresión PNG (0 = sin re-comprimir, 9 = máximo;
+# re-comprimir cuesta ~0.2 s por captura en el hilo escritor y ahorra poco con los PNG de Chrome)
+SCREENSHOT_MODE = os.getenv("SCREENSHOT_MODE", "viewport")
+SCREENSHOT_COMPRESSION = int(os.getenv("SCREENSHOT_COMPRESSION", "0"))
+
+# Store de capturas: ancho de las miniaturas (0 = sin miniaturas; generarlas cuesta ~1 s por captura)
+# y retención por antigüedad y por tamaño total (0 = sin límite)
+SCREENSHOT_THUMBNAIL_WIDTH = int(os.getenv("SCREENSHOT_THUMBNAIL_WIDTH", "0"))
+SCREENSHOT_MAX_AGE_DAYS = float(os.getenv("SCREENSHOT_MAX_AGE_DAYS", "30"))
+SCREENSHOT_MAX_MB = float(os.getenv("SCREENSHOT_MAX_MB", "500"))
@@ -1,28 +1,452 @@
+import itertools
+import re
+from pathlib import Path
 import pytest
-from utils.driver_factory import DriverFactory
-from utils.screenshots import take_screenshot
-from utils.logger import get_logger
+try:
+    from _pytest.mark.expression import Expression
+except ImportError:  # API interna de pytest: sin ella tests/ui se recolecta siempre (ver _may_select)
+    Expression = None
+from config.settings import API_BASE_URL, DRIVER_MODE, PREWARM_DEPTH, PARALLEL_WORKERS, IMPLICIT_WAIT, WAIT_ENGINE
+from config.settings import FORM_FILL
+from config.settings import LOG_MODE, LOG_BUFFER_SIZE, SCREENSHOT_MODE, REPORT_MODE, API_CACHE, API_PROFILE
+from config.settings import UI_PROFILE, UI_LATENCY_MS, UI_JITTER_MS, BROWSER, BROWSER_PROFILE, BROWSER_PROFILE_NAMES
+from config.settings import NETWORK_POLICY, NETWORK_POLICY_MODES, ACTION_TIMING, UI_TESTS_DIR
+from config.settings import LOAD_USERS, LOAD_DURATION, LOAD_ITERATIONS, LOAD_RAMP_UP, LOAD_RATE, API_LATENCY_FILE
+from utils.latency import EndpointLatencies, export_latencies, format_latency_table, latency_table_html
+from utils.load_runner import LoadTestPlugin
+from utils.logger import get_logger, enable_buffered_logging, disable_buffered_logging
+from utils.logger import is_buffered_logging, start_test_log, end_test_log, flush_test_log, summarize_test_log
+from utils.reporting import StreamingReport
+from utils.parallel import DurationRecorder, ParallelController, WorkerPlugin, is_controller, is_worker
+from utils.parallel import save_worker_latencies
 
 # Inicializa el logger para conftest
 logger = get_logger()
 
+# Plugin de UI de la sesión (navegadores, sitio local, red, medición de acciones). Se crea en _ui_plugin
+ui_plugin_key = pytest.StashKey["UiPlugin"]()
+
+# Cliente de API de la sesión (para el resumen de conexiones al final)
+api_client_key = pytest.StashKey["ApiClient"]()
+
+# Resultado de cada test para la línea de resumen del log en modo buffered (se guarda en item.stash)
+log_outcome_key = pytest.StashKey[dict]()
+
+
+def pytest_addoption(parser):
+    """Opciones de línea de comandos propias del proyecto."""
+    parser.addoption(
+        "--driver-mode",
+        action="store",
+        default=DRIVER_MODE,
+        choices=("pool", "fresh"),
+        help="'pool' reutiliza navegadores entre tests; 'fresh' abre y cierra uno por test.",
+    )
+    parser.addoption(
+        "--browser",
+        action="store",
+        default=BROWSER,
+        choices=("chrome", "firefox"),
+        help="Navegador de las pruebas de UI.",
+    )
+    parser.addoption(
+        "--browser-profile",
+        action="store",
+        default=BROWSER_PROFILE,
+        choices=BROWSER_PROFILE_NAMES,
+        help="Perfil de arranque del navegador: 'default' (con ventana, maximizado), 'fast-headless', 'debug-headed' o 'ci'.",
+    )
+    parser.addoption(
+        "--network-policy",
+        action="store",
+        default=NETWORK_POLICY,
+        choices=NETWORK_POLICY_MODES,
+        help="'observe' comparte el cache HTTP entre navegadores y reporta bytes por test; 'block' además bloquea NETWORK_BLOCKED_URLS (imágenes, fuentes, analytics).",
+    )
+    parser.addoption(
+        "--prewarm",
+        action="store",
+        type=int,
+        default=PREWARM_DEPTH,
+        help="Cantidad de navegadores que se levantan por adelantado en segundo plano (0 = desactivado).",
+    )
+    parser.addoption(
+        "--workers",
+        action="store",
+        type=int,
+        default=PARALLEL_WORKERS,
+        help="Ejecuta los tests en N procesos en paralelo, repartidos según su duración histórica.",
+    )
+    parser.addoption(
+        "--implicit-wait",
+        action="store",
+        type=float,
+        default=IMPLICIT_WAIT,
+        help="Espera implícita del driver en segundos (0 = sin espera implícita, find_elements vuelve al instante).",
+    )
+    parser.addoption(
+        "--wait-engine",
+        action="store",
+        default=WAIT_ENGINE,
+        choices=("polling", "observer"),
+        help="Motor de esperas de BasePage: 'polling' (WebDriverWait) u 'observer' (MutationObserver en la página).",
+    )
+    parser.addoption(
+        "--form-fill",
+        action="store",
+        default=FORM_FILL,
+        choices=("script", "keystrokes"),
+        help="Formularios de los Page Objects: 'script' (todos los campos en un execute_script) o 'keystrokes' (tecla por tecla).",
+    )
+    parser.addoption(
+        "--action-timing",
+        action="store_true",
+        default=ACTION_TIMING,
+        help="Mide cada acción y espera de BasePage: tabla de acciones más lentas y waterfall por test en el reporte.",
+    )
+    parser.addoption(
+        "--log-mode",
+        action="store",
+        default=LOG_MODE,
+        choices=("console", "buffered"),
+        help="'console' escribe cada log al instante; 'buffered' guarda el detalle por test y solo lo escribe si falla.",
+    )
+    parser.addoption(
+        "--log-buffer-size",
+        action="store",
+        type=int,
+        default=LOG_BUFFER_SIZE,
+        help="Cantidad máxima de registros por test que se guardan en modo 'buffered'.",
+    )
+    parser.addoption(
+        "--screenshot-mode",
+        action="store",
+        default=SCREENSHOT_MODE,
+        choices=("viewport", "fullpage"),
+        help="Captura en fallo: 'viewport' (lo visible) o 'fullpage' (la página completa).",
+    )
+    parser.addoption(
+        "--report-mode",
+        action="store",
+        default=REPORT_MODE,
+        choices=("html", "stream"),
+        help="'html' genera el reporte autocontenido de pytest-html; 'stream' escribe un JSONL por resultado y un visor paginado.",
+    )
+    parser.addoption(
+        "--api-cache",
+        action="store_true",
+        default=API_CACHE,
+        help="Cachea los GET del cliente de API durante la sesión (revalidando con ETag).",
+    )
+    parser.addoption(
+        "--api-profile",
+        action="store",
+        default=API_PROFILE,
+        choices=("remote", "local", "record"),
+        help="'remote' usa la API real; 'local' un servidor local con dataset y cassettes; 'record' graba cassettes de la API real.",
+    )
+    parser.addoption(
+        "--api-latency-json",
+        action="store",
+        default=API_LATENCY_FILE,
+        help="Exporta las latencias de API por endpoint y los presupuestos excedidos a este JSON (ej: reports/api_latency.json).",
+    )
+    parser.addoption(
+        "--ui-profile",
+        action="store",
+        default=UI_PROFILE,
+        choices=("remote", "local"),
+        help="'remote' usa SauceDemo real; 'local' levanta la réplica de local_site/ en un puerto efímero.",
+    )
+    parser.addoption(
+        "--ui-latency",
+        action="store",
+        type=float,
+        default=UI_LATENCY_MS,
+        help="Latencia (ms) que el sitio local agrega a cada petición (solo con --ui-profile=local).",
+    )
+    parser.addoption(
+        "--ui-jitter",
+        action="store",
+        type=float,
+        default=UI_JITTER_MS,
+        help="Variación aleatoria (± ms) de la latencia del sitio local (solo con --ui-profile=local).",
+    )
+    parser.addoption(
+        "--load-users",
+        action="store",
+        type=int,
+        default=LOAD_USERS,
+        help="Modo de carga: ejecuta cada test de API con N usuarios virtuales concurrentes (0 = desactivado).",
+    )
+    parser.addoption(
+        "--load-duration",
+        action="store",
+        type=float,
+        default=LOAD_DURATION,
+        help="Segundos que dura la carga de cada test (0 = sin límite de tiempo, usar --load-iterations).",
+    )
+    parser.addoption(
+        "--load-iterations",
+        action="store",
+        type=int,
+        default=LOAD_ITERATIONS,
+        help="Iteraciones por usuario virtual (0 = sin límite; con duración termina lo que ocurra primero).",
+    )
+    parser.addoption(
+        "--load-ramp-up",
+        action="store",
+        type=float,
+        default=LOAD_RAMP_UP,
+        help="Segundos en los que arrancan escalonados los usuarios virtuales (0 = todos juntos).",
+    )
+    parser.addoption(
+        "--load-rate",
+        action="store",
+        type=float,
+        default=LOAD_RATE,
+        help="Tope de iteraciones por segundo entre todos los usuarios virtuales (0 = sin tope).",
+    )
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    """
+    Registra los plugins de ejecución en paralelo según el rol del proceso, el reporte y el modo de carga.
+    Las opciones de UI las aplica el plugin de UI, que recién se carga si algún test usa 'driver'.
+    """
+    if config.getoption("log_mode") == "buffered":
+        enable_buffered_logging(config.getoption("log_buffer_size"))
+    config.pluginmanager.register(DurationRecorder(config), "duration-recorder")
+    if is_worker():
+        # El reporte HTML lo genera solo el coordinador con los resultados de todos los workers
+        config.option.htmlpath = None
+        config.pluginmanager.register(WorkerPlugin(config), "parallel-worker")
+    elif is_controller(config):
+        config.pluginmanager.register(ParallelController(config), "parallel-controller")
+    if config.getoption("report_mode") == "stream" and not is_worker() and not config.option.collectonly:
+        # Reemplaza al reporte de pytest-html (los workers solo envían sus resultados al coordinador)
+        config.option.htmlpath = None
+        config.pluginmanager.register(StreamingReport(config), "streaming-report")
+    if config.getoption("load_users") > 0 and not is_controller(config):
+        # Los tests de API se ejecutan como escenarios de carga en lugar de una sola vez
+        config.pluginmanager.register(LoadTestPlugin(config), "load-test")
+
+
+def pytest_ignore_collect(collection_path, config):
+    """
+    Con un -m que no puede seleccionar tests 'ui' (ej: -m api) no se recolecta tests/ui: importar
+    sus módulos carga los Page Objects y Selenium aunque después se deseleccionen todos sus tests.
+    """
+    markexpr = config.getoption("markexpr")
+    if markexpr and collection_path == Path(UI_TESTS_DIR) and not _may_select(markexpr, "ui", absent=("api",)):
+        return True
+    return None
+
+
+def _may_select(markexpr: str, marker: str, absent=()) -> bool:
+    """
+    True si un test con 'marker' y sin los marcadores de 'absent' (los tests de UI nunca son de API)
+    puede pasar el filtro -m, con cualquier combinación de los demás marcadores que nombra la expresión.
+    """
+    others = sorted(set(re.findall(r"[\w:+\-.\[\]\\/]+", markexpr)) - {"and", "or", "not", marker, *absent})
+    try:
+        expression = Expression.compile(markexpr)
+        for present in itertools.product((False, True), repeat=len(others)):
+            names = {name for name, on in zip(others, present) if on} | {marker}
+            if expression.evaluate(lambda name, **kwargs: name in names):
+                return True
+    except Exception:
+        # Sin el parser interno de pytest (o si cambió su API) se asume que puede seleccionar:
+        # se recolecta tests/ui como siempre y el -m lo aplica pytest
+        return True
+    return False
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_collection_modifyitems(session, config, items):
+    """
+    Al terminar la recolección (y después de filtrar por -m/-k), si algún test usa el fixture
+    'driver' se carga el plugin de UI y se arranca el lanzador de navegadores en segundo plano.
+    """
+    if config.option.collectonly or is_controller(config):
+        # En modo paralelo el coordinador no abre navegadores: lo hace cada worker
+        return
+    if any("driver" in item.fixturenames for item in items):
+        _ui_plugin(config).start_launcher()
+
+
+def _ui_plugin(config):
+    """
+    Retorna el plugin de UI de la sesión y lo registra la primera vez. utils.ui_plugin se importa
+    recién acá: las corridas sin tests de UI no cargan Selenium, los Page Objects ni los navegadores.
+    """
+    if ui_plugin_key not in config.stash:
+        from utils.ui_plugin import UiPlugin
+        plugin = UiPlugin(config)
+        config.pluginmanager.register(plugin, "ui-plugin")
+        config.stash[ui_plugin_key] = plugin
+    return config.stash[ui_plugin_key]
+
+
+def pytest_sessionfinish(session, exitstatus):
+    """
+    Controla los presupuestos de latencia de la sesión (la corrida falla si se excedió alguno) y exporta
+    las latencias si se pidió. En paralelo cada worker le pasa sus histogramas al coordinador.
+    """
+    client = session.config.stash.get(api_client_key, None)
+    if is_worker():
+        if client is not None:
+            save_worker_latencies(client.latencies, client.sla)
+        return
+    latencies, sla = _api_latencies(session.config)
+    if latencies is None:
+        return
+    violations = latencies.check_budgets(sla)
+    if session.config.getoption("api_latency_json"):
+        export_latencies(session.config.getoption("api_latency_json"), latencies.stats(), violations)
+    if violations and session.exitstatus == pytest.ExitCode.OK:
+        # Presupuestos de la sesión (API_SLA / set_sla) excedidos: la corrida falla aunque pasen los tests
+        session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+
+def _api_latencies(config):
+    """
+    Histogramas de latencia de API de toda la corrida y presupuestos de la sesión: los del api_client
+    o, en el coordinador del modo paralelo, la suma de los de los workers. (None, []) si no hubo peticiones.
+    """
+    client = config.stash.get(api_client_key, None)
+    if client is not None:
+        return client.latencies, client.sla
+    controller = config.pluginmanager.get_plugin("parallel-controller")
+    if controller is not None and controller.latencies.histograms:
+        return controller.latencies, controller.sla
+    return None, []
+
+
+def pytest_unconfigure(config):
+    """Termina de escribir los logs pendientes del modo buffered."""
+    disable_buffered_logging()
+
+
+def pytest_runtest_logstart(nodeid, location):
+    """Cada test arranca con el buffer de logs vacío (modo buffered)."""
+    start_test_log()
+
+
+def pytest_runtest_logfinish(nodeid, location):
+    """Fuera de un test (fixtures de sesión, hilos de fondo) los logs se escriben sin buffer."""
+    end_test_log()
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    """
+    Reporta cuántas conexiones del cliente de API se reutilizaron y sus latencias por endpoint
+    (el resumen de navegadores y acciones lo agrega el plugin de UI).
+    """
+    client = config.stash.get(api_client_key, None)
+    latencies, sla = _api_latencies(config)
+    if latencies is not None:
+        terminalreporter.write_sep("-", "Cliente de API")
+        if client is not None:
+            terminalreporter.write_line(client.summary())
+        for line in format_latency_table(latencies.stats()):
+            terminalreporter.write_line(line)
+        for violation in latencies.check_budgets(sla):
+            terminalreporter.write_line(f"SLA excedido: {violation}", red=True)
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_html_results_summary(prefix, summary, postfix, session):
+    """Agrega al resumen del reporte HTML las latencias del cliente de API."""
+    latencies, sla = _api_latencies(session.config)
+    if latencies is not None and latencies.histograms:
+        prefix.append(latency_table_html(latencies.stats(), latencies.check_budgets(sla)))
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    """
+    Marcador @pytest.mark.sla(p95_ms, endpoint=None, method=None): mide las peticiones del test
+    (en modo de carga, las de toda la carga) y lo hace fallar si el p95 de algún endpoint excede el presupuesto.
+    """
+    budgets = [
+        {"p95_ms": marker.kwargs.get("p95_ms", marker.args[0] if marker.args else None),
+         "endpoint": marker.kwargs.get("endpoint"), "method": marker.kwargs.get("method")}
+        for marker in item.iter_markers("sla")
+    ]
+    client = item.funcargs.get("api_client") if budgets else None
+    if client is None:
+        yield
+        return
+    recorder = EndpointLatencies()
+    client.recorders.append(recorder)
+    outcome = yield
+    client.recorders.remove(recorder)
+    item.add_report_section("call", "Latencias de API", "\n".join(format_latency_table(recorder.stats())))
+    violations = recorder.check_budgets(budgets)
+    if violations and outcome.excinfo is None:
+        outcome.force_exception(AssertionError("Presupuesto de latencia excedido: " + "; ".join(violations)))
+
+
+@pytest.fixture(scope="session")
+def driver_pool(request):
+    """
+    Fixture de sesión con el pool de navegadores del worker.
+    Los navegadores nuevos se piden al lanzador (ya pre-calentados)
+    y se cierran todos al final de la sesión.
+    """
+    pool = _ui_plugin(request.config).create_pool()
+    yield pool
+    pool.close_all()
+
+
 @pytest.fixture(scope="function")
 def driver(request):
     """
     Fixture que inicializa el WebDriver y maneja el teardown (cierre).
-    Se usa el scope 'function' para asegurar un navegador limpio por cada test.
+    Se usa el scope 'function' para asegurar un navegador limpio por cada test:
+    en modo 'pool' el navegador se reutiliza pero se resetea al devolverlo,
+    en modo 'fresh' se abre y se cierra uno nuevo por test.
     """
+    ui = _ui_plugin(request.config)
+    if request.config.getoption("driver_mode") == "pool":
+        pool = request.getfixturevalue("driver_pool")
+        logger.info("Tomando WebDriver del pool...")
+        web_driver = pool.checkout()
+        ui.collect_network(request, web_driver, report=False)
+        yield web_driver
+        ui.collect_network(request, web_driver)
+        logger.info("Devolviendo WebDriver al pool...")
+        pool.checkin(web_driver)
+        return
+
     logger.info("Inicializando WebDriver...")
     # 1. SETUP: Inicializa el driver
-    web_driver = DriverFactory.get_driver(browser="chrome")
+    web_driver = ui.launcher.get()
+    ui.collect_network(request, web_driver, report=False)
     
     # 2. PROVISIÓN: Cede el control del driver al test
     yield web_driver
     
     # 3. TEARDOWN: Se ejecuta después de que el test termina
+    ui.collect_network(request, web_driver)
     logger.info("Cerrando WebDriver...")
     web_driver.quit()
 
+
+@pytest.fixture(scope="session")
+def checkpoints(request):
+    """
+    Fixture de sesión con los checkpoints de estado del navegador de este worker.
+    Usa el cache de pytest para reutilizarlos entre corridas mientras no cambien los Page Objects ni el sitio.
+    """
+    from utils.checkpoints import CheckpointStore  # Solo UI: ver _ui_plugin
+    site = _ui_plugin(request.config).base_url
+    store = CheckpointStore(cache=getattr(request.config, "cache", None), site=site)
+    yield store
+    logger.info(f"Checkpoints restaurados: {store.hits}, generados: {store.misses}.")
+
 # ----------------------------------------------------
 # HOOKS DE PYTEST - Captura Automática en Fallo
 # ----------------------------------------------------
@@ -37,24 +461,34 @@ def pytest_runtest_makereport(item, call):
     outcome = yield
     report = outcome.get_result()
 
-    # 2. Verifica si el test falló y estamos en la fase de ejecución ('call')
-    if report.when == 'call' and report.failed:
-        logger.error(f"El test {report.nodeid} ha fallado. Intentando tomar captura...")
-        
-        # Intenta acceder al objeto driver si fue solicitado por el test
-        try:
-            # item.funcargs contiene los fixtures usados por el test
-            driver = item.funcargs['driver'] 
-            test_name = report.nodeid.replace("::", "_") # Nombre para la captura
-            
-            # Llama a la utilidad de captura
-            take_screenshot(driver, test_name)
-            
-        except KeyError:
-            # Esto pasa si el test fallido no usó el fixture 'driver' (ej: tests API)
-            logger.warning("El test fallido no usó el fixture 'driver'. No se tomó captura.")
-        except Exception as e:
-            logger.error(f"Error inesperado al intentar manejar el fallo y la captura: {e}")
+    # 2. La captura en fallo y el waterfall de acciones los agrega el plugin de UI. Este wrapper es tryfirst
+    #    y el del plugin no: pluggy anida los wrappers tryfirst por fuera de los demás (sin importar el orden
+    #    de registro), así que lo que loguea el plugin de UI ya está en el buffer cuando se llega al paso 3
+    if report.when == 'call' and report.failed and 'driver' not in item.funcargs:
+        # Esto pasa si el test fallido no usó el fixture 'driver' (ej: tests API)
+        logger.warning(f"El test {report.nodeid} ha fallado y no usó el fixture 'driver'. No se tomó captura.")
+
+    # 3. Modo buffered: detalle completo solo si falla (incluye lo logueado arriba), una línea si no
+    if is_buffered_logging():
+        _handle_buffered_log(item, report)
+
+
+def _handle_buffered_log(item, report):
+    """
+    Con un fallo en cualquier fase se escribe el buffer completo del test y se adjunta al reporte.
+    Al terminar el teardown de un test sin fallos se escribe una sola línea de resumen.
+    """
+    state = item.stash.setdefault(log_outcome_key, {"outcome": "passed", "failed": False, "duration": 0.0})
+    state["duration"] += report.duration
+    if report.skipped:
+        state["outcome"] = "skipped"
+
+    if report.failed:
+        state["failed"] = True
+        detail = flush_test_log(f"FALLÓ {report.nodeid} (fase '{report.when}')")
+        report.sections.append((f"Log del test (buffer, {report.when})", detail))
+    elif report.when == "teardown" and not state["failed"]:
+        summarize_test_log(f"{state['outcome'].upper()} {report.nodeid} en {state['duration']:.2f}s")
 
 
 
@@ -67,22 +501,39 @@ def pytest_runtest_makereport(item, call):
 
 # Importación específica para las pruebas de API
 from utils.api_client import ApiClient
+from utils.local_api import LocalApiServer
+
+@pytest.fixture(scope="session")
+def api_server(request):
+    """
+    Fixture de sesión con el reemplazo local de JSONPlaceholder en un puerto efímero.
+    En el perfil 'record' reenvía las peticiones a la API real y graba los cassettes al cerrar.
+    """
+    mode = "record" if request.config.getoption("api_profile") == "record" else "replay"
+    server = LocalApiServer(mode=mode).start()
+    yield server
+    server.stop()
 
 @pytest.fixture(scope="session")
-def api_client():
+def api_client(request):
     """
     Fixture que inicializa el ApiClient (Requests) y maneja el teardown (cierre de sesión).
     El scope 'session' asegura que una sola instancia del cliente se use para todas las pruebas de API.
     """
     logger.info("Inicializando ApiClient para pruebas de API...")
     # 1. SETUP: Inicializa el cliente
-    client = ApiClient()
+    base_url = API_BASE_URL
+    if request.config.getoption("api_profile") != "remote":
+        # Perfiles 'local' y 'record': el cliente apunta al servidor local
+        base_url = request.getfixturevalue("api_server").url
+    client = ApiClient(base_url=base_url, cache=request.config.getoption("api_cache"))
+    request.config.stash[api_client_key] = client
     
     # 2. PROVISIÓN: Le da el control del cliente al test
     yield client
     
     # 3. TEARDOWN: Se ejecuta después de que todos los tests de la sesión han terminado
-    logger.info("Cerrando sesión del ApiClient...")
+    logger.info(f"Cerrando sesión del ApiClient... {client.summary()}")
     client.close_session()
 
 # Los hooks de screenshot/reporte ya se definieron antes (pytest_runtest_makereport)
@@ -0,0 +1,301 @@
+// Réplica local de SauceDemo (https://www.saucedemo.com) para correr los tests de UI sin red.
+// Usa los mismos ids, clases, textos, cookie de sesión ("session-username") y carrito en
+// localStorage ("cart-contents") que el sitio original, que es lo que usan los Page Objects.
+(function () {
+    'use strict';
+
+    var PASSWORD = 'secret_sauce';
+    var USERS = ['standard_user', 'locked_out_user', 'problem_user', 'performance_glitch_user', 'error_user', 'visual_user'];
+    var SESSION_COOKIE = 'session-username';
+    var SESSION_MINUTES = 10;
+    var CART_KEY = 'cart-contents';
+
+    var PRODUCTS = [
+        {id: 4, name: 'Sauce Labs Backpack', price: 29.99,
+         desc: 'carry.allTheThings() with the sleek, streamlined Sly Pack that melds uncompromising style with unequaled laptop and tablet protection.'},
+        {id: 0, name: 'Sauce Labs Bike Light', price: 9.99,
+         desc: "A red light isn't the desired state in testing but it sure helps when riding your bike at night. Water-resistant with 3 lighting modes, 1 AAA battery included."},
+        {id: 1, name: 'Sauce Labs Bolt T-Shirt', price: 15.99,
+         desc: 'Get your testing superhero on with the Sauce Labs bolt T-shirt. From American Apparel, 100% ringspun combed cotton, heather gray with red bolt.'},
+        {id: 5, name: 'Sauce Labs Fleece Jacket', price: 49.99,
+         desc: "It's not every day that you come across a midweight quarter-zip fleece jacket capable of handling everything from a relaxing day outdoors to a busy day at the office."},
+        {id: 2, name: 'Sauce Labs Onesie', price: 7.99,
+         desc: "Rib snap infant onesie for the junior automation engineer in development. Reinforced 3-snap bottom closure, two-needle hemmed sleeved and bottom won't unravel."},
+        {id: 3, name: 'Test.allTheThings() T-Shirt (Red)', price: 15.99,
+         desc: 'This classic Sauce Labs t-shirt is perfect to wear when cozying up to your keyboard to automate a few tests. Super-soft and comfy ringspun combed cotton.'}
+    ];
+
+    var root = document.getElementById('root');
+
+    // ----------------------------------------------------
+    // ESTADO: sesión (cookie) y carrito (localStorage)
+    // ----------------------------------------------------
+
+    function currentUser() {
+        var match = document.cookie.match(new RegExp('(?:^|; )' + SESSION_COOKIE + '=([^;]*)'));
+        return match ? decodeURIComponent(match[1]) : null;
+    }
+
+    function startSession(username) {
+        var expires = new Date(Date.now() + SESSION_MINUTES * 60 * 1000).toUTCString();
+        document.cookie = SESSION_COOKIE + '=' + encodeURIComponent(username) + '; expires=' + expires + '; path=/';
+    }
+
+    function getCart() {
+        try {
+            return JSON.parse(window.localStorage.getItem(CART_KEY)) || [];
+        } catch (e) {
+            return [];
+        }
+    }
+
+    function setCart(ids) {
+        if (ids.length) {
+            window.localStorage.setItem(CART_KEY, JSON.stringify(ids));
+        } else {
+            window.localStorage.removeItem(CART_KEY);
+        }
+    }
+
+    function slug(product) {
+        return product.name.toLowerCase().replace(/\s+/g, '-');
+    }
+
+    function productById(id) {
+        return PRODUCTS.filter(function (p) { return p.id === id; })[0];
+    }
+
+    function go(path) {
+        window.location.href = path;
+    }
+
+    // ----------------------------------------------------
+    // HELPERS DE DOM
+    // ----------------------------------------------------
+
+    function el(tag, attrs, children) {
+        var node = document.createElement(tag);
+        Object.keys(attrs || {}).forEach(function (name) {
+            if (name === 'text') {
+                node.textContent = attrs.text;
+            } else if (name === 'onclick') {
+                node.addEventListener('click', attrs.onclick);
+            } else {
+                node.setAttribute(name, attrs[name]);
+            }
+        });
+        (children || []).forEach(function (child) { if (child) { node.appendChild(child); } });
+        return node;
+    }
+
+    function button(id, text, onclick, className) {
+        return el('button', {id: id, name: id, 'data-test': id, 'class': className || 'btn', text: text, onclick: onclick});
+    }
+
+    function header(title) {
+        var count = getCart().length;
+        var link = el('a', {'class': 'shopping_cart_link', 'data-test': 'shopping-cart-link', href: '/cart.html'}, [
+            count ? el('span', {'class': 'shopping_cart_badge', 'data-test': 'shopping-cart-badge', text: String(count)}) : null
+        ]);
+        return el('div', {'class': 'primary_header'}, [
+            el('div', {'class': 'app_logo', text: 'Swag Labs'}),
+            el('div', {id: 'shopping_cart_container', 'class': 'shopping_cart_container'}, [link]),
+            el('div', {'class': 'header_secondary_container'}, [
+                el('span', {'class': 'title', 'data-test': 'title', text: title})
+            ])
+        ]);
+    }
+
+    function updateBadge() {
+        var link = document.querySelector('.shopping_cart_link');
+        var badge = link.querySelector('.shopping_cart_badge');
+        var count = getCart().length;
+        if (!count && badge) { link.removeChild(badge); }
+        if (count && !badge) {
+            badge = el('span', {'class': 'shopping_cart_badge', 'data-test': 'shopping-cart-badge'});
+            link.appendChild(badge);
+        }
+        if (badge && count) { badge.textContent = String(count); }
+    }
+
+    function cartButton(product) {
+        var inCart = getCart().indexOf(product.id) !== -1;
+        var id = (inCart ? 'remove-' : 'add-to-cart-') + slug(product);
+        return button(id, inCart ? 'Remove' : 'Add to cart', function (event) {
+            var cart = getCart();
+            if (inCart) {
+                cart.splice(cart.indexOf(product.id), 1);
+            } else {
+                cart.push(product.id);
+            }
+            setCart(cart);
+            event.target.parentNode.replaceChild(cartButton(product), event.target);
+            updateBadge();
+        }, 'btn btn_small btn_inventory ' + (inCart ? 'btn_secondary' : 'btn_primary'));
+    }
+
+    function itemBlock(product, className, extra) {
+        return el('div', {'class': className, 'data-test': className.replace('_', '-')}, [
+            el('div', {'class': 'inventory_item_description'}, [
+                el('a', {id: 'item_' + product.id + '_title_link', href: '#'}, [
+                    el('div', {'class': 'inventory_item_name', 'data-test': 'inventory-item-name', text: product.name})
+                ]),
+                el('div', {'class': 'inventory_item_desc', text: product.desc})
+            ]),
+            el('div', {'class': 'pricebar'}, [
+                el('div', {'class': 'inventory_item_price', text: '$' + product.price.toFixed(2)})
+            ].concat(extra || []))
+        ]);
+    }
+
+    // ----------------------------------------------------
+    // VISTAS
+    // ----------------------------------------------------
+
+    function loginView(initialError) {
+        var username = el('input', {id: 'user-name', name: 'user-name', 'data-test': 'username', placeholder: 'Username', type: 'text', 'class': 'input_error form_input'});
+        var password = el('input', {id: 'password', name: 'password', 'data-test': 'password', placeholder: 'Password', type: 'password', 'class': 'input_error form_input'});
+        var errorBox = el('div', {'class': 'error-message-container'});
+
+        function showError(message) {
+            errorBox.className = 'error-message-container error';
+            errorBox.innerHTML = '';
+            errorBox.appendChild(el('h3', {'data-test': 'error', text: message}));
+            username.className = password.className = 'input_error form_input error';
+        }
+
+        var submit = el('input', {type: 'submit', id: 'login-button', name: 'login-button', 'data-test': 'login-button', value: 'Login', 'class': 'submit-button btn_action'});
+        var form = el('form', {}, [
+            el('div', {'class': 'form_group'}, [username]),
+            el('div', {'class': 'form_group'}, [password]),
+            errorBox,
+            submit
+        ]);
+        form.addEventListener('submit', function (event) {
+            event.preventDefault();
+            var user = username.value, pass = password.value;
+            if (!user) { return showError('Epic sadface: Username is required'); }
+            if (!pass) { return showError('Epic sadface: Password is required'); }
+            if (USERS.indexOf(user) === -1 || pass !== PASSWORD) {
+                return showError('Epic sadface: Username and password do not match any user in this service');
+            }
+            if (user === 'locked_out_user') { return showError('Epic sadface: Sorry, this user has been locked out.'); }
+            startSession(user);
+            // Igual que el original, este usuario tarda en entrar
+            window.setTimeout(function () { go('/inventory.html'); }, user === 'performance_glitch_user' ? 5000 : 0);
+        });
+
+        root.appendChild(el('div', {'class': 'login_logo', text: 'Swag Labs'}));
+        root.appendChild(el('div', {'class': 'login_wrapper'}, [el('div', {'class': 'login-box'}, [form])]));
+        if (initialError) { showError(initialError); }
+    }
+
+    function inventoryView() {
+        root.appendChild(header('Products'));
+        root.appendChild(el('div', {'class': 'inventory_list', 'data-test': 'inventory-list'}, PRODUCTS.map(function (product) {
+            return itemBlock(product, 'inventory_item', [cartButton(product)]);
+        })));
+    }
+
+    function cartView() {
+        root.appendChild(header('Your Cart'));
+        var list = el('div', {'class': 'cart_list', 'data-test': 'cart-list'}, getCart().map(function (id) {
+            var product = productById(id);
+            var item = itemBlock(product, 'cart_item', [button('remove-' + slug(product), 'Remove', function () {
+                var cart = getCart();
+                cart.splice(cart.indexOf(product.id), 1);
+                setCart(cart);
+                list.removeChild(item);
+                updateBadge();
+            }, 'btn btn_secondary btn_small cart_button')]);
+            item.insertBefore(el('div', {'class': 'cart_quantity', 'data-test': 'item-quantity', text: '1'}), item.firstChild);
+            return item;
+        }));
+        root.appendChild(list);
+        root.appendChild(el('div', {'class': 'cart_footer'}, [
+            button('continue-shopping', 'Continue Shopping', function () { go('/inventory.html'); }, 'btn btn_secondary back btn_medium'),
+            button('checkout', 'Checkout', function () { go('/checkout-step-one.html'); }, 'btn btn_action btn_medium checkout_button')
+        ]));
+    }
+
+    function checkoutInfoView() {
+        root.appendChild(header('Checkout: Your Information'));
+        var fields = [['first-name', 'firstName', 'First Name'], ['last-name', 'lastName', 'Last Name'], ['postal-code', 'postalCode', 'Zip/Postal Code']];
+        var inputs = fields.map(function (f) {
+            return el('input', {id: f[0], name: f[0], 'data-test': f[1], placeholder: f[2], type: 'text', 'class': 'input_error form_input'});
+        });
+        var errorBox = el('div', {'class': 'error-message-container'});
+        var form = el('form', {}, [el('div', {'class': 'checkout_info'}, inputs.map(function (input) {
+            return el('div', {'class': 'form_group'}, [input]);
+        }).concat([errorBox])), el('div', {'class': 'checkout_buttons'}, [
+            button('cancel', 'Cancel', function () { go('/cart.html'); }, 'btn btn_secondary back btn_medium cart_cancel_link'),
+            el('input', {type: 'submit', id: 'continue', name: 'continue', 'data-test': 'continue', value: 'Continue', 'class': 'submit-button btn btn_primary cart_button btn_action'})
+        ])]);
+        form.addEventListener('submit', function (event) {
+            event.preventDefault();
+            var messages = ['Error: First Name is required', 'Error: Last Name is required', 'Error: Postal Code is required'];
+            for (var i = 0; i < inputs.length; i++) {
+                if (!inputs[i].value) {
+                    errorBox.className = 'error-message-container error';
+                    errorBox.innerHTML = '';
+                    errorBox.appendChild(el('h3', {'data-test': 'error', text: messages[i]}));
+                    return;
+                }
+            }
+            go('/checkout-step-two.html');
+        });
+        root.appendChild(form);
+    }
+
+    function checkoutOverviewView() {
+        root.appendChild(header('Checkout: Overview'));
+        var products = getCart().map(productById);
+        var subtotal = products.reduce(function (sum, p) { return sum + p.price; }, 0);
+        var tax = Math.round(subtotal * 0.08 * 100) / 100;
+        root.appendChild(el('div', {'class': 'cart_list'}, products.map(function (product) {
+            return itemBlock(product, 'cart_item');
+        })));
+        root.appendChild(el('div', {'class': 'summary_info'}, [
+            el('div', {'class': 'summary_subtotal_label', 'data-test': 'subtotal-label', text: 'Item total: $' + subtotal.toFixed(2)}),
+            el('div', {'class': 'summary_tax_label', 'data-test': 'tax-label', text: 'Tax: $' + tax.toFixed(2)}),
+            el('div', {'class': 'summary_total_label', 'data-test': 'total-label', text: 'Total: $' + (subtotal + tax).toFixed(2)})
+        ]));
+        root.appendChild(el('div', {'class': 'cart_footer'}, [
+            button('cancel', 'Cancel', function () { go('/inventory.html'); }, 'btn btn_secondary back btn_medium cart_cancel_link'),
+            button('finish', 'Finish', function () { setCart([]); go('/checkout-complete.html'); }, 'btn btn_action btn_medium cart_button')
+        ]));
+    }
+
+    function checkoutCompleteView() {
+        root.appendChild(header('Checkout: Complete!'));
+        root.appendChild(el('div', {id: 'checkout_complete_container', 'class': 'checkout_complete_container'}, [
+            el('h2', {'class': 'complete-header', 'data-test': 'complete-header', text: 'Thank you for your order!'}),
+            el('div', {'class': 'complete-text', 'data-test': 'complete-text',
+                       text: 'Your order has been dispatched, and will arrive just as fast as the pony can get there!'}),
+            button('back-to-products', 'Back Home', function () { go('/inventory.html'); }, 'btn btn_primary btn_small')
+        ]));
+    }
+
+    // ----------------------------------------------------
+    // RUTEO
+    // ----------------------------------------------------
+
+    var ROUTES = {
+        '/inventory.html': inventoryView,
+        '/cart.html': cartView,
+        '/checkout-step-one.html': checkoutInfoView,
+        '/checkout-step-two.html': checkoutOverviewView,
+        '/checkout-complete.html': checkoutCompleteView
+    };
+
+    var path = window.location.pathname;
+    var view = ROUTES[path];
+    if (!view) {
+        loginView();
+    } else if (!currentUser()) {
+        // Mismo comportamiento que el original: las páginas internas requieren sesión
+        loginView("Epic sadface: You can only access '" + path + "' when you are logged in.");
+    } else {
+        view();
+    }
+})();
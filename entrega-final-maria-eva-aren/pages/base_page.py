@@ -1,13 +1,109 @@
+import time
+from dataclasses import dataclass, field
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from config.settings import EXPLICIT_WAIT
+from config.settings import EXPLICIT_WAIT, WAIT_ENGINE, UI_BASE_URL, FORM_FILL
+from utils.dom_waits import DomWaiter, ObserverUnavailable, FIND_ELEMENTS_JS, IS_VISIBLE_JS
 from utils.logger import get_logger
 
+# Script que resuelve varios locators y lee su estado en una sola llamada a chromedriver.
+# Recibe una lista de [by, value] y una lista de atributos a leer.
+_SNAPSHOT_JS = FIND_ELEMENTS_JS + IS_VISIBLE_JS + """
+var specs = arguments[0], attrs = arguments[1];
+return specs.map(function (spec) {
+    var elements = find(spec[0], spec[1]);
+    return {
+        visible: elements.map(isVisible),
+        texts: elements.map(function (el) { return (el.innerText || '').trim(); }),
+        attributes: elements.map(function (el) {
+            var values = {};
+            attrs.forEach(function (name) { values[name] = el.getAttribute(name); });
+            return values;
+        })
+    };
+});
+"""
+
+# Completa varios campos en una sola llamada. Usa el setter nativo de 'value' y dispara 'input' y 'change'
+# (con bubbles) para que frameworks como React, que interceptan el setter del elemento, registren el valor.
+# Recibe una lista de [by, value, texto] y opcionalmente el [by, value] de un botón a clickear al final.
+# Retorna los índices de los campos que todavía no están visibles ([-1] si falta el botón); [] si completó todo.
+_FILL_FORM_JS = FIND_ELEMENTS_JS + IS_VISIBLE_JS + """
+var fields = arguments[0], submit = arguments[1], missing = [];
+var targets = fields.map(function (field, i) {
+    var el = find(field[0], field[1]).filter(isVisible)[0];
+    if (!el) { missing.push(i); }
+    return el;
+});
+if (missing.length) { return missing; }
+var button = null;
+if (submit) {
+    button = find(submit[0], submit[1]).filter(function (el) { return isVisible(el) && !el.disabled; })[0];
+    if (!button) { return [-1]; }
+}
+targets.forEach(function (el, i) {
+    var proto = el instanceof HTMLTextAreaElement ? HTMLTextAreaElement.prototype
+        : el instanceof HTMLSelectElement ? HTMLSelectElement.prototype : HTMLInputElement.prototype;
+    el.focus();
+    Object.getOwnPropertyDescriptor(proto, 'value').set.call(el, fields[i][2]);
+    el.dispatchEvent(new Event('input', {bubbles: true}));
+    el.dispatchEvent(new Event('change', {bubbles: true}));
+    el.blur();
+});
+if (button) { button.click(); }
+return [];
+"""
+
+
+@dataclass
+class ElementSnapshot:
+    """Estado de todos los elementos que coinciden con un locator, leído en un snapshot."""
+    visible: list = field(default_factory=list)      # Visibilidad de cada elemento
+    texts: list = field(default_factory=list)        # Texto visible de cada elemento
+    attributes: list = field(default_factory=list)   # Dict de atributos pedidos, por elemento
+
+    @property
+    def count(self) -> int:
+        return len(self.visible)
+
+    @property
+    def present(self) -> bool:
+        return self.count > 0
+
+    @property
+    def is_visible(self) -> bool:
+        return any(self.visible)
+
+    @property
+    def text(self) -> str:
+        """Texto del primer elemento visible (equivalente a get_element_text)."""
+        for visible, text in zip(self.visible, self.texts):
+            if visible:
+                return text
+        return ""
+
+    @property
+    def visible_texts(self) -> list:
+        return [text for visible, text in zip(self.visible, self.texts) if visible]
+
+
 class BasePage:
     
     logger = get_logger()
 
+    # Motor de esperas: "polling" (WebDriverWait + EC) u "observer" (MutationObserver en la página).
+    # Con "observer", si la espera no se puede hacer en la página se usa WebDriverWait como fallback.
+    wait_engine = WAIT_ENGINE
+
+    # URL del sitio bajo prueba. Con el perfil de UI "local" conftest la cambia por la del servidor local.
+    base_url = UI_BASE_URL
+
+    # Cómo completa formularios fill_form: "script" (todos los campos en un execute_script)
+    # o "keystrokes" (type_text campo por campo, con teclas reales).
+    form_fill = FORM_FILL
+
     def __init__(self, driver: WebDriver):
         """
         Constructor de la Base Page. 
@@ -19,22 +115,43 @@ class BasePage:
     # MÉTODOS DE ESPERA
     #--------------------------------------------------
 
+    def _wait(self, condition: str, fallback, timeout=EXPLICIT_WAIT, locator: tuple = None, url: str = None, poll_frequency=0.5):
+        """
+        Espera con el motor configurado.
+        Con "observer" la condición se resuelve en la página en un solo round trip; si eso no es
+        posible (ej: hubo una navegación completa) o el motor es "polling", se usa WebDriverWait
+        con la condición 'fallback' (un EC o cualquier callable driver -> valor).
+        El fallback usa solo el tiempo que queda: la espera completa nunca supera 'timeout'.
+        :raises TimeoutException: Si la condición no se cumple en el timeout.
+        """
+        deadline = time.monotonic() + timeout
+        if self.wait_engine == "observer":
+            try:
+                result = DomWaiter(self.driver).until(condition, locator, timeout, url=url)
+                if not result:
+                    raise TimeoutException(f"Condición '{condition}' no cumplida para {locator or url} en {timeout}s.")
+                return result
+            except ObserverUnavailable:
+                pass
+        remaining = max(0.0, deadline - time.monotonic())
+        return WebDriverWait(self.driver, remaining, poll_frequency=poll_frequency).until(fallback)
+
     def _wait_for_element_visible(self, locator: tuple, timeout=EXPLICIT_WAIT):
         """Espera de forma explícita a que un elemento sea visible en la página."""
         try:
-            return WebDriverWait(self.driver, timeout).until(
-                EC.visibility_of_element_located(locator)
-            )
+            return self._wait("visible", EC.visibility_of_element_located(locator), timeout, locator)
         except Exception as e:
             self.logger.error(f"TIEMPO AGOTADO: El elemento con locator {locator} no fue visible en {timeout}s.")
             raise # Relanzar la excepción para que el test falle
 
+    def _wait_for_element_clickable(self, locator: tuple, timeout=EXPLICIT_WAIT):
+        """Espera a que el elemento sea visible y esté habilitado."""
+        return self._wait("clickable", EC.element_to_be_clickable(locator), timeout, locator)
+
     def _wait_for_url_to_be(self, url: str, timeout=EXPLICIT_WAIT) -> bool:
         """Espera a que la URL actual coincida con la esperada."""
         try:
-            return WebDriverWait(self.driver, timeout).until(
-                EC.url_to_be(url)
-            )
+            return self._wait("url", EC.url_to_be(url), timeout, url=url)
         except Exception:
             self.logger.warning(f"La URL '{url}' no se cargó o no coincide dentro del timeout de {timeout}s.")
             return False
@@ -46,9 +163,7 @@ class BasePage:
     def click_element(self, locator: tuple):
         """Espera a que el elemento sea clickeable y luego hace click."""
         try:
-            element = WebDriverWait(self.driver, EXPLICIT_WAIT).until(
-                EC.element_to_be_clickable(locator)
-            )
+            element = self._wait_for_element_clickable(locator)
             element.click()
             self.logger.info(f"Clic exitoso en el elemento con locator: {locator}")
         except Exception as e:
@@ -77,6 +192,37 @@ class BasePage:
             self.logger.error(f"Fallo al intentar obtener texto de {locator}: {e}")
             raise
 
+    def fill_form(self, values: dict, submit: tuple = None, keystrokes: bool = None):
+        """
+        Completa varios campos y opcionalmente clickea un botón, en un solo round trip al navegador
+        (type_text por campo son ~3 llamadas a chromedriver más el tipeo tecla por tecla).
+        Si algún campo todavía no está visible se espera con el motor configurado y se reintenta.
+        :param values: Dict {locator: texto}, en el orden en que se completan.
+        :param submit: Locator de un botón a clickear después de completar (ej: Login, Continue).
+        :param keystrokes: True fuerza teclas reales campo por campo (para tests que verifican el tipeo
+                           o eventos de teclado); None usa el modo de la clase (form_fill).
+        """
+        if keystrokes or (keystrokes is None and self.form_fill == "keystrokes"):
+            for locator, text in values.items():
+                self.type_text(locator, text)
+            if submit:
+                self.click_element(submit)
+            return
+
+        locators = list(values)
+        fields = [[by, value, "" if text is None else str(text)] for (by, value), text in values.items()]
+        for _ in range(len(fields) + 2):
+            missing = self.driver.execute_script(_FILL_FORM_JS, fields, list(submit) if submit else None)
+            if not missing:
+                self.logger.info(f"Formulario completado en un solo script: {locators}" + (f" y clic en {submit}" if submit else ""))
+                return
+            # El formulario todavía se está renderizando: se espera lo que faltaba y se reintenta
+            if missing[0] == -1:
+                self._wait_for_element_clickable(submit)
+            else:
+                self._wait_for_element_visible(locators[missing[0]])
+        raise TimeoutException(f"No se pudo completar el formulario {locators}: campos no visibles.")
+
     def is_element_displayed(self, locator: tuple) -> bool:
         """Verifica si un elemento es visible sin lanzar excepción si no lo encuentra."""
         try:
@@ -85,4 +231,63 @@ class BasePage:
         except Exception:
             return False
 
+    # ----------------------------------------------------
+    # PRESENCIA / AUSENCIA SIN PAGAR TIMEOUTS
+    # ----------------------------------------------------
+
+    def is_element_present_now(self, locator: tuple) -> bool:
+        """Retorna al instante si el elemento está en el DOM (sin esperas explícitas ni implícitas)."""
+        return self.snapshot({"element": locator})["element"].present
+
+    def is_element_visible_now(self, locator: tuple) -> bool:
+        """Retorna al instante si el elemento está en el DOM y es visible."""
+        return self.snapshot({"element": locator})["element"].is_visible
+
+    def is_element_absent_now(self, locator: tuple) -> bool:
+        """Retorna al instante si el elemento NO es visible (no existe o está oculto)."""
+        return not self.is_element_visible_now(locator)
+
+    def wait_until_visible(self, locator: tuple, timeout=EXPLICIT_WAIT) -> bool:
+        """
+        Espera la transición "el elemento aparece". Retorna True apenas es visible
+        o False si no aparece en el timeout (no lanza excepción).
+        """
+        return self._wait_for_state("visible", locator, lambda: self.is_element_visible_now(locator), timeout)
+
+    def wait_until_absent(self, locator: tuple, timeout=EXPLICIT_WAIT) -> bool:
+        """
+        Espera la transición "el elemento desaparece" (ej: el badge del carrito al vaciarlo).
+        Retorna True apenas deja de ser visible o False si sigue visible al vencer el timeout.
+        """
+        return self._wait_for_state("absent", locator, lambda: self.is_element_absent_now(locator), timeout)
+
+    def _wait_for_state(self, name: str, locator: tuple, condition, timeout) -> bool:
+        """
+        Espera una condición evaluada con snapshots del DOM. Como no usa find_element,
+        no le suma la espera implícita del driver en cada intento.
+        """
+        try:
+            return bool(self._wait(name, lambda _: condition(), timeout, locator, poll_frequency=0.1))
+        except TimeoutException:
+            return False
+
+    # ----------------------------------------------------
+    # LECTURA MASIVA DEL DOM
+    # ----------------------------------------------------
+
+    def snapshot(self, locators: dict, attributes=()) -> dict:
+        """
+        Lee en un solo execute_script la presencia, visibilidad, texto y atributos
+        de varios locators. No espera: refleja el DOM en el momento de la llamada.
+        :param locators: Dict {nombre: locator}.
+        :param attributes: Nombres de atributos a leer de cada elemento (ej: ("id", "class")).
+        :return: Dict {nombre: ElementSnapshot}.
+        """
+        names = list(locators)
+        specs = [list(locators[name]) for name in names]
+        raw = self.driver.execute_script(_SNAPSHOT_JS, specs, list(attributes))
+        result = {name: ElementSnapshot(**data) for name, data in zip(names, raw)}
+        self.logger.debug(f"Snapshot de {names}: { {n: s.count for n, s in result.items()} }")
+        return result
+
 
@@ -36,14 +36,20 @@ class CartPage(BasePage):
         except Exception:
             return False
 
+    def get_cart_contents(self) -> dict:
+        """
+        Lee en un solo round trip la cantidad de ítems y los nombres de los productos del carrito.
+        :return: Dict con 'count' (int) y 'names' (lista de nombres visibles).
+        """
+        snap = self.snapshot({"items": self.CART_ITEMS_LIST, "names": self.ITEM_NAME_GENERIC})
+        return {"count": snap["items"].count, "names": snap["names"].visible_texts}
+
     def get_number_of_items_in_cart(self) -> int:
         """
         Cuenta la cantidad de elementos de producto listados en el carrito.
         """
-        # Intentamos esperar a que la lista de ítems sea visible
         try:
-            items = self.driver.find_elements(*self.CART_ITEMS_LIST)
-            return len(items)
+            return self.get_cart_contents()["count"]
         except Exception as e:
             self.logger.warning(f"No se encontraron ítems en el carrito. Error: {e}")
             return 0
@@ -51,14 +57,9 @@ class CartPage(BasePage):
     def is_product_in_cart(self, product_name: str) -> bool:
         """
         Verifica si un producto específico está presente en el carrito.
-        Busca el nombre del producto en todos los nombres listados.
+        Busca el nombre del producto en todos los nombres listados (un solo snapshot del DOM).
         """
-        # Se buscan todos los elementos que contengan el nombre del producto
-        # Esto busca por texto usando XPATH,
-        # es útil para verificar contenido dinámico.
-        xpath_locator = (By.XPATH, f"//div[@class='inventory_item_name' and text()='{product_name}']")
-        
-        if self.is_element_displayed(xpath_locator):
+        if product_name in self.get_cart_contents()["names"]:
             self.logger.info(f"El producto '{product_name}' ha sido encontrado en el carrito.")
             return True
         else:
@@ -33,11 +33,11 @@ class CheckoutPage(BasePage):
 
     def fill_information(self, first_name: str, last_name: str, postal_code: str):
         """Rellena el formulario de información de envío y continúa."""
-        self.type_text(self.FIRST_NAME_FIELD, first_name)
-        self.type_text(self.LAST_NAME_FIELD, last_name)
-        self.type_text(self.POSTAL_CODE_FIELD, postal_code)
+        self.fill_form(
+            {self.FIRST_NAME_FIELD: first_name, self.LAST_NAME_FIELD: last_name, self.POSTAL_CODE_FIELD: postal_code},
+            submit=self.CONTINUE_BUTTON,
+        )
         self.logger.info(f"Información de envío rellenada: {first_name}, {last_name}, {postal_code}")
-        self.click_element(self.CONTINUE_BUTTON)
         
     
 
@@ -1,5 +1,6 @@
 from selenium.webdriver.common.by import By
 from pages.base_page import BasePage
+from config.settings import EXPLICIT_WAIT
 
 class InventoryPage(BasePage):
     
@@ -18,6 +19,14 @@ class InventoryPage(BasePage):
     BACKPACK_ADD_BUTTON = (By.ID, "add-to-cart-sauce-labs-backpack")
     BIKE_LIGHT_ADD_BUTTON = (By.ID, "add-to-cart-sauce-labs-bike-light")
     
+    # Botones "Remove" de los productos que ya están en el carrito (id: remove-<producto>)
+    REMOVE_BUTTONS = (By.CSS_SELECTOR, "button[id^='remove-']")
+    BACKPACK_REMOVE_BUTTON = (By.ID, "remove-sauce-labs-backpack")
+    BIKE_LIGHT_REMOVE_BUTTON = (By.ID, "remove-sauce-labs-bike-light")
+
+    # Espera corta para que React pinte el carrito (después de agregar o de restaurar un checkpoint)
+    CART_RENDER_TIMEOUT = 2
+    
     # ----------------------------------------------------
     # 2. MÉTODOS DE ACCIÓN 
     # ----------------------------------------------------
@@ -37,21 +46,47 @@ class InventoryPage(BasePage):
     def add_backpack_to_cart(self):
         """Añade la mochila (Sauce Labs Backpack) al carrito de compras."""
         self.click_element(self.BACKPACK_ADD_BUTTON)
+        # El botón pasa a "Remove" en el mismo render que actualiza el badge
+        self.wait_until_visible(self.BACKPACK_REMOVE_BUTTON, self.CART_RENDER_TIMEOUT)
         self.logger.info("Producto: Mochila añadida al carrito.")
 
     def add_bike_light_to_cart(self):
         """Añade la luz de bicicleta (Sauce Labs Bike Light) al carrito de compras."""
         self.click_element(self.BIKE_LIGHT_ADD_BUTTON)
+        self.wait_until_visible(self.BIKE_LIGHT_REMOVE_BUTTON, self.CART_RENDER_TIMEOUT)
         self.logger.info("Producto: Luz de bicicleta añadida al carrito.")
 
-    def get_cart_count(self) -> str:
+    def get_cart_count(self, expect_items=False, timeout=CART_RENDER_TIMEOUT) -> str:
         """
         Retorna la cantidad de ítems mostrada en el badge del carrito.
         Retorna "0" si el badge no es visible (carrito vacío).
+        Lee el DOM actual en un solo round trip (sin esperas): un carrito vacío responde al instante.
+        :param expect_items: True si el carrito debería tener ítems pero React puede no haber pintado
+                             el badge todavía (ej: justo después de restaurar un checkpoint): si no está,
+                             espera hasta 'timeout' a que aparezca.
+        """
+        badge = self.snapshot({"badge": self.SHOPPING_CART_BADGE})["badge"]
+        if badge.present or not expect_items:
+            return badge.text or "0"
+        self.wait_until_visible(self.SHOPPING_CART_BADGE, timeout)
+        return self.snapshot({"badge": self.SHOPPING_CART_BADGE})["badge"].text or "0"
+
+    def wait_for_cart_badge_to_disappear(self, timeout=EXPLICIT_WAIT) -> bool:
+        """Espera a que el badge del carrito desaparezca (carrito vacío). Retorna False si no pasa."""
+        return self.wait_until_absent(self.SHOPPING_CART_BADGE, timeout)
+
+    def get_cart_state(self) -> dict:
+        """
+        Lee en un solo round trip qué productos están en el carrito y qué dice el badge.
+        :return: Dict con 'badge' (texto del badge, "0" si no está) e 'items'
+                 (ids de los productos agregados, ej: "sauce-labs-backpack").
         """
-        if self.is_element_displayed(self.SHOPPING_CART_BADGE):
-            return self.get_element_text(self.SHOPPING_CART_BADGE)
-        return "0"
+        snap = self.snapshot(
+            {"badge": self.SHOPPING_CART_BADGE, "remove": self.REMOVE_BUTTONS},
+            attributes=("id",),
+        )
+        items = [attrs["id"][len("remove-"):] for attrs in snap["remove"].attributes]
+        return {"badge": snap["badge"].text or "0", "items": items}
 
     def go_to_cart(self):
         """Navega a la página del carrito haciendo clic en el icono."""
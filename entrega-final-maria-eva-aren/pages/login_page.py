@@ -1,6 +1,6 @@
 from selenium.webdriver.common.by import By
 from pages.base_page import BasePage
-from config.settings import UI_BASE_URL
+from config.settings import INVENTORY_PATH, SESSION_COOKIE_NAME
 from config.settings import VALID_USER, PASSWORD 
 
 class LoginPage(BasePage):
@@ -25,24 +25,45 @@ class LoginPage(BasePage):
 
     def go_to_page(self):
         """Navega directamente a la URL base de la aplicación."""
-        self.driver.get(UI_BASE_URL)
-        self.logger.info(f"Navegando a la página de login: {UI_BASE_URL}")
+        self.driver.get(self.base_url)
+        self.logger.info(f"Navegando a la página de login: {self.base_url}")
 
     def perform_login(self, username: str, password: str):
         """
         Encapsula el proceso de login. 
         Utiliza los métodos robustos de la BasePage.
         """
-        self.type_text(self.USERNAME_FIELD, username)
-        self.type_text(self.PASSWORD_FIELD, password)
-        self.click_element(self.LOGIN_BUTTON)
+        self.fill_form({self.USERNAME_FIELD: username, self.PASSWORD_FIELD: password}, submit=self.LOGIN_BUTTON)
         self.logger.info(f"Intento de login con usuario: {username}")
         # No hay 'return' acá. El test se va a encargar de verificar el resultado.
         
-    def login_with_valid_credentials(self):
-        """Helper para realizar un login exitoso usando credenciales válidas."""
+    def login_with_valid_credentials(self, fast: bool = False):
+        """
+        Helper para realizar un login exitoso usando credenciales válidas.
+        Con fast=True usa fast_login() en lugar del formulario.
+        """
+        if fast:
+            self.fast_login(VALID_USER)
+            return
         self.go_to_page()
         self.perform_login(VALID_USER, PASSWORD)
+
+    def fast_login(self, username: str = VALID_USER):
+        """
+        Login rápido: inyecta la cookie de sesión de SauceDemo y abre directamente
+        el inventario, sin cargar ni completar el formulario.
+        Solo para tests cuyo objetivo NO es el login (esos deben usar perform_login).
+        """
+        cookie = {"name": SESSION_COOKIE_NAME, "value": username, "path": "/"}
+        if hasattr(self.driver, "execute_cdp_cmd"):
+            # Chrome: la cookie se crea sin estar en el dominio (ahorra una carga de página)
+            self.driver.execute_cdp_cmd("Network.setCookie", {**cookie, "url": self.base_url})
+        else:
+            # Otros navegadores: WebDriver exige estar en el dominio para agregar la cookie
+            self.go_to_page()
+            self.driver.add_cookie(cookie)
+        self.driver.get(f"{self.base_url}{INVENTORY_PATH}")
+        self.logger.info(f"Login rápido (cookie de sesión) con usuario: {username}")
         
     def get_login_error_message(self) -> str:
         """Retorna el texto del mensaje de error."""
@@ -1,5 +1,7 @@
 import pytest
+from utils.api_client import ApiClient
 from utils.logger import get_logger
+from utils.response_cache import ResponseCache
 
 logger = get_logger()
 
@@ -96,3 +98,100 @@ class TestApiJsonPlaceholder:
 
         logger.info(f"Prueba DELETE exitosa para el post ID: {post_id_to_delete}. Status: {response.status_code}")
 
+
+    # ----------------------------------------------------
+    # PRUEBA 4: GET en lote (peticiones concurrentes)
+    # ----------------------------------------------------
+
+    def test_get_many_posts_in_order(self, api_client, pytestconfig):
+        """
+        Verifica que get_many traiga los 100 posts en paralelo y en el orden pedido.
+        Solo corre contra el servidor local (--api-profile=local o record): no tiene sentido
+        mandarle 100 peticiones a la API pública en cada corrida.
+        """
+        if pytestconfig.getoption("api_profile") == "remote":
+            pytest.skip("Prueba de lote solo con --api-profile=local o record (evita 100 peticiones a la API pública).")
+        logger.info("Iniciando test_get_many_posts_in_order")
+        endpoints = [f"/posts/{post_id}" for post_id in range(1, 101)]
+
+        # 1. Acción: Ejecutar los 100 GET concurrentes sobre la sesión compartida
+        results = api_client.get_many(endpoints)
+
+        # 2. Verificación de Status Code de cada petición
+        failed = [(r.endpoint, r.status, r.error) for r in results if not r.ok]
+        assert not failed, f"FAIL: Hubo peticiones con error: {failed}"
+
+        # 3. Verificación del orden: cada resultado corresponde al endpoint de su posición
+        ids = [r.response.json().get('id') for r in results]
+        assert ids == list(range(1, 101)), "FAIL: Los resultados no respetan el orden de los endpoints."
+
+        slowest = max(results, key=lambda r: r.elapsed)
+        logger.info(f"Prueba GET en lote exitosa. Petición más lenta: {slowest.endpoint} ({slowest.elapsed:.3f}s)")
+
+
+# Pruebas del cache de GET contra el servidor local (sin red, cualquiera sea el --api-profile)
+@pytest.mark.api
+class TestApiResponseCache:
+
+    # ----------------------------------------------------
+    # PRUEBA 1: Revalidación con ETag (304)
+    # ----------------------------------------------------
+
+    def test_revalidated_get_reuses_cached_body(self, api_server):
+        """
+        Verifica que el segundo GET se revalide (If-None-Match -> 304) y entregue el cuerpo guardado.
+        """
+        client = ApiClient(base_url=api_server.url, cache=ResponseCache(ttl=0))
+        try:
+            first = client.get("/posts/1")
+            second = client.get("/posts/1")
+        finally:
+            client.close_session()
+
+        assert second.status_code == 200, f"FAIL: Se entregó el {second.status_code} de la revalidación."
+        assert second.json() == first.json(), "FAIL: El cuerpo revalidado no coincide con el original."
+        assert (client.cache.misses, client.cache.revalidated) == (1, 1), f"FAIL: {client.cache.summary()}"
+
+    # ----------------------------------------------------
+    # PRUEBA 2: Desalojo LRU y entrada desalojada antes del 304
+    # ----------------------------------------------------
+
+    def test_evicted_entry_is_fetched_again(self, api_server):
+        """
+        Verifica el desalojo por cantidad de entradas: el GET desalojado vuelve a pedirse completo.
+        """
+        client = ApiClient(base_url=api_server.url, cache=ResponseCache(max_entries=1, ttl=0))
+        try:
+            client.get("/posts/1")
+            client.get("/posts/2")
+            response = client.get("/posts/1")
+        finally:
+            client.close_session()
+
+        assert response.status_code == 200 and response.json()["id"] == 1, "FAIL: Respuesta incorrecta tras el desalojo."
+        assert (client.cache.misses, client.cache.evictions) == (3, 2), f"FAIL: {client.cache.summary()}"
+
+    def test_entry_evicted_before_304_is_requested_again(self, api_server, monkeypatch):
+        """
+        Verifica que si la entrada se desaloja entre el lookup y el 304 (ej: otro hilo de get_many llenó
+        el cache), la petición se repita sin cabeceras condicionales en lugar de entregar el 304 vacío.
+        """
+        cache = ResponseCache(ttl=0)
+        client = ApiClient(base_url=api_server.url, cache=cache)
+        lookup = cache.lookup
+
+        def lookup_then_evict(key):
+            result = lookup(key)
+            cache._discard(key)
+            return result
+
+        try:
+            first = client.get("/posts/1")
+            monkeypatch.setattr(cache, "lookup", lookup_then_evict)
+            second = client.get("/posts/1")
+        finally:
+            client.close_session()
+
+        assert second.status_code == 200, f"FAIL: Se entregó el {second.status_code} de la revalidación."
+        assert second.json() == first.json(), "FAIL: El cuerpo de la petición repetida no coincide."
+        assert cache.misses == 2 and cache.revalidated == 0, f"FAIL: {cache.summary()}"
@@ -0,0 +1,125 @@
+import pytest
+
+from utils.latency import EndpointLatencies, LatencyHistogram, endpoint_template, parse_budgets
+from utils.logger import get_logger
+
+logger = get_logger()
+
+
+class TestLatencyHistogram:
+
+    # ----------------------------------------------------
+    # PRUEBA 1: PERCENTILES (Error relativo acotado)
+    # ----------------------------------------------------
+
+    def test_percentile_within_bucket_error(self):
+        """
+        Con 1..1000 ms el percentil del histograma queda a menos de un 5% del exacto
+        y nunca supera el máximo observado.
+        """
+        histogram = LatencyHistogram()
+        for ms in range(1, 1001):
+            histogram.add(float(ms))
+
+        for pct, exact in ((50, 500), (95, 950), (99, 990)):
+            value = histogram.percentile(pct)
+            assert abs(value - exact) / exact <= 0.05, f"FAIL: p{pct} = {value:.1f} ms, exacto {exact} ms."
+        assert histogram.percentile(100) == 1000, "FAIL: El p100 no es el máximo observado."
+        assert LatencyHistogram().percentile(95) == 0.0, "FAIL: Un histograma vacío debe dar 0."
+
+    # ----------------------------------------------------
+    # PRUEBA 2: MERGE (Igual a registrar todo en uno)
+    # ----------------------------------------------------
+
+    def test_merge_matches_single_histogram(self):
+        """Unir los histogramas de dos workers da lo mismo que registrar todas las muestras en uno."""
+        left, right, combined = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+        for ms in (0.05, 3, 12, 40):
+            left.add(ms)
+            combined.add(ms)
+        for ms in (7, 250, 900):
+            right.add(ms, error=True)
+            combined.add(ms, error=True)
+
+        left.merge(right)
+        assert left.counts == combined.counts, "FAIL: Los buckets no coinciden tras el merge."
+        assert (left.count, left.errors, left.max_ms) == (7, 3, 900), "FAIL: Contadores incorrectos tras el merge."
+        assert left.percentile(95) == combined.percentile(95), "FAIL: El p95 cambia tras el merge."
+
+
+class TestEndpointLatencies:
+
+    # ----------------------------------------------------
+    # PRUEBA 3: ENDPOINTS Y SERIALIZACIÓN (Workers)
+    # ----------------------------------------------------
+
+    def test_json_round_trip_groups_by_template(self):
+        """
+        Los ids y la query no separan endpoints, y to_json/merge_json (worker -> coordinador)
+        conserva los histogramas.
+        """
+        assert endpoint_template("/posts/1/comments?postId=1") == "/posts/{id}/comments", \
+            "FAIL: La plantilla del endpoint no reemplazó el id."
+        worker = EndpointLatencies()
+        worker.record("GET", "/posts/1", 200, 0.010)
+        worker.record("GET", "/posts/2", 200, 0.020)
+        worker.record("POST", "/posts", None, 0.030)
+
+        controller = EndpointLatencies()
+        controller.merge_json(worker.to_json())
+        controller.merge_json(worker.to_json())
+        rows = {(row["method"], row["endpoint"]): row for row in controller.stats()}
+        assert set(rows) == {("GET", "/posts/{id}"), ("POST", "/posts")}, f"FAIL: Endpoints: {set(rows)}"
+        assert rows[("GET", "/posts/{id}")]["requests"] == 4, "FAIL: No se sumaron las peticiones de ambos merges."
+        assert rows[("POST", "/posts")]["error_rate"] == 1.0, "FAIL: Una petición sin respuesta debe contar como error."
+
+    # ----------------------------------------------------
+    # PRUEBA 4: PRESUPUESTOS (API_SLA)
+    # ----------------------------------------------------
+
+    def test_parse_budgets(self):
+        """Método opcional, '*' para todos los endpoints y espacios/';' sobrantes ignorados."""
+        budgets = parse_budgets(" GET /posts/{id}=300; /users=500.5;; *=1000 ")
+        assert budgets == [
+            {"p95_ms": 300.0, "endpoint": "/posts/{id}", "method": "GET"},
+            {"p95_ms": 500.5, "endpoint": "/users", "method": None},
+            {"p95_ms": 1000.0, "endpoint": None, "method": None},
+        ], f"FAIL: Presupuestos mal interpretados: {budgets}"
+        assert parse_budgets("") == [], "FAIL: Sin API_SLA no debe haber presupuestos."
+
+    def test_check_budgets_filters_by_method_and_endpoint(self):
+        """Solo se reportan los endpoints cuyo p95 excede un presupuesto que les aplica."""
+        latencies = EndpointLatencies()
+        for _ in range(20):
+            latencies.record("GET", "/posts/1", 200, 0.400)
+            latencies.record("POST", "/posts", 201, 0.050)
+
+        violations = latencies.check_budgets(parse_budgets("GET /posts/{id}=300; POST /posts/{id}=1; /posts=100"))
+        assert len(violations) == 1 and violations[0].startswith("GET /posts/{id}: p95"), \
+            f"FAIL: Violaciones inesperadas: {violations}"
+        assert latencies.check_budgets(parse_budgets("*=1000")) == [], "FAIL: Un presupuesto holgado no debe fallar."
+
+
+# Aplico el marcador 'api' a toda la clase
+@pytest.mark.api
+class TestSlaMarker:
+
+    # ----------------------------------------------------
+    # PRUEBA 5: MARCADOR sla (Presupuesto por test)
+    # ----------------------------------------------------
+
+    @pytest.mark.sla(60000, endpoint="/posts/{id}")
+    def test_sla_within_budget(self, api_client):
+        """Un presupuesto holgado no afecta al test."""
+        response = api_client.get("/posts/1")
+        assert response.status_code == 200, f"FAIL: Status code no es 200. Recibido: {response.status_code}"
+
+    @pytest.mark.xfail(raises=AssertionError, strict=True, reason="El marcador sla debe hacer fallar el test")
+    @pytest.mark.sla(p95_ms=0.001, method="GET")
+    def test_sla_exceeded_fails_test(self, api_client):
+        """
+        Con un presupuesto imposible el hook del marcador fuerza un AssertionError aunque el
+        test pase (si no fallara, el xfail estricto lo marcaría como FAIL).
+        """
+        response = api_client.get("/posts/2")
+        assert response.status_code == 200, f"FAIL: Status code no es 200. Recibido: {response.status_code}"
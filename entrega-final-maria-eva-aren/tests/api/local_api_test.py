@@ -0,0 +1,100 @@
+import json
+
+import pytest
+import requests
+
+from utils import local_api
+from utils.local_api import LocalApiServer
+from utils.logger import get_logger
+
+logger = get_logger()
+
+
+@pytest.fixture
+def upstream():
+    """Servidor en memoria que hace de API real para el modo 'record'."""
+    server = LocalApiServer(mode="memory").start()
+    yield server
+    server.stop()
+
+
+# Aplico el marcador 'api' a toda la clase
+@pytest.mark.api
+class TestLocalApiCassettes:
+
+    # ----------------------------------------------------
+    # PRUEBA 1: RECORD (Reenvío y grabación del cassette)
+    # ----------------------------------------------------
+
+    def test_record_forwards_and_saves_cassette(self, upstream, tmp_path):
+        """
+        En modo 'record' las peticiones se reenvían a la API remota y al cerrar se
+        guardan en el cassette (los GET por ruta, las escrituras con hash del cuerpo).
+        """
+        cassette = str(tmp_path / "cassettes" / "api.json")
+        recorder = LocalApiServer(mode="record", cassette_file=cassette, remote_url=upstream.url).start()
+        try:
+            got = requests.get(recorder.url + "/posts/1", timeout=5)
+            created = requests.post(recorder.url + "/posts", json={"title": "nuevo"}, timeout=5)
+        finally:
+            recorder.stop()
+
+        assert got.status_code == 200, f"FAIL: El GET grabado devolvió {got.status_code}."
+        assert got.json() == requests.get(upstream.url + "/posts/1", timeout=5).json(), \
+            "FAIL: El modo record no devolvió la respuesta remota."
+        assert created.status_code == 201, f"FAIL: El POST grabado devolvió {created.status_code}."
+
+        with open(cassette, encoding="utf-8") as f:
+            recorded = json.load(f)
+        assert recorded["GET /posts/1"]["status"] == 200, "FAIL: El GET no quedó grabado."
+        assert json.loads(recorded["GET /posts/1"]["body"])["id"] == 1, "FAIL: Cuerpo grabado incorrecto."
+        assert any(key.startswith("POST /posts ") for key in recorded), "FAIL: El POST no quedó grabado."
+        assert recorder.recorded == 2, f"FAIL: Se esperaban 2 grabaciones. Recibido: {recorder.recorded}"
+
+    # ----------------------------------------------------
+    # PRUEBA 2: REPLAY (Cassette primero, dataset después)
+    # ----------------------------------------------------
+
+    def test_replay_prefers_cassette_and_falls_back_to_dataset(self, tmp_path):
+        """
+        En modo 'replay' una petición grabada se sirve desde el cassette (aunque el dataset
+        tenga el recurso) y una sin grabar se resuelve con el dataset generado.
+        """
+        cassette = tmp_path / "api.json"
+        cassette.write_text(json.dumps({"GET /posts/1": {"status": 200, "body": '{"id": 1, "title": "grabado"}'}}),
+                            encoding="utf-8")
+        server = LocalApiServer(mode="replay", cassette_file=str(cassette)).start()
+        try:
+            recorded = requests.get(server.url + "/posts/1", timeout=5)
+            generated = requests.get(server.url + "/posts/2", timeout=5)
+            revalidated = requests.get(server.url + "/posts/1", timeout=5,
+                                       headers={"If-None-Match": recorded.headers["ETag"]})
+        finally:
+            server.stop()
+
+        assert recorded.json() == {"id": 1, "title": "grabado"}, "FAIL: No se sirvió la respuesta grabada."
+        assert generated.status_code == 200 and generated.json()["id"] == 2, \
+            "FAIL: La ruta sin grabar no se resolvió con el dataset."
+        assert revalidated.status_code == 304, \
+            f"FAIL: El ETag grabado no revalidó (304). Recibido: {revalidated.status_code}"
+
+    # ----------------------------------------------------
+    # PRUEBA 3: CACHÉ DE RESPUESTAS (Acotada)
+    # ----------------------------------------------------
+
+    def test_rendered_cache_is_bounded(self, monkeypatch):
+        """
+        Cada query distinta es una entrada de la caché de respuestas serializadas:
+        se conservan solo las últimas RENDERED_MAX_ENTRIES.
+        """
+        monkeypatch.setattr(local_api, "RENDERED_MAX_ENTRIES", 3)
+        server = LocalApiServer(mode="memory").start()
+        try:
+            for user_id in range(1, 6):
+                status, _, extra = server.handle("GET", f"/posts?userId={user_id}", b"", {})
+                assert status == 200 and extra["ETag"], "FAIL: Respuesta GET sin ETag."
+        finally:
+            server.stop()
+
+        assert list(server._rendered) == [f"GET /posts?userId={n}" for n in (3, 4, 5)], \
+            f"FAIL: La caché no descartó las entradas más viejas: {list(server._rendered)}"
@@ -9,6 +9,13 @@ from utils.logger import get_logger
 
 logger = get_logger()
 
+
+def login_and_add_backpack(driver):
+    """Prefijo compartido por test_02 y test_03: login y mochila en el carrito."""
+    LoginPage(driver).login_with_valid_credentials(fast=True)
+    InventoryPage(driver).add_backpack_to_cart()
+
+
 # Aplicamos el marcador 'ui' a toda la clase para una fácil ejecución selectiva
 @pytest.mark.ui 
 class TestUISauceDemo:
@@ -34,21 +41,19 @@ class TestUISauceDemo:
         logger.info("Verificación de login exitoso completada.")
 
 
-    def test_02_complete_purchase_flow(self, driver):
+    def test_02_complete_purchase_flow(self, driver, checkpoints):
         """
         Prueba 2: Flujo completo de E2E: Login, Agregar productos, Checkout y Compra finalizada.
         """
         logger.info("Iniciando test_02_complete_purchase_flow")
-        login_page = LoginPage(driver)
         inventory_page = InventoryPage(driver)
         cart_page = CartPage(driver)
         checkout_page = CheckoutPage(driver)
 
-        # 1. Login
-        login_page.login_with_valid_credentials()
+        # 1. Login y mochila en el carrito (restaurado desde checkpoint si ya existe)
+        checkpoints.reach(driver, "inventory_with_backpack", login_and_add_backpack, sources=(LoginPage, InventoryPage))
         
         # 2. Agregar Productos y verificar el contador 
-        inventory_page.add_backpack_to_cart()
         inventory_page.add_bike_light_to_cart()
         assert inventory_page.get_cart_count() == "2", "ERROR: El contador del carrito no es '2'."
 
@@ -72,26 +77,25 @@ class TestUISauceDemo:
         assert "Thank you for your order!" in success_message, "ERROR: Mensaje de confirmación incorrecto."
         logger.info("Flujo de compra completado y verificado exitosamente.")
         
-    def test_03_add_and_remove_item(self, driver):
+    def test_03_add_and_remove_item(self, driver, checkpoints):
         """
         Prueba 3: Agrega un item y lo remueve desde la página de Inventario.
         """
         logger.info("Iniciando test_03_add_and_remove_item")
-        login_page = LoginPage(driver)
         inventory_page = InventoryPage(driver)
         
         # El botón de remover para la mochila tiene el ID: remove-sauce-labs-backpack
         REMOVE_BUTTON = (By.ID, "remove-sauce-labs-backpack")
 
-        # 1. Login y Añadir producto
-        login_page.login_with_valid_credentials()
-        inventory_page.add_backpack_to_cart()
-        assert inventory_page.get_cart_count() == "1", "ERROR: Ítem no añadido al carrito."
+        # 1. Login y Añadir producto (restaurado desde checkpoint si ya existe)
+        checkpoints.reach(driver, "inventory_with_backpack", login_and_add_backpack, sources=(LoginPage, InventoryPage))
+        assert inventory_page.get_cart_count(expect_items=True) == "1", "ERROR: Ítem no añadido al carrito."
         
         # 2. Remover el producto
         inventory_page.click_element(REMOVE_BUTTON)
 
-        # 3. Verificación: El contador del carrito debe ser "0"
+        # 3. Verificación: El badge desaparece y el contador del carrito debe ser "0"
+        assert inventory_page.wait_for_cart_badge_to_disappear(), "ERROR: El badge del carrito no desapareció."
         assert inventory_page.get_cart_count() == "0", "ERROR: Ítem no removido del carrito, el contador no es 0."
         logger.info("Adición y remoción verificados.")
 
@@ -0,0 +1,41 @@
+from utils.parallel import assign_shards
+
+
+class TestParallelSharding:
+
+    # ----------------------------------------------------
+    # PRUEBA 1: Reparto LPT por duración histórica
+    # ----------------------------------------------------
+
+    def test_assign_shards_balances_by_duration(self):
+        """
+        Verifica que los tests largos vayan a workers distintos y que la carga quede balanceada.
+        """
+        durations = {"a": 10.0, "b": 9.0, "c": 4.0, "d": 3.0, "e": 2.0, "f": 1.0}
+
+        shards = assign_shards(list(durations), durations, 2)
+
+        loads = [sum(durations[n] for n in shard) for shard in shards]
+        assert sorted(loads) == [14.0, 15.0], f"FAIL: Carga desbalanceada: {loads}"
+        assert not any({"a", "b"} <= set(shard) for shard in shards), "FAIL: Los dos tests largos quedaron juntos."
+
+    def test_assign_shards_keeps_collection_order(self):
+        """
+        Verifica que dentro de cada worker se respete el orden de recolección y que no se pierda ningún test.
+        """
+        nodeids = ["t1", "t2", "t3", "t4", "t5", "t6", "t7"]
+        durations = {"t1": 1.0, "t2": 8.0, "t3": 2.0, "t4": 5.0, "t5": 3.0, "t6": 7.0, "t7": 1.0}
+
+        shards = assign_shards(nodeids, durations, 3)
+
+        assert sorted(n for shard in shards for n in shard) == nodeids, "FAIL: Se perdieron o duplicaron tests."
+        for shard in shards:
+            assert shard == sorted(shard, key=nodeids.index), f"FAIL: Orden de recolección no respetado: {shard}"
+
+    def test_assign_shards_uses_median_for_unknown_tests(self):
+        """
+        Verifica que los tests sin historial se repartan con la mediana de los conocidos.
+        """
+        shards = assign_shards(["nuevo1", "nuevo2", "viejo"], {"viejo": 4.0}, 2)
+
+        assert sorted(len(shard) for shard in shards) == [1, 2], f"FAIL: Reparto inesperado: {shards}"
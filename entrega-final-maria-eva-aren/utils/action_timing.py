@@ -0,0 +1,137 @@
+import functools
+import html
+import time
+
+# Métodos de BasePage que se miden (acciones y esperas). Las llamadas anidadas (ej: click_element
+# -> _wait) se miden cada una y en el waterfall aparecen indentadas bajo la que las contiene.
+INSTRUMENTED_METHODS = (
+    "click_element", "type_text", "fill_form", "get_element_text", "is_element_displayed",
+    "is_element_present_now", "is_element_visible_now", "wait_until_visible", "wait_until_absent",
+    "snapshot", "_wait",
+)
+
+
+def _describe_locator(args: tuple, kwargs: dict) -> str:
+    """Texto del locator (o la URL esperada) de una llamada: 'id=user-name', 'url=https://...'."""
+    for value in list(args) + [kwargs.get("locator")]:
+        if isinstance(value, tuple) and len(value) == 2:
+            return f"{value[0]}={value[1]}"
+        if isinstance(value, dict):     # snapshot({nombre: locator}) o fill_form({locator: texto})
+            return ", ".join(key if isinstance(key, str) else f"{key[0]}={key[1]}" for key in value)
+    if kwargs.get("url"):
+        return f"url={kwargs['url']}"
+    return ""
+
+
+class ActionTimer:
+    """
+    Mide cuánto tarda cada acción y espera de los Page Objects, por clase de página, método y locator.
+    install() reemplaza los métodos de BasePage por versiones medidas y uninstall() restaura los
+    originales: con la medición apagada no se instala nada y el costo es cero.
+    Acumula totales de la sesión (tabla de acciones más lentas) y los eventos del test en curso (waterfall).
+    """
+
+    def __init__(self):
+        self.stats = {}         # (página, método, locator) -> [cantidad, total s, máximo s]
+        self.events = []        # (inicio s, duración s, profundidad, página, método, locator, falló) del test actual
+        self._depth = 0
+        self._test_start = time.perf_counter()
+        self._originals = {}
+
+    def install(self, cls, names=INSTRUMENTED_METHODS):
+        for name in names:
+            original = cls.__dict__[name]
+            self._originals[(cls, name)] = original
+            setattr(cls, name, self._wrap(name, original))
+
+    def uninstall(self):
+        for (cls, name), original in self._originals.items():
+            setattr(cls, name, original)
+        self._originals.clear()
+
+    def _wrap(self, name: str, func):
+        timer = self
+
+        @functools.wraps(func)
+        def timed(page, *args, **kwargs):
+            method = f"{name}[{args[0]}]" if name == "_wait" and args else name
+            depth = timer._depth
+            timer._depth += 1
+            start = time.perf_counter()
+            failed = True
+            try:
+                result = func(page, *args, **kwargs)
+                failed = False
+                return result
+            finally:
+                elapsed = time.perf_counter() - start
+                timer._depth = depth
+                timer._record(type(page).__name__, method, _describe_locator(args, kwargs), start, elapsed, depth, failed)
+
+        return timed
+
+    def _record(self, page: str, method: str, locator: str, start: float, elapsed: float, depth: int, failed: bool):
+        stat = self.stats.get((page, method, locator))
+        if stat is None:
+            stat = self.stats[(page, method, locator)] = [0, 0.0, 0.0]
+        stat[0] += 1
+        stat[1] += elapsed
+        stat[2] = max(stat[2], elapsed)
+        self.events.append((start - self._test_start, elapsed, depth, page, method, locator, failed))
+
+    # ----------------------------------------------------
+    # POR TEST (WATERFALL)
+    # ----------------------------------------------------
+
+    def start_test(self):
+        self.events = []
+        self._depth = 0
+        self._test_start = time.perf_counter()
+
+    def waterfall(self) -> str:
+        """Acciones del test en orden de inicio: desde el inicio del test, duración y anidamiento."""
+        lines = [f"{'inicio':>9} {'duración':>10}  acción"]
+        for offset, elapsed, depth, page, method, locator, failed in sorted(self.events):
+            target = f" ({locator})" if locator else ""
+            mark = "  [falló]" if failed else ""
+            lines.append(f"{offset:>8.3f}s {elapsed * 1000:>8.1f}ms  {'  ' * depth}{page}.{method}{target}{mark}")
+        return "\n".join(lines)
+
+    # ----------------------------------------------------
+    # SESIÓN (ACCIONES MÁS LENTAS)
+    # ----------------------------------------------------
+
+    def slowest(self, limit: int) -> list:
+        """Las 'limit' combinaciones página/método/locator con más tiempo acumulado."""
+        rows = [
+            {"page": page, "method": method, "locator": locator, "count": count,
+             "total": total * 1000, "mean": total / count * 1000, "max": longest * 1000}
+            for (page, method, locator), (count, total, longest) in self.stats.items()
+        ]
+        return sorted(rows, key=lambda row: row["total"], reverse=True)[:limit]
+
+
+def format_slowest_table(rows: list) -> list:
+    lines = [f"{'total':>10} {'veces':>6} {'media':>9} {'máx':>9}  acción"]
+    for row in rows:
+        target = f" ({row['locator']})" if row["locator"] else ""
+        lines.append(
+            f"{row['total']:>8.1f}ms {row['count']:>6} {row['mean']:>7.1f}ms {row['max']:>7.1f}ms  "
+            f"{row['page']}.{row['method']}{target}"
+        )
+    return lines
+
+
+def slowest_table_html(rows: list) -> str:
+    """Tabla HTML de las acciones más lentas para el resumen del reporte de pytest-html."""
+    cells = "".join(
+        f"<tr><td>{html.escape(row['page'])}</td><td>{html.escape(row['method'])}</td>"
+        f"<td>{html.escape(row['locator'])}</td><td>{row['count']}</td><td>{row['total']:.0f}</td>"
+        f"<td>{row['mean']:.1f}</td><td>{row['max']:.1f}</td></tr>"
+        for row in rows
+    )
+    return (
+        "<h2>Acciones más lentas (ms)</h2><table><thead><tr><th>Página</th><th>Método</th><th>Locator</th>"
+        "<th>Veces</th><th>Total</th><th>Media</th><th>Máx</th></tr></thead>"
+        f"<tbody>{cells}</tbody></table>"
+    )
@@ -1,19 +1,97 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 import requests
-from config.settings import API_BASE_URL
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+from config.settings import API_BASE_URL, API_POOL_SIZE, API_KEEP_ALIVE, API_CONNECT_TIMEOUT, API_READ_TIMEOUT
+from config.settings import API_RETRIES, API_BACKOFF_FACTOR, API_BATCH_WORKERS, API_CACHE, API_SLA
+from utils.latency import EndpointLatencies, format_latency_table, parse_budgets
 from utils.logger import get_logger
+from utils.response_cache import ResponseCache
+
+# Status que ameritan reintentar una petición idempotente (rate limit y errores transitorios del servidor)
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Métodos que modifican un recurso (invalidan lo que el cache tenga de ese recurso)
+WRITE_METHODS = ("POST", "PUT", "PATCH", "DELETE")
+
+# JSONPlaceholder requiere la cabecera Content-Type para POST/PUT/PATCH
+JSON_HEADERS = {'Content-type': 'application/json; charset=UTF-8'}
+
+
+@dataclass
+class BatchResult:
+    """Resultado de una petición de un lote (get_many / post_many / iter_many)."""
+    index: int                  # Posición en la lista de entrada
+    method: str
+    endpoint: str
+    response: requests.Response = None
+    error: Exception = None     # Error de conexión/timeout (la petición no tuvo respuesta)
+    elapsed: float = 0.0        # Segundos, incluyendo reintentos
+
+    @property
+    def status(self):
+        return self.response.status_code if self.response is not None else None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.response is not None and self.response.ok
+
 
 class ApiClient:
     """
     Cliente genérico para interactuar con la API REST.
     Encapsula la librería requests y añade logging.
+    La sesión usa un pool de conexiones por host (keep-alive), timeouts de conexión
+    y de lectura en todas las peticiones, y reintentos con backoff exponencial
+    solo para los métodos idempotentes (GET, PUT, DELETE, HEAD, OPTIONS).
     """
     
     logger = get_logger()
 
-    def __init__(self, base_url=API_BASE_URL):
-        """Inicializa el cliente con la URL base de la API."""
+    def __init__(self, base_url=API_BASE_URL, pool_size=API_POOL_SIZE, keep_alive=API_KEEP_ALIVE,
+                 connect_timeout=API_CONNECT_TIMEOUT, read_timeout=API_READ_TIMEOUT,
+                 retries=API_RETRIES, backoff_factor=API_BACKOFF_FACTOR, cache=API_CACHE, sla=API_SLA):
+        """
+        Inicializa el cliente con la URL base de la API.
+        :param pool_size: Conexiones que se mantienen abiertas por host (usar al menos la cantidad de hilos concurrentes).
+        :param keep_alive: Si es False cada petición abre y cierra su propia conexión.
+        :param connect_timeout: Segundos máximos para establecer la conexión.
+        :param read_timeout: Segundos máximos esperando datos del servidor.
+        :param retries: Reintentos ante errores de conexión o status transitorios (0 = sin reintentos).
+        :param backoff_factor: Espera base entre reintentos (factor * 2^(intento - 1) segundos).
+        :param cache: True (o un ResponseCache) para cachear los GET de la sesión con revalidación por ETag.
+        :param sla: Presupuestos de p95 para toda la sesión en el formato de API_SLA (ver set_sla).
+        """
         self.base_url = base_url
+        self.timeout = (connect_timeout, read_timeout)
         self.session = requests.Session()
+        self.adapter = _CountingAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=Retry(
+                total=retries,
+                backoff_factor=backoff_factor,
+                status_forcelist=RETRY_STATUSES,
+                allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,  # POST no se reintenta: no es idempotente
+                raise_on_status=False,  # Agotados los reintentos se retorna la última respuesta
+            ),
+        )
+        self.session.mount("http://", self.adapter)
+        self.session.mount("https://", self.adapter)
+        if not keep_alive:
+            self.session.headers["Connection"] = "close"
+        self.cache = cache if isinstance(cache, ResponseCache) else (ResponseCache() if cache else None)
+        # Histogramas de latencia por método y endpoint de toda la sesión, y presupuestos de p95
+        self.latencies = EndpointLatencies()
+        self.sla = parse_budgets(sla)
+        # Objetos con record(method, endpoint, status, elapsed) que reciben la latencia de cada petición
+        # enviada a la red (ej: los histogramas del modo de carga). status es None si no hubo respuesta.
+        self.recorders = [self.latencies]
         # Se puede añadir una cabecera global de ser necesario (x ej: Authorization)
         # self.session.headers.update({'Accept': 'application/json'})
 
@@ -22,15 +100,38 @@ class ApiClient:
         Método privado genérico para ejecutar peticiones HTTP.
         :param method: Método HTTP (GET, POST, DELETE, etc.)
         :param endpoint: Ruta específica de la API (ej: /posts)
-        :param kwargs: Argumentos adicionales pasados a requests (data, json, params, headers)
+        :param kwargs: Argumentos adicionales pasados a requests (data, json, params, headers, timeout)
         :return: Objeto Response de requests.
         """
         url = f"{self.base_url}{endpoint}"
+        # Solo se cachean los GET simples (sin cabeceras ni cuerpo propios)
+        cache_key = None
+        if self.cache is not None and method == "GET" and set(kwargs) <= {"params", "timeout"}:
+            cache_key = self.cache.key(url, kwargs.get("params"))
+            cached, conditional = self.cache.lookup(cache_key)
+            if cached is not None:
+                self.logger.info(f"-> API Request: {method} {url} (desde cache)")
+                return cached
+            if conditional:
+                kwargs["headers"] = conditional
         self.logger.info(f"-> API Request: {method} {url}")
+        # Sin timeout, una conexión colgada bloquearía el fixture de sesión para siempre
+        kwargs.setdefault("timeout", self.timeout)
+        start = time.perf_counter()
         
         try:
-            response = self.session.request(method, url, **kwargs)
-            self.logger.info(f"<- API Response: {response.status_code} - Tiempo: {response.elapsed.total_seconds():.3f}s")
+            response = self._send(method, endpoint, url, kwargs)
+            if cache_key is not None:
+                cached = self.cache.update(cache_key, response)
+                if cached is None:
+                    # 304 pero la entrada se desalojó (otro hilo) desde el lookup: se repite sin revalidar
+                    self.logger.info(f"-> API Request: {method} {url} (entrada desalojada, sin revalidar)")
+                    kwargs.pop("headers", None)
+                    response = self._send(method, endpoint, url, kwargs)
+                    cached = self.cache.update(cache_key, response)
+                response = cached if cached is not None else response
+            elif self.cache is not None and method in WRITE_METHODS:
+                self.cache.invalidate(url)
             response.raise_for_status() # Tira una excepción si el status code indica error (4xx o 5xx)
             return response
         except requests.exceptions.HTTPError as e:
@@ -38,8 +139,18 @@ class ApiClient:
             return e.response # Retorna la respuesta de error para que el test la valide
         except requests.exceptions.RequestException as e:
             self.logger.critical(f"Error de conexión en {url}: {e}")
+            for recorder in self.recorders:
+                recorder.record(method, endpoint, None, time.perf_counter() - start)
             raise # Tira la excepción para que Pytest marque el test como error
 
+    def _send(self, method: str, endpoint: str, url: str, kwargs: dict):
+        """Envía la petición por la sesión y registra su latencia."""
+        response = self.session.request(method, url, **kwargs)
+        elapsed = response.elapsed.total_seconds()
+        self.logger.info(f"<- API Response: {response.status_code} - Tiempo: {elapsed:.3f}s")
+        for recorder in self.recorders:
+            recorder.record(method, endpoint, response.status_code, elapsed)
+        return response
 
     def get(self, endpoint: str, params=None):
         """Implementa la petición GET."""
@@ -47,15 +158,167 @@ class ApiClient:
 
     def post(self, endpoint: str, data=None, json=None):
         """Implementa la petición POST."""
-        # JSONPlaceholder requiere la cabecera Content-Type para POST/PUT/PATCH
-        headers = {'Content-type': 'application/json; charset=UTF-8'}
-        return self._request("POST", endpoint, data=data, json=json, headers=headers)
+        return self._request("POST", endpoint, data=data, json=json, headers=JSON_HEADERS)
 
     def delete(self, endpoint: str):
         """Implementa la petición DELETE."""
         return self._request("DELETE", endpoint)
+
+    # ----------------------------------------------------
+    # PETICIONES EN LOTE (concurrentes sobre la misma sesión)
+    # ----------------------------------------------------
+
+    def get_many(self, endpoints, params=None, max_workers=API_BATCH_WORKERS) -> list:
+        """
+        Ejecuta un GET por cada endpoint en paralelo.
+        :return: Lista de BatchResult en el mismo orden que 'endpoints'.
+        """
+        return list(self.iter_many("GET", ((endpoint, {"params": params}) for endpoint in endpoints), max_workers))
+
+    def post_many(self, endpoint: str, payloads, max_workers=API_BATCH_WORKERS) -> list:
+        """
+        Ejecuta un POST (JSON) al mismo endpoint por cada payload en paralelo.
+        :return: Lista de BatchResult en el mismo orden que 'payloads'.
+        """
+        calls = ((endpoint, {"json": payload, "headers": JSON_HEADERS}) for payload in payloads)
+        return list(self.iter_many("POST", calls, max_workers))
+
+    def iter_many(self, method: str, calls, max_workers=API_BATCH_WORKERS):
+        """
+        Versión streaming de los lotes: consume 'calls' de a poco y va entregando los
+        resultados en orden de entrada, con a lo sumo 2 * max_workers peticiones en vuelo.
+        Así un lote de miles de peticiones no se guarda completo en memoria.
+        Conviene que max_workers no supere el tamaño del pool (API_POOL_SIZE) para reutilizar conexiones.
+        :param calls: Iterable de tuplas (endpoint, kwargs) con los argumentos de requests de cada petición.
+        :return: Generador de BatchResult.
+        """
+        window = max(1, max_workers) * 2
+        with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="api-batch") as executor:
+            pending = deque()
+            try:
+                for index, (endpoint, kwargs) in enumerate(calls):
+                    pending.append(executor.submit(self._batch_request, index, method, endpoint, kwargs))
+                    if len(pending) >= window:
+                        yield pending.popleft().result()
+                while pending:
+                    yield pending.popleft().result()
+            finally:
+                # Si quien consume corta la iteración, no se envían las peticiones que faltan
+                for future in pending:
+                    future.cancel()
+
+    def _batch_request(self, index: int, method: str, endpoint: str, kwargs: dict) -> BatchResult:
+        """Ejecuta una petición del lote sin propagar errores de conexión (quedan en el resultado)."""
+        result = BatchResult(index=index, method=method, endpoint=endpoint)
+        start = time.perf_counter()
+        try:
+            result.response = self._request(method, endpoint, **kwargs)
+        except requests.exceptions.RequestException as e:
+            result.error = e
+        result.elapsed = time.perf_counter() - start
+        return result
+
+    # ----------------------------------------------------
+    # LATENCIAS Y PRESUPUESTOS (SLA)
+    # ----------------------------------------------------
+
+    def set_sla(self, p95_ms: float, endpoint: str = None, method: str = None):
+        """
+        Agrega un presupuesto de p95 que se controla al final de la sesión.
+        :param endpoint: Ruta con los ids como {id} (ej: /posts/{id}). None = todos los endpoints.
+        :param method: Método HTTP. None = todos los métodos.
+        """
+        self.sla.append({"p95_ms": p95_ms, "endpoint": endpoint, "method": method and method.upper()})
+
+    def sla_violations(self) -> list:
+        """Presupuestos de la sesión excedidos (mensajes), según los histogramas acumulados."""
+        return self.latencies.check_budgets(self.sla)
+
+    def latency_report(self) -> list:
+        """Tabla de p50/p90/p95/p99/máx por endpoint de toda la sesión (líneas de texto)."""
+        return format_latency_table(self.latencies.stats())
+
+    def connection_stats(self) -> dict:
+        """
+        Peticiones enviadas (incluye reintentos) y conexiones abiertas vs. reutilizadas.
+        Con el pool funcionando, 'reused' debería ser la gran mayoría.
+        """
+        return self.adapter.connection_stats()
+
+    def summary(self) -> str:
+        """Resumen del uso de conexiones (y del cache, si está activo) para el final de la sesión."""
+        stats = self.connection_stats()
+        summary = (
+            f"Peticiones: {stats['requests']} | "
+            f"conexiones abiertas: {stats['opened']} | "
+            f"reutilizadas: {stats['reused']}"
+        )
+        if self.cache is not None:
+            summary += f"\n{self.cache.summary()}"
+        return summary
     
     def close_session(self):
         """Cierra la sesión de requests (buena práctica)."""
         self.session.close()
 
+
+class _CountingAdapter(HTTPAdapter):
+    """
+    HTTPAdapter que suma las peticiones y las conexiones TCP abiertas de cada pool de urllib3,
+    incluidos los pools que el PoolManager descarta (ej: al superar la cantidad de hosts).
+    Se cuentan los connect() reales: urllib3 reconecta sobre el mismo objeto de conexión
+    cuando el servidor la cerró (o sin keep-alive), y eso no suma en num_connections.
+    """
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self._lock = threading.Lock()
+        self._retired = {"requests": 0, "opened": 0}
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _CountingHTTPConnectionPool, "https": _CountingHTTPSConnectionPool,
+        }
+
+        def retire(pool):
+            # urllib3 2.x no cierra los pools desalojados (quedan al GC): solo se suman sus contadores
+            with self._lock:
+                self._retired["requests"] += pool.num_requests
+                self._retired["opened"] += pool.num_opened
+
+        self.poolmanager.pools.dispose_func = retire
+
+    def connection_stats(self) -> dict:
+        pools = self.poolmanager.pools
+        live = [pool for pool in (pools.get(key) for key in pools.keys()) if pool is not None]
+        with self._lock:
+            requests_sent = self._retired["requests"] + sum(pool.num_requests for pool in live)
+            opened = self._retired["opened"] + sum(pool.num_opened for pool in live)
+        return {"requests": requests_sent, "opened": opened, "reused": max(0, requests_sent - opened)}
+
+
+class _CountingPoolMixin:
+    """Cuenta cada connect() de las conexiones del pool (nuevas o reconectadas)."""
+
+    num_opened = 0
+
+    def _new_conn(self):
+        conn = super()._new_conn()
+        connect = conn.connect
+
+        def counted_connect():
+            with _count_lock:
+                self.num_opened += 1
+            connect()
+
+        conn.connect = counted_connect
+        return conn
+
+
+_count_lock = threading.Lock()
+
+
+class _CountingHTTPConnectionPool(_CountingPoolMixin, HTTPConnectionPool):
+    pass
+
+
+class _CountingHTTPSConnectionPool(_CountingPoolMixin, HTTPSConnectionPool):
+    pass
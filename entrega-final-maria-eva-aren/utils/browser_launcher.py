@@ -0,0 +1,166 @@
+import threading
+import time
+from collections import deque
+from utils.logger import get_logger
+
+logger = get_logger()
+
+
+class BrowserLauncher:
+    """
+    Lanzador de navegadores "pre-calentados".
+    Un hilo de fondo mantiene 'depth' navegadores ya levantados y listos,
+    de modo que el arranque de Chrome/chromedriver se superpone con la
+    recolección y con la ejecución de los tests anteriores.
+    Con depth=0 no hay hilo: cada get() crea el navegador en el momento.
+    """
+
+    def __init__(self, factory, depth=1, limit=None):
+        """
+        :param factory: Callable que crea y retorna un WebDriver (ej: DriverFactory.get_driver).
+        :param depth: Cantidad de navegadores que se mantienen listos por adelantado.
+        :param limit: Total de navegadores a levantar en segundo plano (None = sin límite). Con el pool
+                      alcanza con los que el pool va a tener: después cada get() crea en el momento.
+        """
+        self._factory = factory
+        self.depth = max(0, int(depth))
+        self.limit = limit
+        self._ready = deque()       # Tuplas (driver, error, segundos_de_arranque)
+        self._launching = 0
+        self._launched = 0
+        self._cond = threading.Condition()
+        self._stopped = False
+        self._thread = None
+        self._thread_done = False   # El hilo terminó (límite alcanzado, shutdown o error inesperado)
+        self._thread_error = None
+        # Métricas para el resumen de la sesión
+        self.delivered = 0
+        self.wait_time = 0.0        # Tiempo que los tests estuvieron bloqueados esperando
+        self.launch_time = 0.0      # Tiempo total de arranque de los navegadores entregados
+        self.hidden_time = 0.0      # Arranque que quedó oculto detrás de otros tests
+
+    def start(self):
+        """Arranca el hilo de fondo (si depth > 0)."""
+        if self.depth and self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="browser-launcher", daemon=True)
+            self._thread.start()
+            logger.info(f"Lanzador de navegadores iniciado (profundidad: {self.depth}).")
+        return self
+
+    def get(self):
+        """
+        Retorna un navegador listo. Si todavía se está levantando, espera a que termine.
+        Los errores del arranque en segundo plano se relanzan acá, en el test que lo pidió.
+        """
+        start = time.perf_counter()
+        with self._cond:
+            while self._thread is not None and not self._ready and not self._thread_done and not self._stopped:
+                self._cond.wait()
+            if self._stopped:
+                raise RuntimeError("El lanzador de navegadores ya se detuvo (fin de la sesión).")
+            if self._thread_error is not None and not self._ready:
+                raise RuntimeError("El hilo del lanzador de navegadores terminó inesperadamente.") from self._thread_error
+            item = self._ready.popleft() if self._ready else None
+            # Avisa al hilo de fondo que hay un lugar libre para levantar el siguiente
+            self._cond.notify_all()
+
+        if item is None:
+            # Sin pre-calentado (depth=0 o límite alcanzado): se crea en el momento
+            driver = self._factory()
+            elapsed = time.perf_counter() - start
+            self._account(elapsed, elapsed)
+            return driver
+
+        driver, error, launch_elapsed = item
+
+        waited = time.perf_counter() - start
+        if error is not None:
+            raise error
+        self._account(waited, launch_elapsed)
+        return driver
+
+    def shutdown(self):
+        """Detiene el hilo y cierra los navegadores que quedaron sin usar."""
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=60)
+        with self._cond:
+            leftovers, self._ready = list(self._ready), deque()
+        for driver, error, _ in leftovers:
+            if driver is not None:
+                self._quit(driver)
+
+    def summary(self) -> str:
+        """Línea de resumen con el tiempo esperado vs. el tiempo ocultado."""
+        return (
+            f"Navegadores entregados: {self.delivered} | "
+            f"arranque total: {self.launch_time:.2f}s | "
+            f"esperado por los tests: {self.wait_time:.2f}s | "
+            f"ocultado: {self.hidden_time:.2f}s"
+        )
+
+    # ----------------------------------------------------
+    # MÉTODOS INTERNOS
+    # ----------------------------------------------------
+
+    def _run(self):
+        """Hilo de fondo. Al terminar, por el motivo que sea, despierta a los get() que esperan."""
+        try:
+            self._replenish()
+        except BaseException as e:
+            logger.error(f"El hilo del lanzador de navegadores terminó con un error: {e}")
+            self._thread_error = e
+            raise
+        finally:
+            with self._cond:
+                self._thread_done = True
+                self._cond.notify_all()
+
+    def _replenish(self):
+        """Repone navegadores hasta tener 'depth' listos (o hasta levantar 'limit' en total)."""
+        while True:
+            with self._cond:
+                while not self._stopped and len(self._ready) + self._launching >= self.depth:
+                    self._cond.wait()
+                if self._stopped or (self.limit is not None and self._launched >= self.limit):
+                    return
+                self._launching += 1
+                self._launched += 1
+
+            driver, error = None, None
+            start = time.perf_counter()
+            try:
+                driver = self._factory()
+            except Exception as e:
+                logger.error(f"Fallo el arranque de un navegador en segundo plano: {e}")
+                error = e
+            elapsed = time.perf_counter() - start
+
+            with self._cond:
+                self._launching -= 1
+                stopped = self._stopped
+                if not stopped:
+                    self._ready.append((driver, error, elapsed))
+                    self._cond.notify_all()
+
+            if stopped:
+                # La sesión terminó mientras se levantaba: no se va a usar
+                if driver is not None:
+                    self._quit(driver)
+                return
+
+    def _account(self, waited, launch_elapsed):
+        with self._cond:
+            self.delivered += 1
+            self.wait_time += waited
+            self.launch_time += launch_elapsed
+            self.hidden_time += max(0.0, launch_elapsed - waited)
+
+    @staticmethod
+    def _quit(driver):
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.debug(f"Error al cerrar un navegador pre-calentado: {e}")
@@ -0,0 +1,189 @@
+import hashlib
+import inspect
+import json
+import sys
+import time
+from urllib.parse import urlsplit
+from config.settings import WORKER_ID
+from utils.logger import get_logger
+
+logger = get_logger()
+
+# Prefijo de las claves en el cache de pytest (una carpeta por worker)
+CACHE_PREFIX = f"checkpoints/{WORKER_ID or 'main'}"
+
+# Margen (en segundos) para descartar checkpoints cuyas cookies están por vencer
+EXPIRY_MARGIN = 60
+
+# Lee URL, localStorage y sessionStorage en una sola llamada
+_CAPTURE_JS = """
+var dump = function (storage) {
+    var data = {};
+    for (var i = 0; i < storage.length; i++) {
+        var key = storage.key(i);
+        data[key] = storage.getItem(key);
+    }
+    return data;
+};
+return {url: window.location.href, local: dump(window.localStorage), session: dump(window.sessionStorage)};
+"""
+
+# Carga localStorage y sessionStorage (se ejecuta en el origen del checkpoint)
+_SEED_JS = """
+(function (origin, local, session) {
+    if (window.location.origin !== origin) { return; }
+    Object.keys(local).forEach(function (k) { window.localStorage.setItem(k, local[k]); });
+    Object.keys(session).forEach(function (k) { window.sessionStorage.setItem(k, session[k]); });
+})(%s, %s, %s);
+"""
+
+
+class CheckpointStore:
+    """
+    Checkpoints del estado del navegador (URL, cookies, localStorage y sessionStorage)
+    guardados después de un paso con nombre de un flujo.
+    La primera vez se ejecutan los pasos reales y se captura el estado; las siguientes
+    se restaura ese estado en un solo paso en lugar de repetir las acciones de UI.
+    Los checkpoints se guardan por worker y se invalidan cuando cambia el código de los
+    Page Objects (o del paso) que los generaron, o el sitio bajo prueba.
+    """
+
+    def __init__(self, cache=None, site: str = ""):
+        """
+        :param cache: config.cache de pytest (opcional) para reutilizar checkpoints entre corridas.
+        :param site: URL base del sitio bajo prueba (BasePage.base_url). Un checkpoint grabado contra
+                     SauceDemo no sirve para la réplica local ni al revés; la réplica local usa un
+                     puerto distinto en cada corrida, así que sus checkpoints solo valen en la corrida.
+        """
+        self._cache = cache
+        self.site = site
+        self._memory = {}
+        self.hits = 0
+        self.misses = 0
+
+    def reach(self, driver, name: str, build, sources=()) -> bool:
+        """
+        Deja el navegador en el estado del checkpoint 'name'.
+        :param build: Callable build(driver) que ejecuta los pasos reales del flujo.
+        :param sources: Clases o módulos de Page Objects usados por build (para invalidar).
+        :return: True si se restauró desde un checkpoint, False si se ejecutaron los pasos.
+        """
+        fingerprint = self._fingerprint(build, sources, self.site)
+        checkpoint = self._load(name)
+        if checkpoint and checkpoint["fingerprint"] == fingerprint and not self._expired(checkpoint):
+            self._restore(driver, checkpoint)
+            self.hits += 1
+            logger.info(f"Checkpoint '{name}' restaurado ({checkpoint['url']}).")
+            return True
+
+        build(driver)
+        self._save(name, self._capture(driver, fingerprint))
+        self.misses += 1
+        logger.info(f"Checkpoint '{name}' generado ejecutando los pasos del flujo.")
+        return False
+
+    # ----------------------------------------------------
+    # CAPTURA Y RESTAURACIÓN
+    # ----------------------------------------------------
+
+    @staticmethod
+    def _capture(driver, fingerprint: str) -> dict:
+        state = driver.execute_script(_CAPTURE_JS)
+        return {
+            "fingerprint": fingerprint,
+            "url": state["url"],
+            "cookies": driver.get_cookies(),
+            "local": state["local"],
+            "session": state["session"],
+        }
+
+    @staticmethod
+    def _restore(driver, checkpoint: dict):
+        """Restaura el estado con una sola carga de página en Chrome (dos en otros navegadores)."""
+        parts = urlsplit(checkpoint["url"])
+        origin = f"{parts.scheme}://{parts.netloc}"
+        seed = _SEED_JS % (
+            json.dumps(origin), json.dumps(checkpoint["local"]), json.dumps(checkpoint["session"])
+        )
+
+        if hasattr(driver, "execute_cdp_cmd"):
+            # Chrome: cookies por CDP (sin estar en el dominio) y storage cargado antes
+            # de que corran los scripts de la aplicación
+            for cookie in checkpoint["cookies"]:
+                driver.execute_cdp_cmd("Network.setCookie", _to_cdp_cookie(cookie, origin))
+            script = driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": seed})
+            try:
+                driver.get(checkpoint["url"])
+            finally:
+                driver.execute_cdp_cmd(
+                    "Page.removeScriptToEvaluateOnNewDocument", {"identifier": script["identifier"]}
+                )
+            return
+
+        # Otros navegadores: hay que estar en el origen para escribir cookies y storage
+        driver.get(origin)
+        for cookie in checkpoint["cookies"]:
+            driver.add_cookie(cookie)
+        driver.execute_script(seed)
+        driver.get(checkpoint["url"])
+
+    # ----------------------------------------------------
+    # PERSISTENCIA E INVALIDACIÓN
+    # ----------------------------------------------------
+
+    def _load(self, name: str):
+        if name in self._memory:
+            return self._memory[name]
+        if self._cache is not None:
+            return self._cache.get(f"{CACHE_PREFIX}/{name}", None)
+        return None
+
+    def _save(self, name: str, checkpoint: dict):
+        self._memory[name] = checkpoint
+        if self._cache is not None:
+            self._cache.set(f"{CACHE_PREFIX}/{name}", checkpoint)
+
+    @staticmethod
+    def _expired(checkpoint: dict) -> bool:
+        """Un checkpoint no sirve si alguna de sus cookies vence (ej: la sesión de SauceDemo)."""
+        limit = time.time() + EXPIRY_MARGIN
+        return any("expiry" in c and c["expiry"] < limit for c in checkpoint["cookies"])
+
+    @staticmethod
+    def _fingerprint(build, sources, site: str = "") -> str:
+        """Hash del sitio, del código fuente de los Page Objects y del código del paso que genera el checkpoint."""
+        digest = hashlib.sha1(site.encode())
+        for source in sources:
+            module = source if inspect.ismodule(source) else sys.modules[source.__module__]
+            with open(module.__file__, "rb") as f:
+                digest.update(f.read())
+        _hash_code(digest, build.__code__)
+        return digest.hexdigest()
+
+
+def _hash_code(digest, code):
+    """
+    Agrega al hash el bytecode, los nombres y las constantes (literales como el usuario o el id
+    de un producto) de un code object, incluyendo los de funciones y lambdas anidadas.
+    """
+    digest.update(code.co_code)
+    digest.update(repr(code.co_names).encode())
+    for const in code.co_consts:
+        if inspect.iscode(const):
+            _hash_code(digest, const)
+        elif isinstance(const, frozenset):
+            # El orden de un frozenset de strings cambia entre procesos (hash aleatorio)
+            digest.update(repr(sorted(const, key=repr)).encode())
+        else:
+            digest.update(repr(const).encode())
+
+
+def _to_cdp_cookie(cookie: dict, origin: str) -> dict:
+    """Convierte una cookie con formato WebDriver al formato de Network.setCookie (CDP)."""
+    params = {"name": cookie["name"], "value": cookie["value"], "url": origin}
+    for key in ("domain", "path", "secure", "httpOnly", "sameSite"):
+        if key in cookie:
+            params[key] = cookie[key]
+    if "expiry" in cookie:
+        params["expires"] = cookie["expiry"]
+    return params
@@ -0,0 +1,137 @@
+import weakref
+from selenium.common.exceptions import WebDriverException
+from utils.logger import get_logger
+
+logger = get_logger()
+
+# ----------------------------------------------------
+# FUNCIONES JS COMPARTIDAS (snapshot de BasePage y esperas)
+# ----------------------------------------------------
+
+# find(by, value): resuelve un locator de Selenium (By.*) dentro de la página
+FIND_ELEMENTS_JS = """
+var toArray = function (list) { return Array.prototype.slice.call(list); };
+var find = function (by, value) {
+    switch (by) {
+        case 'id': return toArray(document.querySelectorAll('#' + CSS.escape(value)));
+        case 'class name': return toArray(document.getElementsByClassName(value));
+        case 'css selector': return toArray(document.querySelectorAll(value));
+        case 'name': return toArray(document.getElementsByName(value));
+        case 'tag name': return toArray(document.getElementsByTagName(value));
+        case 'xpath':
+            var result = document.evaluate(value, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            var nodes = [];
+            for (var i = 0; i < result.snapshotLength; i++) { nodes.push(result.snapshotItem(i)); }
+            return nodes;
+        case 'link text':
+        case 'partial link text':
+            return toArray(document.getElementsByTagName('a')).filter(function (a) {
+                var text = (a.innerText || '').trim();
+                return by === 'link text' ? text === value : text.indexOf(value) !== -1;
+            });
+    }
+    throw new Error('Tipo de locator no soportado: ' + by);
+};
+"""
+
+# isVisible(el): misma idea que EC.visibility_of_element_located (tiene tamaño y no está oculto)
+IS_VISIBLE_JS = """
+var isVisible = function (el) {
+    if (!el.getClientRects().length) { return false; }
+    var style = window.getComputedStyle(el);
+    return style.visibility !== 'hidden' && style.display !== 'none' && parseFloat(style.opacity) !== 0;
+};
+"""
+
+# Espera dentro de la página: evalúa la condición y, si no se cumple, instala un
+# MutationObserver (más listeners de navegación) que resuelve apenas cambia el DOM/URL.
+# Un chequeo periódico liviano cubre cambios que no son mutaciones (ej: estilos cargados tarde).
+_OBSERVE_JS = FIND_ELEMENTS_JS + IS_VISIBLE_JS + """
+var condition = arguments[0], by = arguments[1], value = arguments[2], timeoutMs = arguments[3];
+var done = arguments[arguments.length - 1];
+var check = function () {
+    if (condition === 'url') { return window.location.href === value ? true : null; }
+    var elements = find(by, value);
+    switch (condition) {
+        case 'present': return elements[0] || null;
+        case 'visible': return elements.filter(isVisible)[0] || null;
+        case 'clickable': return elements.filter(function (el) { return isVisible(el) && !el.disabled; })[0] || null;
+        case 'absent': return elements.some(isVisible) ? null : true;
+    }
+    throw new Error('Condición no soportada: ' + condition);
+};
+var initial = check();
+if (initial) { done(initial); return; }
+var finished = false, observer, timer, safety;
+var finish = function (result) {
+    if (finished) { return; }
+    finished = true;
+    observer.disconnect();
+    clearTimeout(timer);
+    clearInterval(safety);
+    window.removeEventListener('popstate', onChange);
+    window.removeEventListener('hashchange', onChange);
+    done(result);
+};
+var onChange = function () {
+    var result = check();
+    if (result) { finish(result); }
+};
+observer = new MutationObserver(onChange);
+observer.observe(document.documentElement, {childList: true, subtree: true, attributes: true, characterData: true});
+window.addEventListener('popstate', onChange);
+window.addEventListener('hashchange', onChange);
+safety = setInterval(onChange, 250);
+timer = setTimeout(function () { finish(null); }, timeoutMs);
+"""
+
+# Margen extra del script timeout del driver sobre el timeout de la espera (segundos)
+SCRIPT_TIMEOUT_MARGIN = 5
+
+# Script timeout ya configurado en cada driver (se libera junto con el driver)
+_script_timeouts = weakref.WeakKeyDictionary()
+
+
+class ObserverUnavailable(Exception):
+    """La espera por MutationObserver no se pudo completar (ej: la página navegó). Usar el fallback."""
+
+
+class DomWaiter:
+    """
+    Motor de esperas basado en eventos: cada espera es un único execute_async_script
+    que se resuelve en el navegador apenas la condición se cumple, en lugar de
+    consultar a chromedriver cada 500 ms como WebDriverWait.
+    """
+
+    CONDITIONS = ("present", "visible", "clickable", "absent", "url")
+
+    def __init__(self, driver):
+        self.driver = driver
+
+    def until(self, condition: str, locator: tuple = None, timeout: float = 10, url: str = None):
+        """
+        Espera a que se cumpla la condición.
+        :param condition: "present", "visible", "clickable", "absent" o "url".
+        :param locator: Locator (By, valor) para las condiciones de elementos.
+        :param url: URL esperada para la condición "url".
+        :return: El WebElement (present/visible/clickable), True (absent/url) o None si venció el timeout.
+        :raises ObserverUnavailable: Si la espera no se pudo hacer en la página.
+        """
+        if condition not in self.CONDITIONS:
+            raise ValueError(f"Condición de espera no soportada: {condition}")
+        by, value = (None, url) if condition == "url" else locator
+
+        self._ensure_script_timeout(timeout)
+        try:
+            return self.driver.execute_async_script(_OBSERVE_JS, condition, by, value, int(timeout * 1000))
+        except WebDriverException as e:
+            # Típicamente "document unloaded while waiting for result" si hubo navegación completa
+            logger.debug(f"Espera por MutationObserver no disponible ({condition} {locator or url}): {e.msg}")
+            raise ObserverUnavailable(str(e)) from e
+
+    def _ensure_script_timeout(self, timeout: float):
+        """Ajusta el script timeout del driver solo cuando hace falta (cuesta un round trip)."""
+        needed = timeout + SCRIPT_TIMEOUT_MARGIN
+        if _script_timeouts.get(self.driver, 0) < needed:
+            self.driver.set_script_timeout(needed)
+            _script_timeouts[self.driver] = needed
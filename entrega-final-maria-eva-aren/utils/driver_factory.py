@@ -1,40 +1,178 @@
+import os
+import threading
+import weakref
+from dataclasses import dataclass, field
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.firefox.options import Options as FirefoxOptions
+from config.settings import IMPLICIT_WAIT, BROWSER_PROFILE, BROWSER_PROFILE_NAMES, BROWSER_CACHE_DIR, WORKER_ID
+
+
+@dataclass(frozen=True)
+class BrowserProfile:
+    """
+    Perfil de arranque del navegador. El mismo perfil se traduce a las opciones
+    de Chrome o de Firefox en DriverFactory.
+    """
+    headless: bool = False
+    window_size: tuple = None              # (ancho, alto); None = maximizado
+    page_load_strategy: str = "normal"     # "normal" espera todos los recursos; "eager" solo el DOM
+    disable_extensions: bool = False
+    disable_gpu: bool = False
+    disable_background_throttling: bool = False  # Sin frenar timers/render de pestañas en segundo plano
+    shared_cache: bool = False             # Cache de disco en BROWSER_CACHE_DIR, compartido entre sesiones
+    network_log: bool = False              # Log de performance con los eventos de red (Chrome, ver NetworkPolicy)
+    extra_args: tuple = field(default_factory=tuple)
+
+
+# Perfiles disponibles (--browser-profile / BROWSER_PROFILE)
+BROWSER_PROFILES = {
+    # Comportamiento original: con ventana, maximizado y carga "normal"
+    "default": BrowserProfile(),
+    # Lo más rápido para correr localmente: sin ventana, tamaño fijo, DOM listo alcanza
+    "fast-headless": BrowserProfile(
+        headless=True, window_size=(1366, 768), page_load_strategy="eager", disable_extensions=True,
+        disable_gpu=True, disable_background_throttling=True, shared_cache=True,
+    ),
+    # Para depurar a ojo: con ventana de tamaño fijo (capturas comparables) y carga completa
+    "debug-headed": BrowserProfile(
+        window_size=(1366, 768), disable_extensions=True, disable_background_throttling=True,
+    ),
+    # Contenedores de CI: como fast-headless, con resolución de escritorio y flags para Docker
+    "ci": BrowserProfile(
+        headless=True, window_size=(1920, 1080), page_load_strategy="eager", disable_extensions=True,
+        disable_gpu=True, disable_background_throttling=True, shared_cache=True,
+        extra_args=("--no-sandbox", "--disable-dev-shm-usage"),
+    ),
+}
+
+# Las opciones de pytest validan --browser-profile con BROWSER_PROFILE_NAMES (config.settings) sin importar
+# este módulo (ni Selenium): un perfil agregado acá tiene que agregarse también allá
+if tuple(BROWSER_PROFILES) != BROWSER_PROFILE_NAMES:
+    raise RuntimeError(
+        f"BROWSER_PROFILE_NAMES {BROWSER_PROFILE_NAMES} no coincide con BROWSER_PROFILES {tuple(BROWSER_PROFILES)}"
+    )
+
+
+# Carpetas de cache en uso por los navegadores abiertos de este proceso (número de slot)
+_cache_slots = set()
+_cache_slots_lock = threading.Lock()
+
+
+def cache_dir(slot: int = 0) -> str:
+    """
+    Carpeta del cache de disco compartido entre sesiones. Hay una por navegador abierto a la vez
+    (worker + slot): dos Chrome no pueden usar el mismo cache (ej: el pre-calentado y el del pool).
+    """
+    return os.path.join(BROWSER_CACHE_DIR, f"{WORKER_ID or 'main'}-{slot}")
+
+
+def _claim_cache_slot() -> int:
+    """Reserva el slot libre más bajo: las sesiones siguientes reutilizan las mismas carpetas."""
+    with _cache_slots_lock:
+        slot = 0
+        while slot in _cache_slots:
+            slot += 1
+        _cache_slots.add(slot)
+        return slot
+
+
+def _release_cache_slot(slot: int):
+    with _cache_slots_lock:
+        _cache_slots.discard(slot)
+
 
 class DriverFactory:
     @staticmethod
-    def get_driver(browser="chrome"):
+    def get_driver(browser="chrome", implicit_wait=IMPLICIT_WAIT, profile=BROWSER_PROFILE):
         """
         Inicializa y retorna una instancia de WebDriver.
         Por defecto usa Chrome, pero se prepara para escalabilidad.
+        :param implicit_wait: Espera implícita en segundos. Con 0 no hay espera implícita
+                              y find_elements retorna al instante cuando no hay coincidencias.
+        :param profile: Nombre de un perfil de BROWSER_PROFILES (o un BrowserProfile).
         """
+        if not isinstance(profile, BrowserProfile):
+            if profile not in BROWSER_PROFILES:
+                raise ValueError(f"Perfil de navegador no soportado: {profile}")
+            profile = BROWSER_PROFILES[profile]
+        # El slot se libera cuando el driver deja de existir (después de quit)
+        slot = _claim_cache_slot() if profile.shared_cache else None
+        try:
+            driver = DriverFactory._launch(browser, profile, slot)
+        except BaseException:
+            if slot is not None:
+                _release_cache_slot(slot)
+            raise
+        if slot is not None:
+            weakref.finalize(driver, _release_cache_slot, slot)
+
+        # Configuración global de esperas implícitas (backup safety net)
+        # Es preferible usar esperas explícitas en los Page Objects,
+        # pero esto ayuda con cargas lentas inesperadas.
+        if implicit_wait:
+            driver.implicitly_wait(implicit_wait)
+
+        return driver
+
+    @staticmethod
+    def _launch(browser: str, profile: BrowserProfile, slot: int):
+        """Arma las opciones del perfil para el navegador pedido y lo abre."""
         driver = None
-        
         if browser.lower() == "chrome":
             # Opciones de configuración para Chrome
             options = Options()
-            options.add_argument("--start-maximized") # Iniciar maximizado
             options.add_argument("--ignore-certificate-errors") # Ignorar errores SSL
-            
-            # options.add_argument("--headless") 
-            # options.add_argument("--no-sandbox")
-            # options.add_argument("--disable-dev-shm-usage")
+            options.page_load_strategy = profile.page_load_strategy
+            if profile.window_size:
+                options.add_argument("--window-size=%d,%d" % profile.window_size)
+            else:
+                options.add_argument("--start-maximized") # Iniciar maximizado
+            if profile.headless:
+                options.add_argument("--headless=new")
+            if profile.disable_extensions:
+                options.add_argument("--disable-extensions")
+            if profile.disable_gpu:
+                options.add_argument("--disable-gpu")
+            if profile.disable_background_throttling:
+                options.add_argument("--disable-background-timer-throttling")
+                options.add_argument("--disable-backgrounding-occluded-windows")
+                options.add_argument("--disable-renderer-backgrounding")
+            if profile.shared_cache:
+                options.add_argument(f"--disk-cache-dir={cache_dir(slot)}")
+            for argument in profile.extra_args:
+                options.add_argument(argument)
+            if profile.network_log:
+                options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
 
             # Inicialización del driver
             driver = webdriver.Chrome(options=options)
-        
+
         elif browser.lower() == "firefox":
-            # Esto sería la lógica para Firefox de ser necesario
-            driver = webdriver.Firefox()
-            
+            options = FirefoxOptions()
+            options.accept_insecure_certs = True
+            options.page_load_strategy = profile.page_load_strategy
+            if profile.headless:
+                options.add_argument("-headless")
+            if profile.window_size:
+                options.add_argument(f"--width={profile.window_size[0]}")
+                options.add_argument(f"--height={profile.window_size[1]}")
+            if profile.disable_extensions:
+                options.set_preference("extensions.enabledScopes", 0)
+            if profile.disable_gpu:
+                options.set_preference("layers.acceleration.disabled", True)
+            if profile.disable_background_throttling:
+                options.set_preference("dom.timeout.enable_budget_timer_throttling", False)
+                options.set_preference("dom.min_background_timeout_value", 4)
+            if profile.shared_cache:
+                options.set_preference("browser.cache.disk.parent_directory", cache_dir(slot))
+            # Los flags de extra_args son de Chrome (ej: --no-sandbox); Firefox no los necesita
+            driver = webdriver.Firefox(options=options)
+            if not profile.window_size and not profile.headless:
+                driver.maximize_window()
+
         else:
             raise ValueError(f"Navegador no soportado: {browser}")
-            
-        # Configuración global de esperas implícitas (backup safety net)
-        # Es preferible usar esperas explícitas en los Page Objects, 
-        # pero esto ayuda con cargas lentas inesperadas.
-        driver.implicitly_wait(5)
-        
-        return driver
 
+        return driver
@@ -0,0 +1,134 @@
+import threading
+from selenium.common.exceptions import NoAlertPresentException
+from utils.driver_factory import DriverFactory
+from utils.logger import get_logger
+
+logger = get_logger()
+
+# Limpia el almacenamiento web del origen actual.
+# En 'about:blank' el acceso a localStorage tira SecurityError, por eso el try.
+_CLEAR_STORAGE_JS = """
+try { window.localStorage.clear(); } catch (e) {}
+try { window.sessionStorage.clear(); } catch (e) {}
+return true;
+"""
+
+BLANK_PAGE = "about:blank"
+
+
+class DriverPool:
+    """
+    Pool de navegadores reutilizables dentro de un mismo proceso (worker).
+    Los tests toman un driver con checkout() y lo devuelven con checkin().
+    Al devolverlo se limpia el estado (cookies, localStorage, sessionStorage)
+    y se navega a 'about:blank', así cada test arranca con un navegador limpio
+    sin pagar el costo de levantar Chrome de nuevo.
+    """
+
+    def __init__(self, browser="chrome", factory=None):
+        """
+        :param browser: Navegador a usar cuando el pool necesita crear un driver nuevo.
+        :param factory: Callable opcional que crea drivers (por defecto DriverFactory).
+        """
+        self.browser = browser
+        self._factory = factory or (lambda: DriverFactory.get_driver(browser=browser))
+        self._idle = []
+        self._in_use = set()
+        self._lock = threading.Lock()
+        # Contadores para el resumen de la sesión
+        self.created = 0
+        self.reused = 0
+        self.discarded = 0
+
+    def checkout(self):
+        """Entrega un driver libre del pool, o crea uno nuevo si no hay ninguno."""
+        with self._lock:
+            driver = self._idle.pop() if self._idle else None
+
+        if driver is None:
+            driver = self._factory()
+            self.created += 1
+            logger.info(f"Pool: nuevo navegador creado ({self.created} en total).")
+        else:
+            self.reused += 1
+
+        with self._lock:
+            self._in_use.add(driver)
+        return driver
+
+    def checkin(self, driver):
+        """
+        Recibe un driver de vuelta. Si el reset falla (navegador colgado o cerrado),
+        se descarta y el próximo checkout() crea un reemplazo.
+        """
+        with self._lock:
+            self._in_use.discard(driver)
+
+        if self._reset(driver):
+            with self._lock:
+                self._idle.append(driver)
+        else:
+            self.discarded += 1
+            logger.warning("Pool: el navegador no respondió al reset. Se descarta y se reemplazará.")
+            self._quit(driver)
+
+    def close_all(self):
+        """Cierra todos los navegadores del pool (teardown de la sesión)."""
+        with self._lock:
+            drivers = self._idle + list(self._in_use)
+            self._idle = []
+            self._in_use = set()
+        for driver in drivers:
+            self._quit(driver)
+        logger.info(
+            f"Pool cerrado. Navegadores creados: {self.created}, "
+            f"reutilizados: {self.reused}, descartados: {self.discarded}."
+        )
+
+    # ----------------------------------------------------
+    # MÉTODOS INTERNOS
+    # ----------------------------------------------------
+
+    def _reset(self, driver) -> bool:
+        """Deja el navegador como recién abierto. Retorna False si está roto."""
+        try:
+            self._dismiss_alert(driver)
+            self._close_extra_windows(driver)
+
+            # Primero se limpia el origen actual y después se sale de la página
+            driver.execute_script(_CLEAR_STORAGE_JS)
+            driver.delete_all_cookies()
+            if hasattr(driver, "execute_cdp_cmd"):
+                # Chrome: borra también las cookies de otros dominios visitados
+                driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+
+            driver.get(BLANK_PAGE)
+            return True
+        except Exception as e:
+            # WebDriverException, errores de conexión con chromedriver, ventana cerrada, etc.
+            logger.debug(f"Fallo el reset del navegador: {e}")
+            return False
+
+    @staticmethod
+    def _dismiss_alert(driver):
+        """Cierra un alert que haya quedado abierto (si no, bloquea cualquier comando)."""
+        try:
+            driver.switch_to.alert.dismiss()
+        except NoAlertPresentException:
+            pass
+
+    @staticmethod
+    def _close_extra_windows(driver):
+        """Cierra pestañas/ventanas abiertas por el test y vuelve a la principal."""
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+
+    @staticmethod
+    def _quit(driver):
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.debug(f"Error al cerrar un navegador del pool: {e}")
@@ -0,0 +1,187 @@
+import html
+import json
+import math
+import os
+import re
+import threading
+
+# Segmentos numéricos de la ruta (ids): /posts/1 y /posts/2 cuentan como el mismo endpoint
+_ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+# Histograma logarítmico: cada bucket es un 5% más ancho que el anterior, desde 0.1 ms.
+# Error relativo de los percentiles <= 5%, con memoria fija (~300 buckets hasta 10 minutos).
+_MIN_MS = 0.1
+_GROWTH = 1.05
+
+
+def endpoint_template(endpoint: str) -> str:
+    """Ruta sin query y con los ids reemplazados (ej: /posts/1/comments?x=1 -> /posts/{id}/comments)."""
+    return _ID_SEGMENT.sub("/{id}", endpoint.split("?", 1)[0])
+
+
+class LatencyHistogram:
+    """Histograma de latencias (ms) con buckets logarítmicos: registrar es O(1) y no guarda cada muestra."""
+
+    def __init__(self):
+        self.counts = {}        # índice de bucket -> cantidad
+        self.count = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def add(self, ms: float, error: bool = False):
+        index = int(math.log(ms / _MIN_MS, _GROWTH)) + 1 if ms > _MIN_MS else 0
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.errors += error
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def merge(self, other: "LatencyHistogram"):
+        """Suma las muestras de otro histograma (ej: el de un worker en modo paralelo)."""
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+        self.errors += other.errors
+        self.total_ms += other.total_ms
+        self.max_ms = max(self.max_ms, other.max_ms)
+
+    def percentile(self, pct: float) -> float:
+        """Límite superior del bucket donde cae el percentil (nunca mayor que el máximo observado)."""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(self.count * pct / 100))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(_MIN_MS * _GROWTH ** index, self.max_ms)
+        return self.max_ms
+
+
+class EndpointLatencies:
+    """
+    Un LatencyHistogram por método y endpoint. Implementa record(method, endpoint, status, elapsed),
+    así que se engancha a ApiClient.recorders (el cliente tiene uno propio para toda la sesión).
+    Es seguro para usar desde varios hilos.
+    """
+
+    def __init__(self):
+        self.histograms = {}    # (método, endpoint) -> LatencyHistogram
+        self._lock = threading.Lock()
+
+    def record(self, method: str, endpoint: str, status, elapsed: float):
+        """:param status: Status HTTP, o None si la petición no tuvo respuesta (error de conexión/timeout)."""
+        key = (method, endpoint_template(endpoint))
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = LatencyHistogram()
+            histogram.add(elapsed * 1000, error=status is None or status >= 400)
+
+    def to_json(self) -> list:
+        """Histogramas serializables (para enviarlos de un worker al coordinador)."""
+        with self._lock:
+            return [
+                {"method": method, "endpoint": endpoint, "counts": list(h.counts.items()),
+                 "count": h.count, "errors": h.errors, "total_ms": h.total_ms, "max_ms": h.max_ms}
+                for (method, endpoint), h in self.histograms.items()
+            ]
+
+    def merge_json(self, data: list):
+        """Suma a estos histogramas los serializados con to_json."""
+        for item in data:
+            other = LatencyHistogram()
+            other.counts = {index: count for index, count in item["counts"]}
+            other.count, other.errors = item["count"], item["errors"]
+            other.total_ms, other.max_ms = item["total_ms"], item["max_ms"]
+            with self._lock:
+                self.histograms.setdefault((item["method"], item["endpoint"]), LatencyHistogram()).merge(other)
+
+    def stats(self, wall_time: float = 0.0) -> list:
+        """Una fila por endpoint: peticiones, throughput (si se pasa la duración), tasa de error y percentiles (ms)."""
+        with self._lock:
+            items = sorted(self.histograms.items(), key=lambda kv: (kv[0][1], kv[0][0]))
+            return [{
+                "method": method, "endpoint": endpoint, "requests": h.count,
+                "rps": h.count / wall_time if wall_time else 0.0,
+                "error_rate": h.errors / h.count,
+                "mean": h.total_ms / h.count,
+                **{f"p{pct}": h.percentile(pct) for pct in (50, 90, 95, 99)},
+                "max": h.max_ms,
+            } for (method, endpoint), h in items]
+
+    def check_budgets(self, budgets: list) -> list:
+        """
+        Compara el p95 de cada endpoint con los presupuestos.
+        :param budgets: Lista de dicts {"p95_ms", "endpoint" (None = todos), "method" (None = todos)}.
+        :return: Mensajes de los presupuestos excedidos (vacía si se cumplen todos).
+        """
+        violations = []
+        for row in self.stats():
+            for budget in budgets:
+                if budget.get("method") not in (None, row["method"]):
+                    continue
+                if budget.get("endpoint") not in (None, row["endpoint"]):
+                    continue
+                if row["p95"] > budget["p95_ms"]:
+                    violations.append(
+                        f"{row['method']} {row['endpoint']}: p95 {row['p95']:.1f} ms > {budget['p95_ms']:g} ms "
+                        f"({row['requests']} peticiones)"
+                    )
+        return violations
+
+
+def parse_budgets(text: str) -> list:
+    """
+    Presupuestos de p95 desde texto (variable API_SLA), separados por ';':
+    "GET /posts/{id}=300; POST /posts=800; /users=500; *=1000" (sin método = todos los métodos, * = todos los endpoints).
+    """
+    budgets = []
+    for part in filter(None, (p.strip() for p in text.split(";"))):
+        target, _, p95_ms = part.rpartition("=")
+        words = target.split()
+        method = words[0].upper() if len(words) == 2 else None
+        endpoint = words[-1] if words and words[-1] != "*" else None
+        budgets.append({"p95_ms": float(p95_ms), "endpoint": endpoint, "method": method})
+    return budgets
+
+
+def format_latency_table(rows: list, throughput: bool = False) -> list:
+    """Líneas de la tabla por endpoint para la consola y los reportes."""
+    rps = f" {'req/s':>8}" if throughput else ""
+    lines = [f"{'método':<7} {'endpoint':<28} {'req':>7}{rps} {'error':>7} "
+             f"{'p50':>8} {'p90':>8} {'p95':>8} {'p99':>8} {'máx':>8}"]
+    for row in rows:
+        rps = f" {row['rps']:>8.1f}" if throughput else ""
+        lines.append(
+            f"{row['method']:<7} {row['endpoint']:<28} {row['requests']:>7}{rps} {row['error_rate']:>7.1%} "
+            f"{row['p50']:>6.1f}ms {row['p90']:>6.1f}ms {row['p95']:>6.1f}ms {row['p99']:>6.1f}ms {row['max']:>6.1f}ms"
+        )
+    return lines
+
+
+def export_latencies(path: str, rows: list, violations: list):
+    """Escribe las latencias por endpoint y los presupuestos excedidos en un JSON (para comparar corridas)."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        rounded = [{key: round(value, 3) if isinstance(value, float) else value for key, value in row.items()} for row in rows]
+        json.dump({"endpoints": rounded, "sla_violations": violations}, f, indent=2)
+
+
+def latency_table_html(rows: list, violations: list) -> str:
+    """Tabla HTML de latencias por endpoint para el resumen del reporte de pytest-html."""
+    cells = "".join(
+        f"<tr><td>{row['method']}</td><td>{html.escape(row['endpoint'])}</td><td>{row['requests']}</td>"
+        f"<td>{row['error_rate']:.1%}</td>"
+        + "".join(f"<td>{row[key]:.1f}</td>" for key in ("p50", "p95", "p99", "max"))
+        + "</tr>"
+        for row in rows
+    )
+    alerts = "".join(f'<p style="color:#c00">SLA excedido: {html.escape(v)}</p>' for v in violations)
+    return (
+        "<h2>Latencias de API (ms)</h2>" + alerts
+        + "<table><thead><tr><th>Método</th><th>Endpoint</th><th>Peticiones</th><th>Error</th>"
+        "<th>p50</th><th>p95</th><th>p99</th><th>Máx</th></tr></thead>"
+        f"<tbody>{cells}</tbody></table>"
+    )
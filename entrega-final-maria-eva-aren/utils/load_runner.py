@@ -0,0 +1,186 @@
+import logging
+import threading
+import time
+import pytest
+from _pytest.outcomes import Failed, OutcomeException, XFailed
+from config.settings import LOAD_MAX_ERROR_RATE
+from utils.latency import EndpointLatencies, LatencyHistogram, format_latency_table
+from utils.logger import get_logger
+
+logger = get_logger()
+
+
+class _RatePacer:
+    """Reparte turnos a los usuarios virtuales para no superar 'rate' iteraciones por segundo en total."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def wait(self, stop: threading.Event):
+        if not self.interval:
+            return
+        with self._lock:
+            slot = max(self._next, time.perf_counter())
+            self._next = slot + self.interval
+        delay = slot - time.perf_counter()
+        if delay > 0:
+            stop.wait(delay)
+
+
+class LoadRunner:
+    """
+    Ejecuta un escenario (un callable sin argumentos, ej: un test de API con sus fixtures ya
+    resueltos) con N usuarios virtuales en hilos, durante 'duration' segundos y/o 'iterations'
+    iteraciones por usuario (lo que ocurra primero). Los usuarios arrancan escalonados a lo largo
+    de 'ramp_up' segundos y, si 'rate' > 0, el total de iteraciones por segundo se limita a 'rate'.
+    Una iteración falla si el escenario lanza una excepción (ej: un assert del test o pytest.fail()).
+    Un pytest.skip()/xfail() dentro del escenario corta la carga y se relanza en run().
+    """
+
+    def __init__(self, scenario, users: int, duration: float = 0, iterations: int = 0, ramp_up: float = 0,
+                 rate: float = 0):
+        if duration <= 0 and iterations <= 0:
+            raise ValueError("La prueba de carga necesita una duración o una cantidad de iteraciones")
+        self.scenario = scenario
+        self.users = max(1, users)
+        self.duration = duration
+        self.iterations = iterations
+        self.ramp_up = ramp_up
+        self.rate = rate
+        # Resultados de la corrida
+        self.completed = 0
+        self.failures = 0
+        self.first_error = None
+        self.outcome = None     # skip/xfail del escenario, se relanza en el hilo que llamó a run()
+        self.latencies = LatencyHistogram()  # Duración de cada iteración completa (ms), memoria fija
+        self.wall_time = 0.0
+        self._lock = threading.Lock()
+
+    def run(self):
+        stop = threading.Event()
+        pacer = _RatePacer(self.rate)
+        start = time.perf_counter()
+        deadline = start + self.duration if self.duration > 0 else None
+        threads = [
+            threading.Thread(target=self._user, args=(index, start, deadline, pacer, stop),
+                             name=f"load-user-{index}", daemon=True)
+            for index in range(self.users)
+        ]
+        # Sin un log por petición: a cientos de peticiones por segundo la consola frena la carga
+        logging.disable(logging.INFO)
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            if self.outcome is not None:
+                raise self.outcome
+        except KeyboardInterrupt:
+            stop.set()
+            raise
+        finally:
+            logging.disable(logging.NOTSET)
+            self.wall_time = time.perf_counter() - start
+        return self
+
+    def _user(self, index: int, start: float, deadline, pacer: _RatePacer, stop: threading.Event):
+        # Rampa lineal: el usuario i arranca en i * ramp_up / users segundos
+        if self.ramp_up > 0 and stop.wait(start + index * self.ramp_up / self.users - time.perf_counter()):
+            return
+        done = 0
+        while not stop.is_set() and (not self.iterations or done < self.iterations):
+            pacer.wait(stop)
+            began = time.perf_counter()
+            if deadline is not None and began >= deadline:
+                break
+            error = None
+            try:
+                self.scenario()
+            except OutcomeException as e:
+                if isinstance(e, Failed) and not isinstance(e, XFailed):
+                    error = e   # pytest.fail(): la iteración falla igual que con un assert
+                else:
+                    # skip()/xfail() son BaseException: sin esto matarían el hilo sin registrar nada
+                    with self._lock:
+                        self.outcome = self.outcome or e
+                    stop.set()
+                    return
+            except Exception as e:
+                error = e
+            elapsed = time.perf_counter() - began
+            done += 1
+            with self._lock:
+                self.completed += 1
+                self.latencies.add(elapsed * 1000, error=error is not None)
+                if error is not None:
+                    self.failures += 1
+                    self.first_error = self.first_error or error
+
+    @property
+    def error_rate(self) -> float:
+        return self.failures / self.completed if self.completed else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"{self.users} usuarios | {self.completed} iteraciones en {self.wall_time:.1f}s "
+            f"({self.completed / self.wall_time if self.wall_time else 0:.1f}/s) | "
+            f"errores {self.error_rate:.1%} | p50 {self.latencies.percentile(50):.0f} ms | "
+            f"p95 {self.latencies.percentile(95):.0f} ms"
+        )
+
+
+class LoadTestPlugin:
+    """
+    Modo de carga (--load-users=N): cada test de API seleccionado se ejecuta como escenario
+    de LoadRunner en lugar de una sola vez, reutilizando sus fixtures (el api_client de la sesión
+    se comparte entre todos los usuarios virtuales). Las latencias por endpoint salen de
+    response.elapsed vía ApiClient.recorders. El test falla si la tasa de error supera
+    LOAD_MAX_ERROR_RATE. Los tests de UI se ejecutan normalmente.
+    """
+
+    def __init__(self, config, max_error_rate=LOAD_MAX_ERROR_RATE):
+        self.options = {
+            "users": config.getoption("load_users"),
+            "duration": config.getoption("load_duration"),
+            "iterations": config.getoption("load_iterations"),
+            "ramp_up": config.getoption("load_ramp_up"),
+            "rate": config.getoption("load_rate"),
+        }
+        self.max_error_rate = max_error_rate
+        self.results = []    # (nodeid, LoadRunner, filas por endpoint)
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_pyfunc_call(self, pyfuncitem):
+        client = pyfuncitem.funcargs.get("api_client")
+        if pyfuncitem.get_closest_marker("api") is None or client is None:
+            return None
+        testargs = {name: pyfuncitem.funcargs[name] for name in pyfuncitem._fixtureinfo.argnames}
+        recorder = EndpointLatencies()
+        client.recorders.append(recorder)
+        try:
+            runner = LoadRunner(lambda: pyfuncitem.obj(**testargs), **self.options).run()
+        finally:
+            client.recorders.remove(recorder)
+        rows = recorder.stats(runner.wall_time)
+        self.results.append((pyfuncitem.nodeid, runner, rows))
+        table = format_latency_table(rows, throughput=True)
+        pyfuncitem.add_report_section("call", "Prueba de carga", "\n".join([runner.summary()] + table))
+        if not runner.completed:
+            raise AssertionError(f"La prueba de carga no completó ninguna iteración ({runner.summary()})")
+        if runner.error_rate > self.max_error_rate:
+            raise AssertionError(
+                f"Tasa de error {runner.error_rate:.1%} > {self.max_error_rate:.1%} "
+                f"({runner.failures}/{runner.completed}). Primer error: {runner.first_error!r}"
+            )
+        return True
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.results:
+            return
+        terminalreporter.write_sep("-", "Prueba de carga")
+        for nodeid, runner, rows in self.results:
+            terminalreporter.write_line(f"{nodeid}: {runner.summary()}")
+            for line in format_latency_table(rows, throughput=True):
+                terminalreporter.write_line(f"    {line}")
@@ -0,0 +1,309 @@
+import hashlib
+import json
+import os
+import random
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+import requests
+from config.settings import API_BASE_URL, API_CASSETTE_FILE
+from utils.logger import get_logger
+
+logger = get_logger()
+
+# Los 10 usuarios de JSONPlaceholder (nombre, username)
+_USERS = (
+    ("Leanne Graham", "Bret"), ("Ervin Howell", "Antonette"), ("Clementine Bauch", "Samantha"),
+    ("Patricia Lebsack", "Karianne"), ("Chelsey Dietrich", "Kamren"), ("Mrs. Dennis Schulist", "Leopoldo_Corkery"),
+    ("Kurtis Weissnat", "Elwyn.Skiles"), ("Nicholas Runolfsdottir V", "Maxime_Nienow"),
+    ("Glenna Reichert", "Delphine"), ("Clementina DuBuque", "Moriah.Stanton"),
+)
+
+_WORDS = (
+    "sunt aut facere repellat provident occaecati excepturi optio reprehenderit qui est esse ea molestias "
+    "quasi exercitationem nesciunt magnam voluptatem dolorem eum fugiat quo voluptas nulla pariatur "
+    "quia et suscipit recusandae consequuntur expedita rerum tempore vitae sequi sint nihil"
+).split()
+
+JSON_CONTENT_TYPE = "application/json; charset=utf-8"
+
+# Respuestas GET ya serializadas (con su ETag) que se guardan: una por ruta y query distintas
+RENDERED_MAX_ENTRIES = 1024
+
+
+def generate_dataset(seed: int = 1) -> dict:
+    """
+    Dataset en memoria con la misma forma y cantidades que JSONPlaceholder
+    (los textos son lorem ipsum generado, igual de determinístico en cada corrida).
+    """
+    rng = random.Random(seed)
+
+    def text(words):
+        return " ".join(rng.choice(_WORDS) for _ in range(words))
+
+    users = []
+    for user_id, (name, username) in enumerate(_USERS, start=1):
+        users.append({
+            "id": user_id, "name": name, "username": username,
+            "email": f"{username.lower()}@example.com",
+            "address": {
+                "street": text(2).title(), "suite": f"Apt. {rng.randint(100, 999)}", "city": text(1).title(),
+                "zipcode": f"{rng.randint(10000, 99999)}-{rng.randint(1000, 9999)}",
+                "geo": {"lat": f"{rng.uniform(-90, 90):.4f}", "lng": f"{rng.uniform(-180, 180):.4f}"},
+            },
+            "phone": f"1-770-736-{rng.randint(1000, 9999)}", "website": f"{username.lower()}.org",
+            "company": {"name": text(1).title(), "catchPhrase": text(4), "bs": text(3)},
+        })
+
+    data = {"users": users}
+    data["posts"] = [
+        {"userId": (i - 1) // 10 + 1, "id": i, "title": text(6), "body": "\n".join(text(8) for _ in range(4))}
+        for i in range(1, 101)
+    ]
+    data["comments"] = [
+        {"postId": (i - 1) // 5 + 1, "id": i, "name": text(5), "email": f"{text(1)}{i}@example.net",
+         "body": "\n".join(text(8) for _ in range(4))}
+        for i in range(1, 501)
+    ]
+    data["albums"] = [{"userId": (i - 1) // 10 + 1, "id": i, "title": text(5)} for i in range(1, 101)]
+    data["photos"] = []
+    for i in range(1, 5001):
+        color = f"{rng.randrange(0x1000000):06x}"
+        data["photos"].append({
+            "albumId": (i - 1) // 50 + 1, "id": i, "title": text(5),
+            "url": f"https://via.placeholder.com/600/{color}", "thumbnailUrl": f"https://via.placeholder.com/150/{color}",
+        })
+    data["todos"] = [
+        {"userId": (i - 1) // 20 + 1, "id": i, "title": text(5), "completed": rng.random() < 0.5}
+        for i in range(1, 201)
+    ]
+    return data
+
+
+class LocalApiServer:
+    """
+    Reemplazo local de JSONPlaceholder en un puerto efímero (servidor HTTP con un hilo por conexión).
+    Sirve /posts, /comments, /albums, /photos, /todos y /users (con filtros por query y rutas
+    anidadas como /posts/1/comments) desde un dataset en memoria. Igual que el servicio real,
+    POST/PUT/PATCH/DELETE responden como si hubieran escrito pero no modifican los datos.
+    Modos:
+      - "replay": responde con las grabaciones (cassettes) si existen y si no con el dataset.
+      - "record": reenvía cada petición a la API real y guarda las respuestas en el cassette.
+      - "memory": solo el dataset.
+    """
+
+    MODES = ("replay", "record", "memory")
+
+    def __init__(self, host="127.0.0.1", port=0, mode="replay", cassette_file=API_CASSETTE_FILE,
+                 remote_url=API_BASE_URL):
+        if mode not in self.MODES:
+            raise ValueError(f"Modo no soportado: {mode}")
+        self.mode = mode
+        self.cassette_file = cassette_file
+        self.remote_url = remote_url.rstrip("/")
+        self.data = generate_dataset()
+        self.cassettes = self._load_cassettes() if mode != "memory" else {}
+        self.recorded = 0
+        self._rendered = OrderedDict()  # Respuestas ya serializadas: clave -> (status, cuerpo, ETag), LRU
+        self._lock = threading.Lock()
+        self._remote = requests.Session() if mode == "record" else None
+        self._httpd = ThreadingHTTPServer((host, port), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.app = self
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="local-api", daemon=True)
+        self._thread.start()
+        logger.info(f"API local ({self.mode}) escuchando en {self.url}")
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self.mode == "record" and self.recorded:
+            self._save_cassettes()
+            logger.info(f"Cassette actualizado: {self.recorded} respuestas grabadas en {self.cassette_file}")
+
+    # ----------------------------------------------------
+    # RESPUESTAS
+    # ----------------------------------------------------
+
+    def handle(self, method: str, target: str, body: bytes, headers) -> tuple:
+        """
+        Procesa una petición. :return: (status, cuerpo en bytes, cabeceras extra). Las respuestas GET
+        del cassette y del dataset traen su ETag, calculado junto con el cuerpo una sola vez.
+        """
+        key = _cassette_key(method, target, body)
+        if self.mode == "record":
+            return self._record(key, method, target, body, headers)
+        if key in self.cassettes:
+            recorded = self.cassettes[key]
+            status, payload, tag = self._cached(key, lambda: (recorded["status"], recorded["body"].encode("utf-8")))
+            return status, payload, {"ETag": tag} if method == "GET" else {}
+
+        parts = urlsplit(target)
+        segments = [s for s in parts.path.split("/") if s]
+        if method == "GET":
+            return self._get(key, segments, parse_qsl(parts.query))
+        if not segments or segments[0] not in self.data or len(segments) > 2:
+            return 404, b"{}", {}
+
+        try:
+            payload = json.loads(body) if body else {}
+        except ValueError:
+            payload = {}  # Cuerpo que no es JSON (ej: form data): JSONPlaceholder solo devuelve el id
+        if method == "POST" and len(segments) == 1:
+            # JSONPlaceholder: eco de lo enviado con el siguiente id (no se guarda)
+            return 201, _render({**payload, "id": len(self.data[segments[0]]) + 1}), {}
+        if len(segments) == 2:
+            item = self._find(segments[0], segments[1])
+            if item is None:
+                return 404, b"{}", {}
+            if method == "DELETE":
+                return 200, b"{}", {}
+            if method == "PUT":
+                return 200, _render({**payload, "id": item["id"]}), {}
+            if method == "PATCH":
+                return 200, _render({**item, **payload}), {}
+        return 404, b"{}", {}
+
+    def _get(self, key: str, segments: list, query: list) -> tuple:
+        def build():
+            result = self._resolve(segments, query)
+            return (200, _render(result)) if result is not None else (404, b"{}")
+
+        status, payload, tag = self._cached(key, build)
+        extra = {"ETag": tag}
+        if status == 200:
+            extra["Cache-Control"] = "max-age=43200"
+        return status, payload, extra
+
+    def _cached(self, key: str, build) -> tuple:
+        """
+        (status, cuerpo, ETag) de una respuesta que no cambia: build() y el hash del ETag corren una
+        sola vez por clave. Guarda las últimas RENDERED_MAX_ENTRIES (cada query distinta es una clave).
+        """
+        with self._lock:
+            cached = self._rendered.get(key)
+            if cached is not None:
+                self._rendered.move_to_end(key)
+                return cached
+        status, payload = build()
+        cached = (status, payload, etag(payload))
+        with self._lock:
+            self._rendered[key] = cached
+            if len(self._rendered) > RENDERED_MAX_ENTRIES:
+                self._rendered.popitem(last=False)
+        return cached
+
+    def _resolve(self, segments: list, query: list):
+        """Resuelve /recurso, /recurso/id y /padre/id/recurso (con filtros ?campo=valor)."""
+        if not segments or segments[0] not in self.data or len(segments) > 3:
+            return None
+        if len(segments) == 2:
+            return self._find(segments[0], segments[1])
+        items = self.data[segments[0]]
+        if len(segments) == 3:
+            parent, parent_id, child = segments
+            if child not in self.data or self._find(parent, parent_id) is None:
+                return None
+            field = f"{parent[:-1]}Id"
+            items = [item for item in self.data[child] if str(item.get(field)) == parent_id]
+        filters = {}
+        for name, value in query:
+            if not name.startswith("_"):
+                filters.setdefault(name, set()).add(value)
+        items = [item for item in items if all(_as_text(item.get(k)) in v for k, v in filters.items())]
+        params = dict(query)
+        start = int(params.get("_start", 0))
+        end = start + int(params["_limit"]) if "_limit" in params else None
+        return items[start:end]
+
+    def _find(self, resource: str, item_id: str):
+        items = self.data[resource]
+        if item_id.isdigit() and 1 <= int(item_id) <= len(items):
+            return items[int(item_id) - 1]
+        return None
+
+    # ----------------------------------------------------
+    # GRABACIÓN (CASSETTES)
+    # ----------------------------------------------------
+
+    def _record(self, key: str, method: str, target: str, body: bytes, headers) -> tuple:
+        forward = {name: headers[name] for name in ("Content-Type", "Accept") if headers.get(name)}
+        response = self._remote.request(method, self.remote_url + target, data=body or None,
+                                        headers=forward, timeout=30)
+        with self._lock:
+            self.cassettes[key] = {"status": response.status_code, "body": response.text}
+            self.recorded += 1
+        return response.status_code, response.content, {}
+
+    def _load_cassettes(self) -> dict:
+        if not os.path.exists(self.cassette_file):
+            return {}
+        with open(self.cassette_file, encoding="utf-8") as f:
+            return json.load(f)
+
+    def _save_cassettes(self):
+        os.makedirs(os.path.dirname(self.cassette_file), exist_ok=True)
+        with open(self.cassette_file, "w", encoding="utf-8") as f:
+            json.dump(self.cassettes, f, indent=2, sort_keys=True)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Handler HTTP/1.1 (keep-alive) que delega en LocalApiServer.handle."""
+
+    protocol_version = "HTTP/1.1"
+    # Cabeceras y cuerpo salen en escrituras separadas: sin TCP_NODELAY, Nagle + delayed ACK
+    # agregan ~40 ms por respuesta en conexiones keep-alive
+    disable_nagle_algorithm = True
+
+    def _dispatch(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        status, payload, extra = self.server.app.handle(self.command, self.path, body, self.headers)
+
+        if self.command == "GET":
+            extra.setdefault("ETag", etag(payload))
+            if status == 200 and self.headers.get("If-None-Match") == extra["ETag"]:
+                status, payload = 304, b""
+        self.send_response(status)
+        self.send_header("Content-Type", JSON_CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in extra.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _dispatch
+
+    def log_message(self, format, *args):
+        pass  # Sin una línea por petición (ensucia la consola y frena las pruebas de carga)
+
+
+def etag(payload: bytes) -> str:
+    """ETag débil con el mismo formato que JSONPlaceholder (Express): W/"<largo en hex>-<hash>"."""
+    return 'W/"%x-%s"' % (len(payload), hashlib.sha1(payload).hexdigest()[:27])
+
+
+def _render(value) -> bytes:
+    # JSONPlaceholder responde con JSON indentado con 2 espacios
+    return json.dumps(value, indent=2).encode("utf-8")
+
+
+def _as_text(value) -> str:
+    return str(value).lower() if isinstance(value, bool) else str(value)
+
+
+def _cassette_key(method: str, target: str, body: bytes) -> str:
+    """Clave de una grabación: método y ruta con query (las escrituras incluyen un hash del cuerpo)."""
+    if method == "GET" or not body:
+        return f"{method} {target}"
+    return f"{method} {target} {hashlib.sha1(body).hexdigest()[:12]}"
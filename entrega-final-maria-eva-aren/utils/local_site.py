@@ -0,0 +1,115 @@
+import mimetypes
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+from config.settings import BASE_DIR, UI_LATENCY_MS, UI_JITTER_MS
+from utils.logger import get_logger
+
+logger = get_logger()
+
+# Páginas de la réplica local de SauceDemo (index.html, app.js y style.css)
+SITE_DIR = os.path.join(BASE_DIR, "local_site", "saucedemo")
+STATIC_PREFIX = "/static/"
+
+
+class LocalSiteServer:
+    """
+    Reemplazo local de SauceDemo en un puerto efímero (servidor HTTP con un hilo por conexión).
+    Sirve los archivos de local_site/saucedemo/ bajo /static/ y, como la SPA original,
+    index.html para cualquier otra ruta (/, /inventory.html, /cart.html, /checkout-*.html).
+    Cada petición se demora 'latency_ms' ± 'jitter_ms' (distribución uniforme) para medir
+    el overhead del framework sin red o reproducir un sitio lento.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, latency_ms=UI_LATENCY_MS, jitter_ms=UI_JITTER_MS,
+                 site_dir=SITE_DIR):
+        """
+        :param latency_ms: Demora fija agregada a cada respuesta (milisegundos).
+        :param jitter_ms: Variación aleatoria de la demora, hacia arriba o hacia abajo (milisegundos).
+        """
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.requests = 0
+        self._files = self._load_files(site_dir)   # Los archivos son chicos: se sirven desde memoria
+        self._rng = random.Random()
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.app = self
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="local-site", daemon=True)
+        self._thread.start()
+        logger.info(f"SauceDemo local escuchando en {self.url} (latencia {self.latency_ms} ± {self.jitter_ms} ms)")
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        logger.info(f"SauceDemo local detenido ({self.requests} peticiones atendidas)")
+
+    def delay(self) -> float:
+        """Segundos que se demora la próxima respuesta (nunca negativo)."""
+        with self._lock:
+            self.requests += 1
+            jitter = self._rng.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0.0
+        return max(0.0, self.latency_ms + jitter) / 1000
+
+    def handle(self, path: str) -> tuple:
+        """:return: (status, cuerpo en bytes, content type) para un GET."""
+        path = urlsplit(path).path
+        if path.startswith(STATIC_PREFIX):
+            name = path[len(STATIC_PREFIX):]
+            if name not in self._files:
+                return 404, b"Not Found", "text/plain; charset=utf-8"
+        else:
+            name = "index.html"
+        return 200, self._files[name], _content_type(name)
+
+    @staticmethod
+    def _load_files(site_dir: str) -> dict:
+        files = {}
+        for name in os.listdir(site_dir):
+            with open(os.path.join(site_dir, name), "rb") as f:
+                files[name] = f.read()
+        return files
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Handler HTTP/1.1 (keep-alive) que delega en LocalSiteServer.handle."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True  # Ver utils/local_api.py: sin esto cada respuesta suma ~40 ms
+
+    def do_GET(self):
+        app = self.server.app
+        pause = app.delay()
+        if pause:
+            time.sleep(pause)
+        status, payload, content_type = app.handle(self.path)
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        # Sin cache del navegador: cada navegación paga la latencia configurada, como el sitio remoto sin cache
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass  # Sin una línea por petición en la consola
+
+
+def _content_type(name: str) -> str:
+    content_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+    if content_type.startswith("text/") or content_type.endswith("javascript"):
+        return f"{content_type}; charset=utf-8"
+    return content_type
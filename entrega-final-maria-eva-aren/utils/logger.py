@@ -1,29 +1,161 @@
 import logging
-import inspect
+import queue
+import sys
+from collections import deque
+from logging.handlers import QueueListener
 
-def get_logger(log_level=logging.INFO):
+# Formato del log: Hora - Nivel - Mensaje
+_FORMATTER = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s', datefmt='%Y-%m-%d %H:%M:%S')
+
+# Un único manejador de consola compartido por todos los loggers del proyecto
+_console_handler = logging.StreamHandler()
+_console_handler.setFormatter(_FORMATTER)
+
+# Loggers ya configurados (nombre -> logger), para que las llamadas repetidas no cuesten nada
+_configured = {}
+
+# Estado del modo "buffered" (ver enable_buffered_logging)
+_buffer = None
+_writer_queue = None
+_writer = None
+
+
+def get_logger(log_level=logging.INFO, name=None):
     """
     Configura y devuelve una instancia de logger.
-    El nombre del logger será el nombre de la función o clase que lo llame.
-    """
-    # Obtiene el nombre de la función/método que llamó a get_logger
-    logger_name = inspect.stack()[1][3]
-    
-    # Crea el logger
-    logger = logging.getLogger(logger_name)
-    logger.setLevel(log_level)
-    
-    # Evita duplicar handlers si ya existen
-    if not logger.handlers:
-        # Crea un manejador para consola
-        console_handler = logging.StreamHandler()
-        
-        # Define el formato del log: Hora - Nivel - Mensaje
-        formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s', datefmt='%Y-%m-%d %H:%M:%S')
-        console_handler.setFormatter(formatter)
-        
-        # Añade el manejador al logger
-        logger.addHandler(console_handler)
-        
+    El nombre del logger es el del módulo que lo llama (ej: 'pages.base_page'),
+    así cada módulo tiene su propio logger con un nombre estable.
+    :param log_level: Nivel del logger.
+    :param name: Nombre explícito (opcional). Por defecto, el __name__ del módulo que llama.
+    """
+    if name is None:
+        # Leer solo el frame de quien llama (inspect.stack() recorre y lee del disco toda la pila)
+        name = sys._getframe(1).f_globals.get("__name__", "root")
+
+    logger = _configured.get(name)
+    if logger is None:
+        logger = logging.getLogger(name)
+        # Evita duplicar handlers si ya existen
+        if _console_handler not in logger.handlers:
+            logger.addHandler(_console_handler)
+        if _buffer is not None:
+            logger.addFilter(_buffer)
+        _configured[name] = logger
+
+    if _buffer is not None:
+        # En modo buffered se guarda todo el detalle; solo se escribe si el test falla
+        log_level = logging.DEBUG
+    if logger.level != log_level:
+        logger.setLevel(log_level)
     return logger
 
+
+# ----------------------------------------------------
+# MODO BUFFERED: detalle por test solo cuando falla
+# ----------------------------------------------------
+
+class _RingBuffer(logging.Filter):
+    """
+    Guarda los últimos 'capacity' registros del test en curso sin formatearlos.
+    Se instala como filtro de los loggers y retorna False para DEBUG/INFO: el registro no llega a
+    ningún handler (ni a la consola ni a los de pytest), así no se formatea ni se escribe.
+    El formateo y la escritura se hacen después, en el hilo escritor, y solo si hace falta.
+    WARNING y superiores se escriben siempre al instante (y quedan en el buffer como contexto
+    del detalle); fuera de un test (sesión, fixtures de sesión, hilos de fondo) no se guarda nada.
+    """
+
+    def __init__(self, capacity: int):
+        super().__init__()
+        self.records = deque(maxlen=capacity)   # Tuplas (registro, ya_escrito)
+        self.total = 0
+        self.active = False
+
+    def filter(self, record):
+        if not self.active:
+            return record.levelno >= logging.INFO
+        emitted = record.levelno >= logging.WARNING
+        self.records.append((record, emitted))
+        if not emitted:
+            self.total += 1
+        return emitted
+
+    def drain(self) -> list:
+        records = list(self.records)
+        self.records.clear()
+        self.total = 0
+        return records
+
+
+def enable_buffered_logging(capacity: int = 500):
+    """
+    Activa el modo buffered: los loggers del proyecto guardan DEBUG/INFO en un buffer circular
+    por test y esa parte de la consola se escribe desde un hilo de fondo (cola + QueueListener).
+    """
+    global _buffer, _writer_queue, _writer
+    if _buffer is not None:
+        return
+    _writer_queue = queue.SimpleQueue()
+    _writer = QueueListener(_writer_queue, _console_handler)
+    _writer.start()
+    _buffer = _RingBuffer(capacity)
+    for logger in _configured.values():
+        logger.addFilter(_buffer)
+        logger.setLevel(logging.DEBUG)
+
+
+def disable_buffered_logging():
+    """Vuelve al modo consola y espera a que el hilo escritor termine de escribir."""
+    global _buffer, _writer_queue, _writer
+    if _buffer is None:
+        return
+    _writer.stop()
+    for logger in _configured.values():
+        logger.removeFilter(_buffer)
+        logger.setLevel(logging.INFO)
+    _buffer = _writer_queue = _writer = None
+
+
+def is_buffered_logging() -> bool:
+    return _buffer is not None
+
+
+def start_test_log():
+    """Descarta lo que haya quedado en el buffer y empieza el de un test nuevo."""
+    if _buffer is not None:
+        _buffer.drain()
+        _buffer.active = True
+
+
+def end_test_log():
+    """Terminó el test: lo que se loguee hasta el próximo se escribe directamente."""
+    if _buffer is not None:
+        _buffer.drain()
+        _buffer.active = False
+
+
+def flush_test_log(title: str) -> str:
+    """
+    Escribe (en segundo plano) el detalle completo del buffer del test, precedido por 'title'.
+    :return: El detalle formateado, para adjuntarlo al reporte del test.
+    """
+    if _buffer is None:
+        return ""
+    records = _buffer.drain()
+    _enqueue(logging.ERROR, f"{title} ({len(records)} registros en el buffer)")
+    for record, emitted in records:
+        if not emitted:
+            _writer_queue.put(record)
+    return "\n".join(_FORMATTER.format(record) for record, _ in records)
+
+
+def summarize_test_log(line: str):
+    """Escribe una sola línea de resumen (test sin fallas) y descarta el detalle."""
+    if _buffer is None:
+        return
+    discarded = _buffer.total
+    _buffer.drain()
+    _enqueue(logging.INFO, f"{line} ({discarded} registros descartados)")
+
+
+def _enqueue(level, message):
+    _writer_queue.put(logging.LogRecord(__name__, level, __file__, 0, message, None, None))
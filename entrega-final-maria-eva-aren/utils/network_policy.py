@@ -0,0 +1,119 @@
+import dataclasses
+import json
+import threading
+from config.settings import NETWORK_POLICY_MODES
+from utils.driver_factory import BrowserProfile
+from utils.logger import get_logger
+
+logger = get_logger()
+
+
+def format_bytes(size: int) -> str:
+    return f"{size / 1024 / 1024:.1f} MB" if size >= 1024 * 1024 else f"{size / 1024:.1f} KB"
+
+
+def format_network_stats(stats: dict) -> str:
+    """Línea de resumen de collect() (por test) o de los totales de la sesión."""
+    return (
+        f"{stats['requests']} peticiones | descargado {format_bytes(stats['downloaded'])} | "
+        f"desde cache {stats['cached']} ({format_bytes(stats['cached_bytes'])}) | bloqueadas {stats['blocked']}"
+    )
+
+
+class NetworkPolicy:
+    """
+    Capa de red de los navegadores (Chrome, vía DevTools Protocol):
+      - "observe": cache de disco compartido entre sesiones (los navegadores nuevos no vuelven a bajar
+        lo que ya bajó otro) y conteo por test de lo descargado y lo servido desde cache.
+      - "block": lo anterior y además bloquea los recursos que coinciden con 'blocked_urls'
+        (patrones con * de Network.setBlockedURLs, ej: imágenes, fuentes, analytics).
+    Los conteos salen del log de performance de Chrome (eventos Network.* que chromedriver guarda).
+    En Firefox (sin CDP) la política no hace nada.
+    """
+
+    MODES = NETWORK_POLICY_MODES
+
+    def __init__(self, mode: str, blocked_urls=()):
+        if mode not in self.MODES:
+            raise ValueError(f"Modo de red no soportado: {mode}")
+        self.mode = mode
+        self.blocked_urls = list(blocked_urls) if mode == "block" else []
+        self.totals = {"requests": 0, "downloaded": 0, "cached": 0, "cached_bytes": 0, "blocked": 0}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != "off"
+
+    def browser_profile(self, profile: BrowserProfile) -> BrowserProfile:
+        """Perfil de arranque con el cache de disco compartido y el log de red que la política necesita."""
+        if not self.enabled:
+            return profile
+        return dataclasses.replace(profile, shared_cache=True, network_log=True)
+
+    def apply(self, driver):
+        """Activa la política en un navegador recién creado. Retorna el mismo driver (para usar en factories)."""
+        if self.enabled and hasattr(driver, "execute_cdp_cmd"):
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setCacheDisabled", {"cacheDisabled": False})
+            if self.blocked_urls:
+                driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": self.blocked_urls})
+        return driver
+
+    def collect(self, driver):
+        """
+        Lee (y vacía) el log de red acumulado por el navegador desde la última llamada.
+        :return: Dict con peticiones, bytes descargados, peticiones/bytes servidos desde cache y
+                 peticiones bloqueadas; None si el navegador no expone el log.
+        """
+        if not self.enabled or not hasattr(driver, "execute_cdp_cmd"):
+            return None
+        try:
+            entries = driver.get_log("performance")
+        except Exception as e:
+            logger.debug(f"No se pudo leer el log de red del navegador: {e}")
+            return None
+        stats = summarize_network_log(entries)
+        with self._lock:
+            for key, value in stats.items():
+                self.totals[key] += value
+        return stats
+
+    def summary(self) -> str:
+        return f"Red ({self.mode}): {format_network_stats(self.totals)}"
+
+
+def summarize_network_log(entries: list) -> dict:
+    """
+    Resume las entradas del log de performance de chromedriver (cada 'message' es un evento CDP en JSON).
+    Bytes descargados = encodedDataLength de las respuestas de la red; bytes desde cache = datos
+    entregados por las respuestas que salieron del cache de disco o de memoria.
+    """
+    cached, received = set(), {}
+    stats = {"requests": 0, "downloaded": 0, "cached": 0, "cached_bytes": 0, "blocked": 0}
+    for entry in entries:
+        try:
+            event = json.loads(entry["message"])["message"]
+        except (KeyError, TypeError, ValueError):
+            continue
+        method, params = event.get("method"), event.get("params", {})
+        request_id = params.get("requestId")
+        if method == "Network.requestServedFromCache":
+            cached.add(request_id)
+        elif method == "Network.responseReceived":
+            response = params.get("response", {})
+            if response.get("fromDiskCache") or response.get("fromPrefetchCache"):
+                cached.add(request_id)
+        elif method == "Network.dataReceived":
+            received[request_id] = received.get(request_id, 0) + params.get("dataLength", 0)
+        elif method == "Network.loadingFinished":
+            stats["requests"] += 1
+            if request_id in cached:
+                stats["cached"] += 1
+                stats["cached_bytes"] += received.get(request_id, 0)
+            else:
+                stats["downloaded"] += int(params.get("encodedDataLength", 0))
+        elif method == "Network.loadingFailed" and params.get("blockedReason"):
+            stats["requests"] += 1
+            stats["blocked"] += 1
+    return stats
@@ -0,0 +1,302 @@
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import pytest
+from _pytest.reports import TestReport
+from utils.latency import EndpointLatencies
+from utils.reporting import SCREENSHOT_PROPERTY
+from utils.logger import get_logger
+
+logger = get_logger()
+
+# Variables de entorno que el proceso coordinador le pasa a cada worker
+WORKER_ID_ENV = "PYTEST_WORKER_ID"
+SHARD_FILE_ENV = "PYTEST_WORKER_SHARD"
+RESULTS_FILE_ENV = "PYTEST_WORKER_RESULTS"
+LATENCIES_FILE_ENV = "PYTEST_WORKER_LATENCIES"
+
+# Clave en el cache de pytest (.pytest_cache) con la duración histórica de cada test
+DURATIONS_CACHE_KEY = "sharding/durations"
+
+# Duración asumida para tests sin historial (si no hay ningún dato previo)
+DEFAULT_DURATION = 1.0
+
+# Cada cuánto el coordinador revisa los resultados que escriben los workers
+POLL_INTERVAL = 0.1
+
+
+def is_worker() -> bool:
+    """True si el proceso actual es un worker lanzado por el coordinador."""
+    return bool(os.environ.get(WORKER_ID_ENV))
+
+
+def is_controller(config) -> bool:
+    """True si este proceso reparte los tests entre workers en lugar de ejecutarlos."""
+    return config.getoption("workers") > 1 and not is_worker() and not config.option.collectonly
+
+
+def save_worker_latencies(latencies: EndpointLatencies, sla: list):
+    """
+    En un worker, guarda los histogramas de latencia de la API y los presupuestos de la sesión
+    para que el coordinador los sume y controle los presupuestos sobre toda la corrida.
+    """
+    with open(os.environ[LATENCIES_FILE_ENV], "w", encoding="utf-8") as f:
+        json.dump({"histograms": latencies.to_json(), "sla": sla}, f)
+
+
+def assign_shards(nodeids, durations: dict, workers: int) -> list:
+    """
+    Reparte los tests entre 'workers' grupos según su duración histórica.
+    Usa LPT (Longest Processing Time first): se ordena de mayor a menor duración
+    y cada test va al worker con menos carga acumulada. Así los flujos largos
+    (ej: test_02_complete_purchase_flow) no terminan todos en el mismo worker.
+    Dentro de cada grupo se respeta el orden original de recolección.
+    :return: Lista con una lista de nodeids por worker.
+    """
+    known = [durations[n] for n in nodeids if n in durations]
+    default = statistics.median(known) if known else DEFAULT_DURATION
+    order = {nodeid: i for i, nodeid in enumerate(nodeids)}
+
+    loads = [0.0] * workers
+    shards = [[] for _ in range(workers)]
+    for nodeid in sorted(nodeids, key=lambda n: durations.get(n, default), reverse=True):
+        target = loads.index(min(loads))
+        shards[target].append(nodeid)
+        loads[target] += durations.get(nodeid, default)
+
+    return [sorted(shard, key=order.get) for shard in shards]
+
+
+class DurationRecorder:
+    """
+    Plugin que mide la duración total (setup + call + teardown) de cada test
+    y la guarda en el cache de pytest al final de la sesión.
+    Funciona igual en modo serie y en paralelo (el coordinador recibe los reportes de los workers).
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.measured = {}
+
+    def pytest_runtest_logreport(self, report):
+        self.measured[report.nodeid] = self.measured.get(report.nodeid, 0.0) + report.duration
+
+    def pytest_sessionfinish(self, session):
+        if not self.measured or not hasattr(self.config, "cache") or is_worker():
+            return
+        durations = self.config.cache.get(DURATIONS_CACHE_KEY, {})
+        durations.update({nodeid: round(d, 3) for nodeid, d in self.measured.items()})
+        self.config.cache.set(DURATIONS_CACHE_KEY, durations)
+
+
+class WorkerPlugin:
+    """
+    Plugin activo dentro de cada worker: ejecuta solo los tests asignados
+    y escribe cada reporte serializado (JSONL) para que el coordinador lo procese.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        with open(os.environ[SHARD_FILE_ENV], encoding="utf-8") as f:
+            self.assigned = set(json.load(f))
+        self.results = open(os.environ[RESULTS_FILE_ENV], "a", encoding="utf-8")
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_collection_modifyitems(self, config, items):
+        selected = [item for item in items if item.nodeid in self.assigned]
+        deselected = [item for item in items if item.nodeid not in self.assigned]
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+        items[:] = selected
+
+    def pytest_runtest_logreport(self, report):
+        data = self.config.hook.pytest_report_to_serializable(config=self.config, report=report)
+        self.results.write(json.dumps(data) + "\n")
+        self.results.flush()
+
+    def pytest_unconfigure(self):
+        self.results.close()
+
+
+class ParallelController:
+    """
+    Plugin del proceso coordinador (--workers N).
+    Recolecta normalmente, reparte los tests por duración histórica, lanza N procesos
+    pytest (cada uno con su propio driver) y re-emite en este proceso los reportes que
+    van llegando. Así el reporte HTML y la salida de consola quedan unificados.
+    También suma las latencias de API de los workers (y sus presupuestos de sesión).
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.workers = config.getoption("workers")
+        self.latencies = EndpointLatencies()
+        self.sla = []
+        self.screenshots = 0    # Reportes de los workers que traen una captura del fallo
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtestloop(self, session):
+        if session.testsfailed and not session.config.option.continue_on_collection_errors:
+            raise session.Interrupted(f"{session.testsfailed} error(es) durante la recolección")
+        if not session.items:
+            return True
+
+        items = {item.nodeid: item for item in session.items}
+        durations = self.config.cache.get(DURATIONS_CACHE_KEY, {}) if hasattr(self.config, "cache") else {}
+        shards = [s for s in assign_shards(list(items), durations, self.workers) if s]
+
+        run_dir = tempfile.mkdtemp(prefix="pytest-workers-")
+        logger.info(f"Ejecución en paralelo: {len(items)} tests en {len(shards)} workers ({run_dir}).")
+
+        workers = [self._spawn(i, shard, run_dir) for i, shard in enumerate(shards)]
+        crashed = False
+        try:
+            crashed = self._collect_results(session, workers, items)
+        finally:
+            for worker in workers:
+                if worker["process"].poll() is None:
+                    worker["process"].terminate()
+                    worker["process"].wait()
+                worker["results"].close()
+                worker["log"].close()
+            if crashed:
+                logger.warning(f"Algún worker terminó sin reportar todos sus tests: se conservan sus logs en {run_dir}")
+            else:
+                shutil.rmtree(run_dir, ignore_errors=True)
+
+        if self.screenshots:
+            # Los workers no aplican la retención del store de capturas (se pisarían el índice)
+            from utils.screenshots import ScreenshotStore
+            ScreenshotStore().apply_retention()
+
+        # Igual que el runtestloop de pytest: -x / --maxfail cortan la corrida
+        if session.shouldfail:
+            raise session.Failed(session.shouldfail)
+        if session.shouldstop:
+            raise session.Interrupted(session.shouldstop)
+        return True
+
+    # ----------------------------------------------------
+    # MÉTODOS INTERNOS
+    # ----------------------------------------------------
+
+    def _spawn(self, index: int, shard: list, run_dir: str) -> dict:
+        """Lanza un worker con los mismos argumentos que el coordinador."""
+        worker_id = f"gw{index}"
+        shard_file = os.path.join(run_dir, f"{worker_id}-shard.json")
+        results_file = os.path.join(run_dir, f"{worker_id}-results.jsonl")
+        with open(shard_file, "w", encoding="utf-8") as f:
+            json.dump(shard, f)
+        open(results_file, "w").close()
+
+        env = dict(os.environ)
+        latencies_file = os.path.join(run_dir, f"{worker_id}-latencies.json")
+        env.update({
+            WORKER_ID_ENV: worker_id, SHARD_FILE_ENV: shard_file, RESULTS_FILE_ENV: results_file,
+            LATENCIES_FILE_ENV: latencies_file,
+        })
+        # Cada worker usa su propio cache_dir (temporal) para no pisar el del coordinador (lastfailed).
+        # Las duraciones igual se guardan porque las registra el coordinador con los reportes re-emitidos;
+        # los checkpoints de estado del navegador, en cambio, no se conservan entre corridas en paralelo.
+        cache_dir = os.path.join(run_dir, f"{worker_id}-cache")
+        args = [sys.executable, "-m", "pytest", *self.config.invocation_params.args, "-o", f"cache_dir={cache_dir}"]
+
+        log = open(os.path.join(run_dir, f"{worker_id}.log"), "w", encoding="utf-8")
+        process = subprocess.Popen(
+            args, cwd=str(self.config.invocation_params.dir), env=env,
+            stdout=log, stderr=subprocess.STDOUT,
+        )
+        logger.info(f"Worker {worker_id} lanzado con {len(shard)} tests.")
+        return {
+            "id": worker_id, "process": process, "log": log, "latencies": latencies_file,
+            "results": open(results_file, encoding="utf-8"), "buffer": "",
+            "pending": list(shard), "started": set(),
+        }
+
+    def _collect_results(self, session, workers: list, items: dict) -> bool:
+        """
+        Lee los reportes de todos los workers a medida que se escriben. Si la sesión debe cortar
+        (-x / --maxfail) deja de leer: los workers que siguen activos se terminan al volver.
+        :return: True si algún worker terminó sin reportar todos sus tests (ver _report_crashed).
+        """
+        crashed = False
+        active = list(workers)
+        while active:
+            for worker in list(active):
+                finished = worker["process"].poll() is not None
+                self._drain(worker)
+                if session.shouldfail or session.shouldstop:
+                    return crashed
+                if finished:
+                    crashed = self._report_crashed(worker, items) or crashed
+                    self._merge_latencies(worker)
+                    active.remove(worker)
+            if active:
+                time.sleep(POLL_INTERVAL)
+        return crashed
+
+    def _drain(self, worker: dict):
+        """Procesa las líneas completas nuevas del archivo de resultados de un worker."""
+        worker["buffer"] += worker["results"].read()
+        *lines, worker["buffer"] = worker["buffer"].split("\n")
+        for line in lines:
+            if line.strip():
+                report = self.config.hook.pytest_report_from_serializable(
+                    config=self.config, data=json.loads(line)
+                )
+                if isinstance(report.longrepr, list):
+                    # Los skips traen (archivo, línea, motivo): JSON los convierte en lista
+                    report.longrepr = tuple(report.longrepr)
+                self._emit(report, worker)
+
+    def _emit(self, report, worker: dict):
+        """Re-emite un reporte del worker como si el test hubiera corrido en este proceso."""
+        hook = self.config.hook
+        if any(name == SCREENSHOT_PROPERTY for name, _ in report.user_properties):
+            self.screenshots += 1
+        if report.when == "setup":
+            worker["started"].add(report.nodeid)
+            hook.pytest_runtest_logstart(nodeid=report.nodeid, location=report.location)
+        hook.pytest_runtest_logreport(report=report)
+        if report.when == "teardown":
+            hook.pytest_runtest_logfinish(nodeid=report.nodeid, location=report.location)
+            if report.nodeid in worker["pending"]:
+                worker["pending"].remove(report.nodeid)
+
+    def _merge_latencies(self, worker: dict):
+        """Suma los histogramas de API del worker (si usó el api_client) y agrega sus presupuestos."""
+        if not os.path.exists(worker["latencies"]):
+            return
+        with open(worker["latencies"], encoding="utf-8") as f:
+            data = json.load(f)
+        self.latencies.merge_json(data["histograms"])
+        self.sla.extend(budget for budget in data["sla"] if budget not in self.sla)
+
+    def _report_crashed(self, worker: dict, items: dict) -> bool:
+        """
+        Marca como fallidos los tests que un worker no llegó a reportar (ej: el proceso murió).
+        :return: True si había tests sin reportar.
+        """
+        code = worker["process"].returncode
+        crashed = bool(worker["pending"])
+        # Copia: _emit saca cada test de 'pending' al re-emitir su teardown
+        for nodeid in list(worker["pending"]):
+            item = items[nodeid]
+            message = (
+                f"El worker {worker['id']} terminó (código {code}) sin reportar este test. "
+                f"Ver log: {worker['log'].name}"
+            )
+            phases = [("call", "failed", message), ("teardown", "passed", None)]
+            if nodeid not in worker["started"]:
+                phases.insert(0, ("setup", "passed", None))
+            for when, outcome, longrepr in phases:
+                report = TestReport(
+                    nodeid, item.location, {k: 1 for k in item.keywords}, outcome, longrepr, when,
+                )
+                self._emit(report, worker)
+        return crashed
@@ -0,0 +1,268 @@
+import json
+import os
+import time
+from datetime import datetime
+import pytest
+from config.settings import REPORTS_DIR
+from utils.logger import get_logger
+
+logger = get_logger()
+
+# Carpeta del reporte en modo streaming (resultados JSONL + visor HTML paginado)
+STREAM_DIR = os.path.join(REPORTS_DIR, "stream")
+
+# Cantidad de resultados por página del visor
+PAGE_SIZE = 100
+
+# Propiedad del reporte de pytest con la captura del fallo (la agrega UiPlugin.pytest_runtest_makereport)
+SCREENSHOT_PROPERTY = "screenshot"
+
+
+class StreamingReport:
+    """
+    Plugin de reporte para corridas grandes (--report-mode=stream).
+    En lugar de armar un único HTML autocontenido al final, escribe un registro JSONL por
+    resultado a medida que llegan (sin guardarlos en memoria) y al terminar genera un visor
+    HTML liviano que carga los resultados por páginas y las capturas/miniaturas de forma diferida.
+    En modo paralelo el coordinador recibe los reportes ya serializados de cada worker,
+    así que unir los resultados parciales es solo agregar líneas al mismo archivo.
+    """
+
+    def __init__(self, config, directory=STREAM_DIR):
+        self.config = config
+        self.directory = directory
+        self.results_path = os.path.join(directory, "results.jsonl")
+        self.index_path = os.path.join(directory, "index.html")
+        self.counts = {}
+        self._start = time.time()
+        os.makedirs(directory, exist_ok=True)
+        self._results = open(self.results_path, "w", encoding="utf-8")
+
+    def pytest_runtest_logreport(self, report):
+        # Un registro por resultado: la fase 'call' o un setup/teardown que falló o se saltó
+        if report.when != "call" and report.passed:
+            return
+        record = self._to_record(report)
+        self.counts[record["outcome"]] = self.counts.get(record["outcome"], 0) + 1
+        self._results.write(json.dumps(record) + "\n")
+        self._results.flush()
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_sessionfinish(self, session):
+        """Se ejecuta después de los demás (las capturas pendientes ya están en disco)."""
+        self._results.close()
+        self.build_viewer()
+
+    def pytest_terminal_summary(self, terminalreporter):
+        terminalreporter.write_sep("-", f"Reporte generado: file://{os.path.abspath(self.index_path)}")
+
+    # ----------------------------------------------------
+    # REGISTROS Y VISOR
+    # ----------------------------------------------------
+
+    def _to_record(self, report) -> dict:
+        outcome = report.outcome
+        if report.failed and report.when != "call":
+            outcome = "error"
+        record = {
+            "nodeid": report.nodeid,
+            "outcome": outcome,
+            "when": report.when,
+            "duration": round(report.duration, 3),
+        }
+        if report.longrepr is not None and not report.passed:
+            record["longrepr"] = str(report.longrepr)
+        if report.failed and report.sections:
+            record["sections"] = [list(section) for section in report.sections]
+        screenshot = dict(report.user_properties).get(SCREENSHOT_PROPERTY)
+        if screenshot:
+            record["screenshot"] = screenshot
+        return record
+
+    def build_viewer(self):
+        """
+        Convierte results.jsonl en páginas JS (page-N.js y failed-N.js con solo los fallos)
+        leyéndolo línea por línea, y escribe el index.html del visor.
+        Las páginas son scripts (no JSON) para que el visor funcione abierto desde file://.
+        """
+        for name in os.listdir(self.directory):
+            if name.endswith(".js"):
+                os.remove(os.path.join(self.directory, name))
+
+        # Import diferido: las corridas de solo API no cargan utils.screenshots
+        from utils.screenshots import ScreenshotStore
+        store = ScreenshotStore()
+        pages = {"page": _PageWriter(self.directory, "page"), "failed": _PageWriter(self.directory, "failed")}
+        with open(self.results_path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if "screenshot" in record:
+                    record.update(self._screenshot_links(store, record.pop("screenshot")))
+                pages["page"].add(record)
+                if record["outcome"] in ("failed", "error"):
+                    pages["failed"].add(record)
+        for writer in pages.values():
+            writer.close()
+
+        meta = {
+            "title": "Reporte de tests",
+            "generated": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "duration": round(time.time() - self._start, 2),
+            "counts": self.counts,
+            "pages": {kind: writer.pages for kind, writer in pages.items()},
+        }
+        with open(self.index_path, "w", encoding="utf-8") as f:
+            f.write(_VIEWER_HTML.replace("__META__", json.dumps(meta)))
+        logger.info(f"Visor del reporte escrito en: {self.index_path}")
+
+    def _screenshot_links(self, store, image_path: str) -> dict:
+        """Rutas relativas (desde el visor) de la captura completa y su miniatura."""
+        digest = os.path.splitext(os.path.basename(image_path))[0]
+        links = {"image": _relative(store.image_path(digest), self.directory)}
+        if store.has_thumbnail(digest):
+            links["thumbnail"] = _relative(store.thumbnail_path(digest), self.directory)
+        return links
+
+
+class _PageWriter:
+    """Escribe registros en archivos de PAGE_SIZE resultados: reportPage('kind', n, [...])."""
+
+    def __init__(self, directory: str, kind: str):
+        self.directory = directory
+        self.kind = kind
+        self.pages = 0
+        self._buffer = []
+
+    def add(self, record: dict):
+        self._buffer.append(record)
+        if len(self._buffer) == PAGE_SIZE:
+            self._flush()
+
+    def close(self):
+        if self._buffer:
+            self._flush()
+
+    def _flush(self):
+        self.pages += 1
+        path = os.path.join(self.directory, f"{self.kind}-{self.pages}.js")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(f"reportPage({json.dumps(self.kind)}, {self.pages}, {json.dumps(self._buffer)});\n")
+        self._buffer = []
+
+
+def _relative(path: str, start: str) -> str:
+    return os.path.relpath(path, start).replace(os.sep, "/")
+
+
+_VIEWER_HTML = """<!DOCTYPE html>
+<html lang="es">
+<head>
+<meta charset="utf-8">
+<title>Reporte de tests</title>
+<style>
+body { font-family: Helvetica, Arial, sans-serif; margin: 20px; color: #222; }
+table { border-collapse: collapse; width: 100%; }
+th, td { border-bottom: 1px solid #ddd; padding: 6px; text-align: left; vertical-align: top; }
+.passed { color: #2e7d32; } .failed, .error { color: #c62828; } .skipped { color: #f9a825; }
+pre { background: #f5f5f5; padding: 8px; overflow-x: auto; white-space: pre-wrap; }
+img.thumb { max-width: 320px; border: 1px solid #ccc; }
+.pager { margin: 12px 0; }
+</style>
+</head>
+<body>
+<h1 id="title"></h1>
+<p id="summary"></p>
+<div class="pager">
+  <label><input type="checkbox" id="only-failed"> Solo fallidos</label>
+  <button id="prev">&laquo;</button> <span id="position"></span> <button id="next">&raquo;</button>
+</div>
+<table>
+  <thead><tr><th>Resultado</th><th>Test</th><th>Duración</th><th>Detalle</th></tr></thead>
+  <tbody id="rows"></tbody>
+</table>
+<script>
+var META = __META__;
+var loaded = {};
+var current = {kind: 'page', page: 1};
+
+// Cada archivo page-N.js / failed-N.js llama a esta función al cargarse
+function reportPage(kind, page, records) {
+    loaded[kind + '-' + page] = records;
+    if (current.kind === kind && current.page === page) { render(records); }
+}
+
+function show(kind, page) {
+    current = {kind: kind, page: page};
+    var total = META.pages[kind];
+    document.getElementById('position').textContent = total ? 'Página ' + page + ' de ' + total : 'Sin resultados';
+    var records = loaded[kind + '-' + page];
+    if (records) { render(records); return; }
+    if (!total) { render([]); return; }
+    var script = document.createElement('script');
+    script.src = kind + '-' + page + '.js';
+    document.head.appendChild(script);
+}
+
+function cell(row, text, className) {
+    var td = row.insertCell();
+    td.textContent = text;
+    if (className) { td.className = className; }
+    return td;
+}
+
+function render(records) {
+    var body = document.getElementById('rows');
+    body.innerHTML = '';
+    records.forEach(function (r) {
+        var row = body.insertRow();
+        cell(row, r.outcome, r.outcome);
+        cell(row, r.nodeid + (r.when !== 'call' ? ' (' + r.when + ')' : ''));
+        cell(row, r.duration.toFixed(2) + 's');
+        var detail = row.insertCell();
+        if (r.image) {
+            var link = document.createElement('a');
+            link.href = r.image;
+            link.target = '_blank';
+            if (r.thumbnail) {
+                var img = document.createElement('img');
+                img.loading = 'lazy';
+                img.className = 'thumb';
+                img.src = r.thumbnail;
+                link.appendChild(img);
+            } else {
+                link.textContent = 'Captura';
+            }
+            detail.appendChild(link);
+        }
+        if (r.longrepr || r.sections) {
+            // El texto del error se arma recién al abrir el detalle
+            var details = document.createElement('details');
+            details.appendChild(document.createElement('summary')).textContent = 'Error';
+            details.addEventListener('toggle', function () {
+                if (!details.open || details.dataset.filled) { return; }
+                details.dataset.filled = '1';
+                var text = r.longrepr || '';
+                (r.sections || []).forEach(function (s) { text += '\\n\\n--- ' + s[0] + ' ---\\n' + s[1]; });
+                details.appendChild(document.createElement('pre')).textContent = text;
+            });
+            detail.appendChild(details);
+        }
+    });
+}
+
+document.getElementById('title').textContent = META.title;
+document.getElementById('summary').textContent = Object.keys(META.counts).map(function (k) {
+    return META.counts[k] + ' ' + k;
+}).join(', ') + ' en ' + META.duration + 's (generado el ' + META.generated + ')';
+document.getElementById('prev').onclick = function () { if (current.page > 1) { show(current.kind, current.page - 1); } };
+document.getElementById('next').onclick = function () {
+    if (current.page < META.pages[current.kind]) { show(current.kind, current.page + 1); }
+};
+document.getElementById('only-failed').onchange = function (e) { show(e.target.checked ? 'failed' : 'page', 1); };
+show('page', 1);
+</script>
+</body>
+</html>
+"""
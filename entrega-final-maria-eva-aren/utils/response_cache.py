@@ -0,0 +1,138 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlsplit
+from config.settings import API_CACHE_MAX_ENTRIES, API_CACHE_MAX_MB, API_CACHE_TTL
+from utils.logger import get_logger
+
+logger = get_logger()
+
+
+class ResponseCache:
+    """
+    Cache LRU de respuestas GET para el ApiClient de la sesión.
+    Por defecto (ttl=0) cada uso se revalida; con 'ttl' > 0, durante 'ttl' segundos una
+    respuesta se sirve sin ir a la red y después se revalida
+    con If-None-Match / If-Modified-Since si el servidor envió ETag o Last-Modified
+    (un 304 reutiliza el cuerpo guardado). Se limita por cantidad de entradas y por bytes.
+    Es seguro para usar desde varios hilos (get_many).
+    """
+
+    def __init__(self, max_entries=API_CACHE_MAX_ENTRIES, max_mb=API_CACHE_MAX_MB, ttl=API_CACHE_TTL):
+        """
+        :param max_entries: Cantidad máxima de respuestas guardadas.
+        :param max_mb: Tamaño máximo total de los cuerpos guardados (MB).
+        :param ttl: Segundos durante los que una respuesta se usa sin revalidar (0 = revalidar siempre).
+        """
+        self.max_entries = max_entries
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.ttl = ttl
+        self._entries = OrderedDict()   # clave -> {"response", "size", "stored", "path"}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        # Estadísticas para el resumen de la sesión
+        self.hits = 0            # Servidas desde el cache sin ir a la red
+        self.revalidated = 0     # El servidor respondió 304 y se usó el cuerpo guardado
+        self.misses = 0          # Respuestas completas de la red (sin entrada o con 200 al revalidar)
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def key(url: str, params=None) -> str:
+        """Clave de una petición GET: URL con los parámetros ordenados."""
+        if not params:
+            return url
+        items = sorted((str(k), str(v)) for k, v in dict(params).items() if v is not None)
+        return url + "?" + "&".join(f"{k}={v}" for k, v in items)
+
+    def lookup(self, key: str):
+        """
+        :return: (respuesta, cabeceras condicionales). Si la respuesta está vigente se retorna
+                 para usarla directamente; si no, se retornan las cabeceras para revalidar (o {}).
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None, {}
+            self._entries.move_to_end(key)
+            if time.monotonic() - entry["stored"] < self.ttl and not _no_cache(entry["response"]):
+                self.hits += 1
+                return copy.copy(entry["response"]), {}
+
+        headers = {}
+        if entry["response"].headers.get("ETag"):
+            headers["If-None-Match"] = entry["response"].headers["ETag"]
+        if entry["response"].headers.get("Last-Modified"):
+            headers["If-Modified-Since"] = entry["response"].headers["Last-Modified"]
+        return None, headers
+
+    def update(self, key: str, response):
+        """
+        Procesa la respuesta de la red para una clave.
+        :return: La respuesta a entregar al test (la guardada si el servidor respondió 304), o None si
+                 el servidor respondió 304 pero la entrada ya se desalojó: hay que repetir la petición
+                 sin cabeceras condicionales.
+        """
+        if response.status_code == 304:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    entry["stored"] = time.monotonic()
+                    self.revalidated += 1
+                    return copy.copy(entry["response"])
+            return None
+
+        with self._lock:
+            self.misses += 1
+            self._discard(key)
+            size = len(response.content)
+            if response.status_code != 200 or "no-store" in response.headers.get("Cache-Control", "") \
+                    or size > self.max_bytes:
+                return response
+            self._entries[key] = {
+                "response": response, "size": size, "stored": time.monotonic(), "path": urlsplit(key).path,
+            }
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted["size"]
+                self.evictions += 1
+        return response
+
+    def invalidate(self, url: str):
+        """
+        Descarta lo guardado que una escritura (POST/PUT/PATCH/DELETE) sobre 'url' deja desactualizado:
+        el mismo recurso, sus sub-recursos y la colección que lo contiene (ej: DELETE /posts/1
+        invalida /posts/1, /posts/1/comments y /posts).
+        """
+        path = urlsplit(url).path.rstrip("/")
+        parent = path.rsplit("/", 1)[0]
+        with self._lock:
+            stale = [
+                key for key, entry in self._entries.items()
+                if entry["path"].rstrip("/") in (path, parent) or entry["path"].startswith(path + "/")
+            ]
+            for key in stale:
+                self._discard(key)
+            self.invalidations += len(stale)
+        if stale:
+            logger.debug(f"Cache de API: {len(stale)} respuestas invalidadas por escritura en {path}")
+
+    def summary(self) -> str:
+        """Línea de resumen de aciertos y fallos del cache."""
+        return (
+            f"Cache GET: aciertos {self.hits} | revalidadas (304) {self.revalidated} | "
+            f"fallos {self.misses} | invalidadas {self.invalidations} | desalojadas {self.evictions} | "
+            f"{len(self._entries)} entradas ({self._bytes / 1024:.1f} KB)"
+        )
+
+    def _discard(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry["size"]
+
+
+def _no_cache(response) -> bool:
+    """Cache-Control: no-cache obliga a revalidar antes de usar la respuesta guardada."""
+    return "no-cache" in response.headers.get("Cache-Control", "")
@@ -1,31 +1,351 @@
+import base64
+import hashlib
+import json
 import os
+import queue
+import struct
+import threading
+import time
+import zlib
 from datetime import datetime
-from config.settings import SCREENSHOTS_DIR
+from config.settings import SCREENSHOTS_DIR, WORKER_ID, SCREENSHOT_MODE, SCREENSHOT_COMPRESSION
+from config.settings import SCREENSHOT_THUMBNAIL_WIDTH, SCREENSHOT_MAX_AGE_DAYS, SCREENSHOT_MAX_MB
 from utils.logger import get_logger
 
 logger = get_logger()
 
-def take_screenshot(driver, test_name):
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# Hilo escritor de la sesión (se crea con la primera captura)
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def take_screenshot(driver, test_name, mode=SCREENSHOT_MODE):
     """
-    Toma una captura de pantalla y la guarda con un timestamp único.
+    Toma una captura de pantalla y la guarda en el store de capturas (por hash de contenido).
+    Solo la captura (los bytes PNG) se hace en el hilo del test; la compresión y la
+    escritura a disco quedan en un hilo de fondo para que el navegador se libere enseguida.
     :param driver: La instancia del WebDriver.
     :param test_name: Nombre del test que falló.
+    :param mode: "viewport" (lo visible) o "fullpage" (la página completa).
+    :return: Ruta donde se va a escribir la captura, o None si no se pudo tomar.
     """
-    if not os.path.exists(SCREENSHOTS_DIR):
-        os.makedirs(SCREENSHOTS_DIR)
-
-    # Genera un nombre de archivo único con timestamp
+    # Nombre único con timestamp: ya no es el nombre del archivo sino la entrada del índice
+    # (en paralelo se agrega el id del worker para evitar colisiones entre procesos)
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    file_name = f"{test_name.replace('/', '_').replace(':', '_')}_{timestamp}.png"
-    file_path = os.path.join(SCREENSHOTS_DIR, file_name)
+    worker_suffix = f"_{WORKER_ID}" if WORKER_ID else ""
+    file_name = f"{test_name.replace('/', '_').replace(':', '_')}_{timestamp}{worker_suffix}.png"
 
     try:
-        driver.save_screenshot(file_path)
-        logger.error(f"Captura guardada en: {file_path}")
-        return file_path
+        png = _capture_png(driver, mode)
     except Exception as e:
         logger.error(f"Error al intentar tomar la captura de pantalla: {e}")
         return None
 
+    digest = hashlib.sha256(png).hexdigest()
+    entry = {"test": test_name, "name": file_name, "hash": digest, "time": round(time.time(), 3)}
+    _get_writer().submit(entry, png)
+    file_path = ScreenshotStore().image_path(digest)
+    logger.error(f"Captura en cola para guardar en: {file_path} ({file_name})")
+    return file_path
+
+
+def flush_screenshots() -> int:
+    """
+    Espera a que se escriban todas las capturas pendientes (llamar al final de la sesión) y, si esta
+    sesión guardó alguna, aplica la política de retención. Los workers no aplican retención: lo hace
+    el coordinador cuando le llegan reportes con captura (ver ParallelController).
+    :return: Cantidad de capturas guardadas en la sesión.
+    """
+    global _writer
+    with _writer_lock:
+        writer, _writer = _writer, None
+    if writer is None:
+        return 0
+    writer.close()
+    if writer.saved and not WORKER_ID:
+        ScreenshotStore().apply_retention()
+    return writer.saved
+
+
+def _capture_png(driver, mode: str) -> bytes:
+    """Obtiene los bytes PNG de la captura según el modo (sin tocar el disco)."""
+    if mode == "fullpage":
+        if hasattr(driver, "execute_cdp_cmd"):
+            # Chrome: captura más allá del viewport con el tamaño real del contenido
+            metrics = driver.execute_cdp_cmd("Page.getLayoutMetrics", {})
+            size = metrics.get("cssContentSize") or metrics["contentSize"]
+            clip = {"x": 0, "y": 0, "width": size["width"], "height": size["height"], "scale": 1}
+            data = driver.execute_cdp_cmd(
+                "Page.captureScreenshot", {"format": "png", "captureBeyondViewport": True, "clip": clip}
+            )
+            return base64.b64decode(data["data"])
+        if hasattr(driver, "get_full_page_screenshot_as_png"):
+            # Firefox
+            return driver.get_full_page_screenshot_as_png()
+        logger.warning("El navegador no soporta capturas de página completa. Se usa el viewport.")
+    return driver.get_screenshot_as_png()
+
+
+def recompress_png(png: bytes, level: int = SCREENSHOT_COMPRESSION) -> bytes:
+    """
+    Re-comprime los datos de imagen (IDAT) de un PNG con el nivel de zlib indicado,
+    sin dependencias externas. Los navegadores usan compresión rápida, así que con
+    nivel 9 el archivo suele quedar bastante más chico. Si no mejora, retorna el original.
+    """
+    if not level or not png.startswith(PNG_SIGNATURE):
+        return png
+
+    try:
+        before, idat, after = _split_png(png)
+        data = zlib.compress(zlib.decompress(idat), level)
+    except (struct.error, zlib.error) as e:
+        logger.debug(f"PNG no reconocido, se guarda sin re-comprimir: {e}")
+        return png
+
+    result = PNG_SIGNATURE + b"".join(before) + _png_chunk(b"IDAT", data) + b"".join(after)
+    return result if len(result) < len(png) else png
+
+
+def make_thumbnail(png: bytes, width: int = SCREENSHOT_THUMBNAIL_WIDTH):
+    """
+    Miniatura PNG de la captura, de 'width' px de ancho como máximo, generada a partir de los
+    mismos bytes (sin pedirle otra captura al navegador y sin dependencias externas).
+    Se toma un píxel de cada N (vecino más cercano): alcanza para reconocer la pantalla.
+    Soporta PNG de 8 bits RGB/RGBA sin entrelazado, que es lo que generan los navegadores.
+    Decodificar el PNG en Python cuesta ~1 s por captura de escritorio (y retiene el GIL), por eso
+    las miniaturas son opcionales (SCREENSHOT_THUMBNAIL_WIDTH, por defecto 0).
+    :return: Los bytes de la miniatura, o None si el formato no está soportado.
+    """
+    if not width or not png.startswith(PNG_SIGNATURE):
+        return None
+    try:
+        before, idat, _ = _split_png(png)
+        png_width, height, depth, color, _, _, interlace = struct.unpack(">IIBBBBB", before[0][8:21])
+        if depth != 8 or color not in (2, 6) or interlace:
+            logger.debug(f"Formato de PNG sin miniatura (profundidad {depth}, color {color}, entrelazado {interlace}).")
+            return None
+        raw = zlib.decompress(idat)
+    except (struct.error, zlib.error, IndexError) as e:
+        logger.debug(f"No se pudo generar la miniatura de la captura: {e}")
+        return None
+
+    bpp = 3 if color == 2 else 4
+    stride = png_width * bpp
+    step = -(-png_width // width)   # Redondeo hacia arriba: la miniatura nunca supera 'width'
+    rows = []
+    previous = bytearray(stride)
+    for y in range(height):
+        start = y * (stride + 1)
+        row = bytearray(raw[start + 1:start + 1 + stride])
+        if len(row) < stride or not _unfilter(raw[start], row, previous, bpp):
+            logger.debug(f"No se pudo generar la miniatura de la captura: datos de imagen inválidos (fila {y}).")
+            return None
+        if y % step == 0:
+            rows.append(b"\x00" + b"".join(row[x:x + bpp] for x in range(0, stride, step * bpp)))
+        previous = row
+
+    header = struct.pack(">IIBBBBB", -(-png_width // step), len(rows), 8, color, 0, 0, 0)
+    return (PNG_SIGNATURE + _png_chunk(b"IHDR", header)
+            + _png_chunk(b"IDAT", zlib.compress(b"".join(rows), 9)) + _png_chunk(b"IEND", b""))
+
+
+def _split_png(png: bytes):
+    """Separa un PNG en (chunks antes de los datos, datos de imagen IDAT unidos, chunks después)."""
+    before, idat, after = [], [], []
+    pos = len(PNG_SIGNATURE)
+    while pos < len(png):
+        length, chunk_type = struct.unpack(">I4s", png[pos:pos + 8])
+        chunk = png[pos:pos + 12 + length]
+        if chunk_type == b"IDAT":
+            idat.append(png[pos + 8:pos + 8 + length])
+        else:
+            (after if idat else before).append(chunk)
+        pos += 12 + length
+    return before, b"".join(idat), after
+
+
+def _png_chunk(chunk_type: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + chunk_type + data + struct.pack(">I", zlib.crc32(chunk_type + data))
+
+
+def _unfilter(filter_type: int, row: bytearray, previous: bytearray, bpp: int) -> bool:
+    """Revierte en el lugar el filtro PNG de una fila. :return: False si el tipo de filtro no existe."""
+    if filter_type == 0:
+        return True
+    if filter_type == 2:
+        row[:] = bytes((a + b) & 0xFF for a, b in zip(row, previous))
+        return True
+    if filter_type not in (1, 3, 4):
+        return False
+    for i in range(len(row)):
+        left = row[i - bpp] if i >= bpp else 0
+        if filter_type == 1:
+            row[i] = (row[i] + left) & 0xFF
+        elif filter_type == 3:
+            row[i] = (row[i] + ((left + previous[i]) >> 1)) & 0xFF
+        else:
+            up = previous[i]
+            up_left = previous[i - bpp] if i >= bpp else 0
+            p = left + up - up_left
+            pa, pb, pc = abs(p - left), abs(p - up), abs(p - up_left)
+            predictor = left if pa <= pb and pa <= pc else (up if pb <= pc else up_left)
+            row[i] = (row[i] + predictor) & 0xFF
+    return True
+
+
+class ScreenshotStore:
+    """
+    Capturas guardadas por hash de contenido (SHA-256 de la imagen capturada):
+    una falla que se repite con la misma pantalla ocupa un solo archivo.
+
+        screenshots/objects/ab/abcd....png   imagen completa
+        screenshots/thumbs/abcd....png       miniatura para reportes
+        screenshots/index.jsonl              una línea por captura: test, nombre, hash y hora
+
+    La retención solo borra lo que escribió el store (objects/, thumbs/ e index.jsonl).
+    """
+
+    INDEX_FILE = "index.jsonl"
+
+    def __init__(self, directory=SCREENSHOTS_DIR):
+        self.directory = directory
+        self.index_path = os.path.join(directory, self.INDEX_FILE)
+
+    def image_path(self, digest: str) -> str:
+        return os.path.join(self.directory, "objects", digest[:2], f"{digest}.png")
+
+    def thumbnail_path(self, digest: str) -> str:
+        return os.path.join(self.directory, "thumbs", f"{digest}.png")
+
+    def has_image(self, digest: str) -> bool:
+        return os.path.exists(self.image_path(digest))
+
+    def has_thumbnail(self, digest: str) -> bool:
+        return os.path.exists(self.thumbnail_path(digest))
+
+    def save(self, entry: dict, png: bytes, compression: int = SCREENSHOT_COMPRESSION,
+             thumbnail_width: int = SCREENSHOT_THUMBNAIL_WIDTH):
+        """Guarda la imagen y su miniatura (si no existen ya) y la entrada del índice."""
+        digest = entry["hash"]
+        if not self.has_image(digest):
+            self._write(self.image_path(digest), recompress_png(png, compression))
+        if thumbnail_width and not self.has_thumbnail(digest):
+            thumbnail = make_thumbnail(png, thumbnail_width)
+            if thumbnail:
+                self._write(self.thumbnail_path(digest), thumbnail)
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self.index_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+
+    def entries(self, test_name: str = None) -> list:
+        """Entradas del índice (todas, o solo las de un test)."""
+        if not os.path.exists(self.index_path):
+            return []
+        with open(self.index_path, encoding="utf-8") as f:
+            entries = [json.loads(line) for line in f if line.strip()]
+        return [e for e in entries if test_name is None or e["test"] == test_name]
+
+    def apply_retention(self, max_age_days: float = SCREENSHOT_MAX_AGE_DAYS, max_mb: float = SCREENSHOT_MAX_MB):
+        """
+        Borra las imágenes que nadie referencia hace más de 'max_age_days' días y, si el total
+        sigue superando 'max_mb', las usadas hace más tiempo hasta quedar bajo el límite.
+        Las entradas del índice de las imágenes borradas también se eliminan. 0 desactiva cada límite.
+        :return: Cantidad de imágenes borradas.
+        """
+        entries = self.entries()
+        if not entries or not (max_age_days or max_mb):
+            return 0
+
+        last_used = {}
+        for entry in entries:
+            last_used[entry["hash"]] = max(last_used.get(entry["hash"], 0), entry["time"])
+        # Más reciente primero: se conservan estas mientras entren en el límite
+        ranked = sorted(last_used, key=last_used.get, reverse=True)
+
+        removed = set()
+        if max_age_days:
+            limit = time.time() - max_age_days * 86400
+            removed.update(h for h in ranked if last_used[h] < limit)
+        if max_mb:
+            total = 0
+            for digest in ranked:
+                if digest in removed:
+                    continue
+                total += sum(os.path.getsize(p) for p in self._files(digest) if os.path.exists(p))
+                if total > max_mb * 1024 * 1024:
+                    removed.add(digest)
+
+        if not removed:
+            return 0
+        for digest in removed:
+            for path in self._files(digest):
+                if os.path.exists(path):
+                    os.remove(path)
+            try:
+                os.rmdir(os.path.dirname(self.image_path(digest)))
+            except OSError:
+                pass  # La carpeta todavía tiene otras imágenes
+        kept = [e for e in entries if e["hash"] not in removed]
+        self._write(self.index_path, "".join(json.dumps(e) + "\n" for e in kept).encode("utf-8"))
+        logger.info(f"Retención de capturas: {len(removed)} imágenes borradas, {len(last_used) - len(removed)} conservadas.")
+        return len(removed)
+
+    def _files(self, digest: str):
+        return self.image_path(digest), self.thumbnail_path(digest)
+
+    @staticmethod
+    def _write(path: str, data: bytes):
+        """Escritura atómica (archivo temporal + rename) para que los workers no lean archivos a medias."""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+
+class ScreenshotWriter:
+    """
+    Hilo de fondo que comprime, genera la miniatura y guarda en el store las capturas que le pasan los tests.
+    """
+
+    def __init__(self, directory=SCREENSHOTS_DIR, compression=SCREENSHOT_COMPRESSION,
+                 thumbnail_width=SCREENSHOT_THUMBNAIL_WIDTH):
+        self.store = ScreenshotStore(directory)
+        self.compression = compression
+        self.thumbnail_width = thumbnail_width
+        self.saved = 0      # Capturas guardadas (para saber si hace falta aplicar la retención)
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="screenshot-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, entry: dict, png: bytes):
+        """Encola una captura para escribirla (y generar su miniatura) en segundo plano."""
+        self._queue.put((entry, png))
+
+    def close(self):
+        """Escribe lo pendiente y termina el hilo."""
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            entry, png = job
+            try:
+                self.store.save(entry, png, self.compression, self.thumbnail_width)
+                self.saved += 1
+                logger.debug(f"Captura guardada: {entry['name']} -> {entry['hash']}")
+            except Exception as e:
+                logger.error(f"Error al guardar la captura {entry['name']}: {e}")
 
 
+def _get_writer() -> ScreenshotWriter:
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = ScreenshotWriter()
+        return _writer
@@ -0,0 +1,152 @@
+import pytest
+from config.settings import NETWORK_BLOCKED_URLS, ACTION_TIMING_TOP
+from pages.base_page import BasePage
+from utils.action_timing import ActionTimer, format_slowest_table, slowest_table_html
+from utils.browser_launcher import BrowserLauncher
+from utils.driver_factory import DriverFactory, BROWSER_PROFILES
+from utils.driver_pool import DriverPool
+from utils.local_site import LocalSiteServer
+from utils.network_policy import NetworkPolicy, format_network_stats
+from utils.logger import get_logger
+from utils.reporting import SCREENSHOT_PROPERTY
+from utils.screenshots import take_screenshot, flush_screenshots
+
+logger = get_logger()
+
+
+class UiPlugin:
+    """
+    Maquinaria de las pruebas de UI: opciones de BasePage, réplica local de SauceDemo, política de red,
+    medición de acciones, lanzador de navegadores y capturas en fallo.
+    conftest lo importa y registra recién cuando un test recolectado usa el fixture 'driver'
+    (ver _ui_plugin): una corrida de solo API no importa Selenium ni los Page Objects.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        BasePage.wait_engine = config.getoption("wait_engine")
+        BasePage.form_fill = config.getoption("form_fill")
+        self.policy = NetworkPolicy(config.getoption("network_policy"), NETWORK_BLOCKED_URLS)
+        self.timer = None
+        if config.getoption("action_timing"):
+            self.timer = ActionTimer()
+            self.timer.install(BasePage)
+        self.site = None
+        if config.getoption("ui_profile") == "local":
+            # Cada proceso (o worker) levanta su réplica de SauceDemo y los Page Objects navegan a ella
+            site = LocalSiteServer(latency_ms=config.getoption("ui_latency"), jitter_ms=config.getoption("ui_jitter"))
+            self.site = site.start()
+            BasePage.base_url = site.url
+        self._launcher = None
+
+    @property
+    def base_url(self) -> str:
+        """URL del sitio bajo prueba (SauceDemo o la réplica local de esta corrida)."""
+        return BasePage.base_url
+
+    # ----------------------------------------------------
+    # NAVEGADORES
+    # ----------------------------------------------------
+
+    def _driver_factory(self):
+        """Retorna un callable que crea drivers con la configuración de la línea de comandos."""
+        implicit_wait = self.config.getoption("implicit_wait")
+        browser = self.config.getoption("browser")
+        policy = self.policy
+        profile = policy.browser_profile(BROWSER_PROFILES[self.config.getoption("browser_profile")])
+        return lambda: policy.apply(DriverFactory.get_driver(browser=browser, implicit_wait=implicit_wait, profile=profile))
+
+    def start_launcher(self):
+        """Arranca el lanzador con el pre-calentado en segundo plano (al terminar la recolección)."""
+        # El pool reutiliza un solo navegador por proceso (los tests corren de a uno): pre-calentar
+        # más dejaría un Chrome abierto toda la sesión sin usarse. Los reemplazos se crean en el momento.
+        limit = 1 if self.config.getoption("driver_mode") == "pool" else None
+        self._launcher = BrowserLauncher(self._driver_factory(), depth=self.config.getoption("prewarm"), limit=limit).start()
+
+    @property
+    def launcher(self) -> BrowserLauncher:
+        """Lanzador de la sesión (se crea sin hilo si no se arrancó en la recolección)."""
+        if self._launcher is None:
+            self._launcher = BrowserLauncher(self._driver_factory(), depth=0)
+        return self._launcher
+
+    def create_pool(self) -> DriverPool:
+        return DriverPool(browser=self.config.getoption("browser"), factory=self.launcher.get)
+
+    def collect_network(self, request, web_driver, report=True):
+        """
+        Lee el log de red del navegador. Antes del test solo lo vacía (reset del pool, pre-calentado);
+        después adjunta al reporte lo que descargó, lo que salió del cache y lo que se bloqueó.
+        """
+        stats = self.policy.collect(web_driver)
+        if stats is None or not report:
+            return
+        detail = format_network_stats(stats)
+        logger.info(f"Red del test: {detail}")
+        request.node.add_report_section("teardown", "Red", detail)
+
+    # ----------------------------------------------------
+    # HOOKS DE PYTEST
+    # ----------------------------------------------------
+
+    def pytest_runtest_setup(self, item):
+        """El waterfall de acciones de cada test empieza en su setup (incluye las acciones de los fixtures)."""
+        if self.timer is not None:
+            self.timer.start_test()
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        """
+        Captura de pantalla si el test falló en la fase 'call' y waterfall de acciones al terminar el teardown.
+        Sin tryfirst a propósito: pluggy lo anida dentro del wrapper tryfirst de conftest (lo que se loguea
+        acá entra en el buffer del test en modo buffered) y por fuera del de 'skipping' (ve el resultado final
+        de los xfail), sin importar que este plugin se registre después.
+        """
+        outcome = yield
+        report = outcome.get_result()
+
+        if report.when == "call" and report.failed and "driver" in item.funcargs:
+            logger.error(f"El test {report.nodeid} ha fallado. Intentando tomar captura...")
+            try:
+                test_name = report.nodeid.replace("::", "_")  # Nombre para la captura
+                # La escritura a disco sigue en segundo plano
+                screenshot = take_screenshot(item.funcargs["driver"], test_name, mode=self.config.getoption("screenshot_mode"))
+                if screenshot:
+                    # Viaja con el reporte (también desde los workers) para enlazarla en el reporte
+                    report.user_properties.append((SCREENSHOT_PROPERTY, screenshot))
+            except Exception as e:
+                logger.error(f"Error inesperado al intentar manejar el fallo y la captura: {e}")
+
+        if self.timer is not None and report.when == "teardown" and self.timer.events:
+            report.sections.append(("Acciones (waterfall)", self.timer.waterfall()))
+
+    def pytest_sessionfinish(self, session, exitstatus):
+        """Cierra los navegadores pre-calentados que no llegaron a usarse y escribe las capturas pendientes."""
+        if self._launcher is not None:
+            self._launcher.shutdown()
+        flush_screenshots()
+
+    def pytest_unconfigure(self, config):
+        """Detiene el sitio local y restaura los métodos originales de BasePage."""
+        if self.timer is not None:
+            self.timer.uninstall()
+        if self.site is not None:
+            self.site.stop()
+
+    def pytest_terminal_summary(self, terminalreporter, exitstatus, config):
+        """Tiempo de arranque de navegadores esperado y oculto, red de la sesión y acciones más lentas."""
+        if self._launcher is not None and self._launcher.delivered:
+            terminalreporter.write_sep("-", "Lanzador de navegadores")
+            terminalreporter.write_line(self._launcher.summary())
+            if self.policy.totals["requests"]:
+                terminalreporter.write_line(self.policy.summary())
+        if self.timer is not None and self.timer.stats:
+            terminalreporter.write_sep("-", "Acciones más lentas de los Page Objects")
+            for line in format_slowest_table(self.timer.slowest(ACTION_TIMING_TOP)):
+                terminalreporter.write_line(line)
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_html_results_summary(self, prefix, summary, postfix, session):
+        """Agrega al resumen del reporte HTML la tabla de acciones más lentas."""
+        if self.timer is not None and self.timer.stats:
+            prefix.append(slowest_table_html(self.timer.slowest(ACTION_TIMING_TOP)))